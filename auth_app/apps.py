@@ -5,3 +5,18 @@ class AuthAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'auth_app'
     verbose_name = 'Authentication'
+
+    def ready(self):
+        from django.contrib.auth import get_user_model
+        from django.db.models.signals import post_delete, post_save
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+        from .authentication import evict_user
+        from .tokens import cache_blacklisted
+
+        # Saved or deleted users must not authenticate from a stale cache entry
+        user_model = get_user_model()
+        post_save.connect(evict_user, sender=user_model, dispatch_uid='auth-user-cache')
+        post_delete.connect(evict_user, sender=user_model, dispatch_uid='auth-user-cache')
+
+        # Tokens blacklisted outside CachedRefreshToken (admin, other views)
+        post_save.connect(cache_blacklisted, sender=BlacklistedToken, dispatch_uid='token-blacklist-cache')
@@ -0,0 +1,122 @@
+"""
+JWT authentication that keeps user records in process memory.
+
+simplejwt's ``JWTAuthentication`` loads the token's user from the database on
+every request. ``CachedJWTAuthentication`` keeps the loaded users in a small
+per-process LRU cache for ``AUTH_USER_CACHE_TIMEOUT`` seconds, so a client's
+repeated requests skip that query. Saves and deletes of a user (profile
+updates, password changes, deactivation) evict it in this process; other
+processes see the change once their entry expires, which bounds how long a
+deactivated user stays authenticated there.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+class UserCache:
+    """
+    Thread-safe LRU cache of user instances with a per-entry time to live.
+
+    Keys are user ids as strings: simplejwt puts the id claim in tokens as a
+    string, while model instances carry it as an int.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        """
+        A copy of the cached user, or None when missing or expired.
+        """
+        user_id = str(user_id)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            user, expires = entry
+            if expires <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+        # Views may modify request.user; they must not modify the cached one
+        return copy.copy(user)
+
+    def set(self, user_id, user):
+        timeout = getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 60)
+        if timeout <= 0:
+            return
+        user_id = str(user_id)
+        with self._lock:
+            self._entries[user_id] = (copy.copy(user), time.monotonic() + timeout)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > getattr(settings, 'AUTH_USER_CACHE_SIZE', 10000):
+                self._entries.popitem(last=False)
+
+    def evict(self, user_id):
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` reading the token's user from ``user_cache``.
+
+    The active and revoked-token checks still run on every request, against
+    the cached record.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        user = user_cache.get(user_id)
+        if user is None:
+            try:
+                user = self.user_model.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+            user_cache.set(user_id, user)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
+
+
+def evict_user(sender, instance, raw=False, **kwargs):
+    """
+    Drop a saved or deleted user from ``user_cache``, now and after commit.
+
+    Evicting again on commit drops a record another request may have cached
+    from before the write.
+    """
+    if raw:
+        return
+    user_id = getattr(instance, api_settings.USER_ID_FIELD)
+    user_cache.evict(user_id)
+    transaction.on_commit(lambda: user_cache.evict(user_id))
@@ -0,0 +1,17 @@
+"""
+Password hashers tuned from settings.
+
+``PBKDF2PasswordHasher`` reads its iteration count from
+``PASSWORD_PBKDF2_ITERATIONS`` instead of Django's release default, so the
+per-login hashing cost can be set per deployment. It keeps Django's
+algorithm name: existing hashes store their own iteration count and still
+verify, and are rehashed at the configured count on the user's next login.
+"""
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_PBKDF2_ITERATIONS', None) or hashers.PBKDF2PasswordHasher.iterations
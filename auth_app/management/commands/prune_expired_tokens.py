@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+
+class Command(BaseCommand):
+    """
+    Delete expired outstanding tokens and their blacklist entries in batches.
+    """
+    help = 'Delete expired outstanding and blacklisted JWT refresh tokens in batches.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Tokens deleted per transaction (default 5000).',
+        )
+    
+    def handle(self, *args, batch_size=5000, **options):
+        """
+        Delete expired tokens one short transaction at a time.
+        
+        Unlike ``flushexpiredtokens``, which deletes every expired token in
+        one statement, each batch holds its locks briefly, so refreshes and
+        logouts keep running while millions of rows are pruned.
+        """
+        now = aware_utcnow()
+        expired = OutstandingToken.objects.filter(expires_at__lte=now).order_by('pk')
+        deleted = 0
+        while True:
+            batch = list(expired.values_list('pk', flat=True)[:batch_size])
+            if not batch:
+                break
+            with transaction.atomic():
+                # Blacklist entries go with their token by cascade
+                OutstandingToken.objects.filter(pk__in=batch).delete()
+            deleted += len(batch)
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired tokens.'))
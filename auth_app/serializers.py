@@ -3,6 +3,8 @@ from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from .tokens import CachedTokenObtainPairSerializer
+
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
     """Serializer for user registration"""
@@ -53,6 +55,16 @@ class UserProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'username', 'date_joined', 'is_active')
 
 
+class UserLoginTokenSerializer(CachedTokenObtainPairSerializer):
+    """Serializer for login returning JWT tokens and the user's profile"""
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        # The profile comes from the user authenticate() already loaded
+        data['user'] = UserProfileSerializer(self.user).data
+        return data
+
+
 class ChangePasswordSerializer(serializers.Serializer):
     """Serializer for changing password"""
     old_password = serializers.CharField(required=True)
@@ -65,7 +77,7 @@ class ChangePasswordSerializer(serializers.Serializer):
         return attrs
 
     def validate_old_password(self, value):
-        user = self.context['request'].user
+        user = self.context.get('user') or self.context['request'].user
         if not user.check_password(value):
             raise serializers.ValidationError("Old password is incorrect.")
         return value
\ No newline at end of file
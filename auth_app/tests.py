@@ -1,10 +1,27 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.contrib.auth.models import User
 from django.urls import reverse
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
+import io
 import json
+import sys
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from mini_university.testing import benchmark, env_int
+
+from .authentication import user_cache
+from .tokens import CachedRefreshToken
 
 
 class AuthenticationTestCase(APITestCase):
@@ -12,6 +29,7 @@ class AuthenticationTestCase(APITestCase):
     
     def setUp(self):
         """Set up test data before each test"""
+        cache.clear()
         self.client = APIClient()
         self.register_url = reverse('user-register')
         self.login_url = reverse('user-login')
@@ -279,4 +297,325 @@ class JWTTokenTestCase(APITestCase):
         refresh = RefreshToken.for_user(self.user)
         
         # Check if token contains user_id
-        self.assertEqual(int(refresh['user_id']), self.user.id)
\ No newline at end of file
+        self.assertEqual(int(refresh['user_id']), self.user.id)
+
+
+class CachedJWTAuthenticationTestCase(APITestCase):
+    """Test that token users are cached and evicted on writes"""
+
+    def setUp(self):
+        user_cache.clear()
+        self.user = User.objects.create_user(username='cacheduser', password='cachedpass123')
+        access_token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token}')
+        self.status_url = reverse('auth-status')
+
+    def test_repeat_requests_skip_user_query(self):
+        """Test only the first request loads the user"""
+        with self.assertNumQueries(1):
+            self.client.get(self.status_url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.status_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['user']['username'], 'cacheduser')
+
+    def test_profile_update_evicts_user(self):
+        """Test a profile update is seen by the next request"""
+        self.client.get(self.status_url)
+        response = self.client.patch(reverse('user-profile'), {'first_name': 'Updated'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(self.status_url)
+        self.assertEqual(response.data['user']['first_name'], 'Updated')
+
+    def test_writes_do_not_restore_cached_fields(self):
+        """Test profile and password writes start from the current row"""
+        self.client.get(self.status_url)
+        # Changed by another process, whose eviction does not reach this cache
+        User.objects.filter(pk=self.user.pk).update(
+            last_name='Remote', password=make_password('remotepass123')
+        )
+        response = self.client.patch(reverse('user-profile'), {'first_name': 'Updated'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['last_name'], 'Remote')
+
+        data = {'old_password': 'cachedpass123', 'new_password': 'newpass12345', 'confirm_password': 'newpass12345'}
+        response = self.client.post(reverse('change-password'), data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        data['old_password'] = 'remotepass123'
+        response = self.client.post(reverse('change-password'), data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user = User.objects.get(pk=self.user.pk)
+        self.assertEqual((user.first_name, user.last_name), ('Updated', 'Remote'))
+        self.assertTrue(user.check_password('newpass12345'))
+
+    def test_deactivated_user_is_rejected(self):
+        """Test deactivating a user evicts its cached record"""
+        self.client.get(self.status_url)
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(self.status_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user_is_rejected(self):
+        """Test deleting a user evicts its cached record"""
+        self.client.get(self.status_url)
+        self.user.delete()
+        response = self.client.get(self.status_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_and_instance_ids_share_an_entry(self):
+        """Test string token claims and int model ids address the same user"""
+        user_cache.set(str(self.user.pk), self.user)
+        self.assertEqual(user_cache.get(self.user.pk).username, 'cacheduser')
+        user_cache.evict(self.user.pk)
+        self.assertIsNone(user_cache.get(str(self.user.pk)))
+
+    def test_cached_user_is_a_copy(self):
+        """Test changes to request.user do not leak into the cache"""
+        self.client.get(self.status_url)
+        user_cache.get(self.user.pk).first_name = 'Changed'
+        self.assertEqual(user_cache.get(self.user.pk).first_name, '')
+
+    @override_settings(AUTH_USER_CACHE_TIMEOUT=0)
+    def test_cache_disabled(self):
+        """Test a zero timeout loads the user on every request"""
+        self.client.get(self.status_url)
+        with self.assertNumQueries(1):
+            self.client.get(self.status_url)
+
+    @override_settings(AUTH_USER_CACHE_SIZE=1)
+    def test_least_recently_used_user_is_evicted(self):
+        """Test the cache keeps at most AUTH_USER_CACHE_SIZE users"""
+        other = User.objects.create_user(username='otheruser', password='otherpass123')
+        user_cache.set(self.user.pk, self.user)
+        user_cache.set(other.pk, other)
+        self.assertIsNone(user_cache.get(self.user.pk))
+        self.assertEqual(user_cache.get(other.pk).username, 'otheruser')
+
+
+@override_settings(CACHE_SHARED=True)
+class CachedTokenBlacklistTestCase(APITestCase):
+    """Test the cached refresh token blacklist and expired token pruning"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='blacklistuser', password='blacklistpass123')
+        self.refresh_url = reverse('token-refresh')
+
+    def test_issued_token_is_checked_without_query(self):
+        """Test a token issued here is known not to be blacklisted"""
+        refresh = str(CachedRefreshToken.for_user(self.user))
+        with self.assertNumQueries(0):
+            CachedRefreshToken(refresh)
+
+    def test_unknown_token_is_looked_up_once(self):
+        """Test a token missing from the cache is checked in the database once"""
+        refresh = str(CachedRefreshToken.for_user(self.user))
+        cache.clear()
+        with self.assertNumQueries(1):
+            CachedRefreshToken(refresh)
+        with self.assertNumQueries(0):
+            CachedRefreshToken(refresh)
+
+    def test_rotated_token_is_rejected(self):
+        """Test a refresh token cannot be used again after rotation"""
+        refresh = str(CachedRefreshToken.for_user(self.user))
+        response = self.client.post(self.refresh_url, {'refresh': refresh})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rotated = response.data['refresh']
+
+        response = self.client.post(self.refresh_url, {'refresh': refresh})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # The rotated token is cached as not blacklisted
+        with self.assertNumQueries(0):
+            CachedRefreshToken(rotated)
+
+    def test_logged_out_token_is_rejected(self):
+        """Test logout blacklists the refresh token in the cache"""
+        refresh = CachedRefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+        response = self.client.post(reverse('user-logout'), {'refresh': str(refresh)})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(0):
+            with self.assertRaises(TokenError):
+                CachedRefreshToken(str(refresh))
+
+    def test_token_blacklisted_elsewhere_is_rejected(self):
+        """Test blacklisting through the model (e.g. the admin) updates the cache"""
+        refresh = CachedRefreshToken.for_user(self.user)
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=refresh['jti']))
+        with self.assertRaises(TokenError):
+            CachedRefreshToken(str(refresh))
+
+    @override_settings(CACHE_SHARED=False)
+    def test_process_local_cache_checks_database(self):
+        """Test a token is not cached as valid where other processes cannot evict it"""
+        refresh = CachedRefreshToken.for_user(self.user)
+        with self.assertNumQueries(1):
+            CachedRefreshToken(str(refresh))
+        # Blacklisted by another process, which cannot reach this cache
+        with mock.patch('auth_app.tokens.remember_blacklisted'):
+            BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=refresh['jti']))
+        with self.assertRaises(TokenError):
+            CachedRefreshToken(str(refresh))
+
+    def test_prune_expired_tokens(self):
+        """Test expired tokens are deleted in batches with their blacklist entries"""
+        live = CachedRefreshToken.for_user(self.user)
+        past = timezone.now() - timedelta(days=1)
+        expired = [
+            OutstandingToken.objects.create(
+                user=self.user, jti=f'expired-{i}', token='expired', expires_at=past
+            )
+            for i in range(3)
+        ]
+        BlacklistedToken.objects.create(token=expired[0])
+
+        out = io.StringIO()
+        call_command('prune_expired_tokens', batch_size=2, stdout=out)
+        self.assertIn('Deleted 3 expired tokens', out.getvalue())
+        self.assertEqual(
+            list(OutstandingToken.objects.values_list('jti', flat=True)), [live['jti']]
+        )
+        self.assertFalse(BlacklistedToken.objects.exists())
+
+
+class LoginTestCase(APITestCase):
+    """Test the login response and password hasher policy"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='loginuser', email='login@example.com', password='loginpass123',
+            first_name='Login',
+        )
+        self.login_url = reverse('user-login')
+
+    def login(self, password='loginpass123'):
+        return self.client.post(self.login_url, {'username': 'loginuser', 'password': password})
+
+    def test_login_loads_user_once(self):
+        """Test login authenticates and records the refresh token, nothing else"""
+        with self.assertNumQueries(2):
+            response = self.login()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['user']['username'], 'loginuser')
+        self.assertEqual(response.data['user']['first_name'], 'Login')
+        self.assertEqual(set(response.data), {'access', 'refresh', 'user'})
+
+    def test_inactive_user_cannot_login(self):
+        """Test inactive users get no tokens"""
+        self.user.is_active = False
+        self.user.save()
+        response = self.login()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+    def test_iterations_from_settings(self):
+        """Test passwords are rehashed at the configured iteration count on login"""
+        self.assertNotIn('$1000$', self.user.password)
+        response = self.login()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        password = User.objects.get(pk=self.user.pk).password
+        self.assertEqual(identify_hasher(password).algorithm, 'pbkdf2_sha256')
+        self.assertIn('$1000$', password)
+
+
+@override_settings(THROTTLE_RATES={})
+class LoginBenchmarkTestCase(APITestCase):
+    """
+    Logins per minute with the configured password hasher.
+
+    Runs BENCHMARK_LOGINS logins with RUN_BENCHMARKS=1 and writes the rate
+    to stderr. Password
+    hashing dominates, so tune PASSWORD_HASHERS and PASSWORD_PBKDF2_ITERATIONS
+    against the expected start-of-day peak.
+    """
+
+    def setUp(self):
+        User.objects.create_user(username='benchuser', password='benchpass123')
+
+    @benchmark
+    def test_benchmark(self):
+        count = env_int('BENCHMARK_LOGINS', 10)
+        url = reverse('user-login')
+        started = time.perf_counter()
+        for _ in range(count):
+            response = self.client.post(url, {'username': 'benchuser', 'password': 'benchpass123'})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        elapsed = time.perf_counter() - started
+
+        hasher = identify_hasher(User.objects.get(username='benchuser').password)
+        sys.stderr.write(
+            f"\n{count} logins with {hasher.algorithm}: {elapsed * 1000 / count:.1f} ms/login, "
+            f"{count * 60 / elapsed:.0f} logins/minute per process\n"
+        )
+
+
+class LoginThrottleTestCase(APITestCase):
+    """Test login and registration attempts are rate limited"""
+
+    def setUp(self):
+        cache.clear()
+        User.objects.create_user(username='throttleuser', password='throttlepass123')
+        self.login_url = reverse('user-login')
+
+    def login(self, username='throttleuser', password='wrongpassword', address='10.0.0.1'):
+        return self.client.post(
+            self.login_url, {'username': username, 'password': password}, REMOTE_ADDR=address
+        )
+
+    @override_settings(THROTTLE_RATES={'login_username': '3/min'})
+    def test_username_is_throttled_per_address(self):
+        """Test bad logins for one username are limited without locking out other addresses"""
+        for _ in range(3):
+            self.assertEqual(self.login().status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.login(username='ThrottleUser', password='throttlepass123')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(self.login(username='otheruser').status_code, status.HTTP_401_UNAUTHORIZED)
+        # The user can still log in from their own address
+        response = self.login(password='throttlepass123', address='10.0.0.9')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(THROTTLE_RATES={'login_ip': '3/min'})
+    def test_address_is_throttled_for_any_username(self):
+        """Test logins from one address are limited across usernames"""
+        for i in range(3):
+            self.assertEqual(self.login(username=f'user{i}').status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.login(username='user9').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(self.login(address='10.0.0.2').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(THROTTLE_RATES={'login_ip': '2/min', 'login_username': '1/min'})
+    def test_non_object_body_is_throttled_by_address(self):
+        """Test a JSON array body is rejected and counted per address only"""
+        for _ in range(2):
+            response = self.client.post(self.login_url, [], format='json', REMOTE_ADDR='10.0.0.1')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(self.login_url, [], format='json', REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @override_settings(THROTTLE_RATES={'login_ip': '3/min'})
+    def test_forwarded_for_is_ignored_without_proxies(self):
+        """Test a client cannot rotate X-Forwarded-For to reset its address limit"""
+        for i in range(3):
+            response = self.client.post(
+                self.login_url, {'username': 'throttleuser', 'password': 'wrongpassword'},
+                REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR=f'192.0.2.{i}'
+            )
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(
+            self.login_url, {'username': 'throttleuser', 'password': 'wrongpassword'},
+            REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='192.0.2.9'
+        )
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @override_settings(THROTTLE_RATES={'register': '1/hour'})
+    def test_registration_is_throttled(self):
+        """Test registrations from one address are limited"""
+        url = reverse('user-register')
+        data = {'username': 'newuser', 'password': 'newuserpass123', 'password_confirm': 'newuserpass123'}
+        self.assertEqual(self.client.post(url, data).status_code, status.HTTP_201_CREATED)
+        data['username'] = 'newuser2'
+        self.assertEqual(self.client.post(url, data).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
@@ -0,0 +1,39 @@
+"""
+Throttles for the public login and registration endpoints.
+
+Both count attempts in a sliding window (see mini_university/throttling.py),
+so a burst of bad logins is turned away before it reaches password hashing.
+
+The username limit counts per username *and* address. Counting a username
+across all addresses would also stop a password spray from many addresses,
+but would let anyone lock a user out with a few bad attempts a minute; per
+pair, a spray is bounded by the per-address limit instead. Client addresses
+come from ``REST_FRAMEWORK['NUM_PROXIES']``, which must match the proxies in
+front of the app.
+"""
+from mini_university.throttling import SlidingWindowThrottle
+
+
+class LoginRateThrottle(SlidingWindowThrottle):
+    """Login attempts per client address"""
+    scope = 'login_ip'
+
+
+class LoginUsernameRateThrottle(SlidingWindowThrottle):
+    """Login attempts per username from one address"""
+    scope = 'login_username'
+
+    def get_client_ident(self, request, view):
+        # A body that is not a JSON object has no username; the address
+        # throttle still counts it
+        if not isinstance(request.data, dict):
+            return None
+        username = request.data.get('username')
+        if not isinstance(username, str) or not username:
+            return None
+        return f'{username.lower()}:{self.get_ident(request)}'
+
+
+class RegisterRateThrottle(SlidingWindowThrottle):
+    """Registrations per client address"""
+    scope = 'register'
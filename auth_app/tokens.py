@@ -0,0 +1,93 @@
+"""
+Refresh tokens with a cached blacklist check.
+
+simplejwt checks every refresh token it decodes against ``token_blacklist``
+with a join across ``BlacklistedToken`` and ``OutstandingToken``, so refresh
+and logout slow down as those tables grow. ``CachedRefreshToken`` keeps each
+token's blacklisted flag in the cache under its ``jti`` until the token
+expires: blacklisting (including through the admin) caches it as
+blacklisted. With ``CACHE_SHARED`` tokens issued here are also cached as
+not blacklisted and an unknown ``jti`` is looked up once; with a
+process-local cache "not blacklisted" is never cached, as another process
+could not clear it on logout or rotation, so those checks query the
+database. Deleting a ``BlacklistedToken`` row does not clear its cached
+flag; delete the ``token-blacklist:<jti>`` key as well to reinstate the
+token.
+
+Expired tokens are removed in batches by ``manage.py prune_expired_tokens``.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import aware_utcnow, datetime_to_epoch
+
+
+def blacklist_cache():
+    """
+    The cache backend holding blacklist flags.
+    """
+    return caches[getattr(settings, 'TOKEN_BLACKLIST_CACHE_ALIAS', 'default')]
+
+
+def blacklist_key(jti):
+    return f'token-blacklist:{jti}'
+
+
+def remember_blacklisted(jti, exp, blacklisted):
+    """
+    Cache a token's blacklisted flag until the token expires.
+
+    "Not blacklisted" is only cached in a cache every process shares.
+    """
+    if not blacklisted and not getattr(settings, 'CACHE_SHARED', False):
+        return
+    timeout = exp - datetime_to_epoch(aware_utcnow())
+    if timeout > 0:
+        blacklist_cache().set(blacklist_key(jti), blacklisted, timeout)
+
+
+class CachedRefreshToken(RefreshToken):
+    """
+    ``RefreshToken`` checking the blacklist through the cache.
+    """
+
+    def check_blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        blacklisted = blacklist_cache().get(blacklist_key(jti))
+        if blacklisted is None:
+            blacklisted = BlacklistedToken.objects.filter(token__jti=jti).exists()
+            remember_blacklisted(jti, self.payload['exp'], blacklisted)
+        if blacklisted:
+            raise TokenError(_("Token is blacklisted"))
+
+    def outstand(self):
+        outstanding = super().outstand()
+        remember_blacklisted(self.payload[api_settings.JTI_CLAIM], self.payload['exp'], False)
+        return outstanding
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        remember_blacklisted(token[api_settings.JTI_CLAIM], token['exp'], False)
+        return token
+
+
+def cache_blacklisted(sender, instance, raw=False, **kwargs):
+    """
+    Cache a token blacklisted by any path as blacklisted.
+    """
+    if not raw:
+        remember_blacklisted(instance.token.jti, datetime_to_epoch(instance.token.expires_at), True)
+
+
+class CachedTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = CachedRefreshToken
+
+
+class CachedTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = CachedRefreshToken
@@ -2,7 +2,6 @@ from rest_framework import status, generics, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
@@ -11,9 +10,12 @@ from drf_yasg import openapi
 from .serializers import (
     UserRegistrationSerializer, 
     UserLoginSerializer, 
+    UserLoginTokenSerializer,
     UserProfileSerializer,
     ChangePasswordSerializer
 )
+from .throttling import LoginRateThrottle, LoginUsernameRateThrottle, RegisterRateThrottle
+from .tokens import CachedRefreshToken
 
 
 class UserRegistrationView(generics.CreateAPIView):
@@ -21,6 +23,7 @@ class UserRegistrationView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserRegistrationSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [RegisterRateThrottle]
 
     # @swagger_auto_schema(
     #     operation_description="Register a new user",
@@ -51,52 +54,8 @@ class UserRegistrationView(generics.CreateAPIView):
 class UserLoginView(TokenObtainPairView):
     """User login endpoint that returns JWT tokens"""
     permission_classes = [permissions.AllowAny]
-
-    # @swagger_auto_schema(
-    #     operation_description="Login user and get JWT tokens",
-    #     request_body=openapi.Schema(
-    #         type=openapi.TYPE_OBJECT,
-    #         required=['username', 'password'],
-    #         properties={
-    #             'username': openapi.Schema(type=openapi.TYPE_STRING),
-    #             'password': openapi.Schema(type=openapi.TYPE_STRING),
-    #         }
-    #     ),
-    #     responses={
-    #         200: openapi.Response(
-    #             description="Login successful",
-    #             schema=openapi.Schema(
-    #                 type=openapi.TYPE_OBJECT,
-    #                 properties={
-    #                     'access': openapi.Schema(type=openapi.TYPE_STRING),
-    #                     'refresh': openapi.Schema(type=openapi.TYPE_STRING),
-    #                     'user': openapi.Schema(
-    #                         type=openapi.TYPE_OBJECT,
-    #                         properties={
-    #                             'id': openapi.Schema(type=openapi.TYPE_INTEGER),
-    #                             'username': openapi.Schema(type=openapi.TYPE_STRING),
-    #                             'email': openapi.Schema(type=openapi.TYPE_STRING),
-    #                             'first_name': openapi.Schema(type=openapi.TYPE_STRING),
-    #                             'last_name': openapi.Schema(type=openapi.TYPE_STRING),
-    #                         }
-    #                     )
-    #                 }
-    #             )
-    #         )
-    #     }
-    # )
-    def post(self, request, *args, **kwargs):
-        response = super().post(request, *args, **kwargs)
-        if response.status_code == 200:
-            # Get user data
-            username = request.data.get('username')
-            user = User.objects.get(username=username)
-            user_serializer = UserProfileSerializer(user)
-            
-            # Add user data to response
-            response.data['user'] = user_serializer.data
-        
-        return response
+    serializer_class = UserLoginTokenSerializer
+    throttle_classes = [LoginRateThrottle, LoginUsernameRateThrottle]
 
 
 class UserLogoutView(APIView):
@@ -120,7 +79,7 @@ class UserLogoutView(APIView):
     def post(self, request):
         try:
             refresh_token = request.data.get("refresh")
-            token = RefreshToken(refresh_token)
+            token = CachedRefreshToken(refresh_token)
             token.blacklist()
             return Response({"message": "Logged out successfully"}, status=status.HTTP_200_OK)
         except Exception as e:
@@ -133,7 +92,11 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
-        return self.request.user
+        if self.request.method in permissions.SAFE_METHODS:
+            return self.request.user
+        # request.user may be a cached copy; saving it would write back
+        # whatever another process changed since it was cached
+        return User.objects.get(pk=self.request.user.pk)
 
     # @swagger_auto_schema(operation_description="Get user profile")
     # def get(self, request, *args, **kwargs):
@@ -157,11 +120,12 @@ class ChangePasswordView(APIView):
     #     }
     # )
     def post(self, request):
-        serializer = ChangePasswordSerializer(data=request.data, context={'request': request})
+        # Check and write the current row, not the cached request.user
+        user = User.objects.get(pk=request.user.pk)
+        serializer = ChangePasswordSerializer(data=request.data, context={'request': request, 'user': user})
         if serializer.is_valid():
-            user = request.user
             user.set_password(serializer.validated_data['new_password'])
-            user.save()
+            user.save(update_fields=['password'])
             return Response({"message": "Password changed successfully"}, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -10,9 +10,13 @@ class CourseAdmin(admin.ModelAdmin):
     readonly_fields = ['created_at', 'updated_at']
     
     def enrollments_count(self, obj):
-        return obj.enrollments.count()
+        return obj.enrollments_count
     enrollments_count.short_description = 'Total Enrollments'
     
     def active_enrollments_count(self, obj):
-        return obj.enrollments.filter(status='active').count()
+        return obj.active_enrollments_count
     active_enrollments_count.short_description = 'Active Enrollments'
+    
+    def get_queryset(self, request):
+        """Annotate counts in the changelist query instead of per row"""
+        return super().get_queryset(request).with_counts()
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class CoursesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'courses'
+    
+    def ready(self):
+        from mini_university.response_cache import invalidate_on_change
+        from .models import Course
+        from enrollments.models import Enrollment
+        
+        # Cached GET responses include these models' rows and counts
+        invalidate_on_change('courses', Course, Enrollment)
@@ -0,0 +1,18 @@
+from django.db import migrations
+
+from mini_university.search import search_indexes
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0001_initial'),
+    ]
+
+    operations = [
+        search_indexes(
+            'courses.Course',
+            trigram_fields=['name', 'description'],
+            vector_fields=['name', 'description'],
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.2 on 2026-10-17 15:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['name', 'id'], name='courses_name_id_idx'),
+        ),
+    ]
@@ -1,5 +1,24 @@
 from django.db import models
 
+from mini_university.querysets import count_related
+
+
+class CourseQuerySet(models.QuerySet):
+    """
+    Custom queryset for Course model.
+    """
+    
+    def with_counts(self):
+        """
+        Annotate enrollments_count and active_enrollments_count on each course.
+        """
+        return self.annotate(
+            enrollments_count=count_related(self.model, 'enrollments'),
+            active_enrollments_count=count_related(
+                self.model, 'enrollments', status='active'
+            ),
+        )
+
 
 class Course(models.Model):
     """
@@ -10,9 +29,22 @@ class Course(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = CourseQuerySet.as_manager()
+    
     class Meta:
         ordering = ['name']
         db_table = 'courses'
+        indexes = [
+            # Default list ordering and cursor pagination
+            models.Index(fields=['name', 'id'], name='courses_name_id_idx'),
+        ]
     
     def __str__(self):
         return self.name
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets signal receivers skip work when the name did not change
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from mini_university.values import ValuesSerializer, datetime_value
 from .models import Course
 
 
@@ -15,12 +16,32 @@ class CourseSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
     
     def get_enrollments_count(self, obj):
+        if hasattr(obj, 'enrollments_count'):
+            return obj.enrollments_count
         return obj.enrollments.count()
     
     def get_active_enrollments_count(self, obj):
+        if hasattr(obj, 'active_enrollments_count'):
+            return obj.active_enrollments_count
         return obj.enrollments.filter(status='active').count()
 
 
+class CourseValuesSerializer(ValuesSerializer):
+    """
+    Fast read path rendering the same output as CourseSerializer from
+    ``Course.objects.with_counts().values()`` rows.
+    """
+    fields = [
+        ('id', 'id', None),
+        ('name', 'name', None),
+        ('description', 'description', None),
+        ('enrollments_count', 'enrollments_count', None),
+        ('active_enrollments_count', 'active_enrollments_count', None),
+        ('created_at', 'created_at', datetime_value),
+        ('updated_at', 'updated_at', datetime_value),
+    ]
+
+
 class CourseCreateUpdateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating and updating Course model.
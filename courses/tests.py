@@ -1,3 +1,64 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from .models import Course
+from grades.models import Grade
+from sections.models import Section
+from students.models import Student
+from enrollments.models import Enrollment
 
-# Create your tests here.
+
+class CourseListAPITestCase(APITestCase):
+    """Test cases for Course list endpoint"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='staff', password='staffpass123')
+        self.client.force_authenticate(user=self.user)
+        
+        grade = Grade.objects.create(name="Grade 1")
+        section = Section.objects.create(name="A", grade=grade)
+        self.students = [
+            Student.objects.create(
+                name=f"Student {i}", birthdate="2010-01-01",
+                student_id=f"S{i:03d}", grade=grade, section=section
+            )
+            for i in range(3)
+        ]
+        self.courses = [Course.objects.create(name=f"Course {i}") for i in range(5)]
+        for student in self.students:
+            Enrollment.objects.create(student=student, course=self.courses[0])
+        Enrollment.objects.create(student=self.students[0], course=self.courses[1], status='dropped')
+    
+    def test_list_courses_counts(self):
+        """Test that annotated counts match the enrollments"""
+        url = reverse('courses:course-list-create')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        counts = {
+            row['name']: (row['enrollments_count'], row['active_enrollments_count'])
+            for row in response.data['results']
+        }
+        self.assertEqual(counts['Course 0'], (3, 3))
+        self.assertEqual(counts['Course 1'], (1, 0))
+        self.assertEqual(counts['Course 4'], (0, 0))
+    
+    def test_list_courses_query_count_is_constant(self):
+        """Test that the list does not run a COUNT per course"""
+        url = reverse('courses:course-list-create')
+        # One query for the paginator count and one for the page itself
+        with self.assertNumQueries(2):
+            self.client.get(url)
+        
+        for i in range(5, 25):
+            Course.objects.create(name=f"Course {i}")
+        with self.assertNumQueries(2):
+            self.client.get(url)
+    
+    def test_course_detail_counts(self):
+        """Test retrieving a course with its counts"""
+        url = reverse('courses:course-detail', kwargs={'pk': self.courses[0].pk})
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.data['enrollments_count'], 3)
+        self.assertEqual(response.data['active_enrollments_count'], 3)
@@ -6,4 +6,5 @@ app_name = 'courses'
 urlpatterns = [
     path('', views.CourseListCreateView.as_view(), name='course-list-create'),
     path('<int:pk>/', views.CourseDetailView.as_view(), name='course-detail'),
+    path('<int:pk>/stats/', views.CourseStatisticsView.as_view(), name='course-stats'),
 ]
\ No newline at end of file
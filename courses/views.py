@@ -2,45 +2,52 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
-from django.core.paginator import Paginator
-from django.db.models import Q
+
+from mini_university.conditional import detail_etag, etag_matches, list_etag, not_modified, with_etag
+from mini_university.pagination import paginate
+from mini_university.response_cache import cache_response
+from mini_university.search import CONTAINS, apply_search
+from mini_university.values import values_serializer_for
+from enrollments.models import EnrollmentStatistic
 
 from .models import Course
-from .serializers import CourseSerializer, CourseCreateUpdateSerializer
+from .serializers import CourseSerializer, CourseValuesSerializer, CourseCreateUpdateSerializer
 
 
 class CourseListCreateView(APIView):
     """
     List all courses or create a new course.
     """
+    values_serializer_class = CourseValuesSerializer
+    cursor_ordering = ['name', 'id']
+    search_fields = ['name', 'description']
     
+    @cache_response('courses')
     def get(self, request):
         """
         Retrieve all courses with optional search and pagination.
         """
         search = request.query_params.get('search', '')
-        courses = Course.objects.all()
+        search_mode = request.query_params.get('search_mode', CONTAINS)
+        courses = Course.objects.with_counts()
+        
+        courses = apply_search(courses, search, self.search_fields, search_mode)
         
-        if search:
-            courses = courses.filter(
-                Q(name__icontains=search) | Q(description__icontains=search)
-            )
+        etag, count = list_etag(request, 'courses', courses)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        values_serializer = values_serializer_for(self)
+        fields = values_serializer.lookups() if values_serializer else None
         
         # Pagination
-        page_number = request.query_params.get('page', 1)
-        page_size = request.query_params.get('page_size', 20)
-        paginator = Paginator(courses, page_size)
-        page_obj = paginator.get_page(page_number)
+        page, pagination = paginate(request, courses, self.cursor_ordering, fields, count)
         
-        serializer = CourseSerializer(page_obj, many=True)
-        return Response({
+        serializer = (values_serializer or CourseSerializer)(page, many=True)
+        return with_etag(Response({
             'results': serializer.data,
-            'count': paginator.count,
-            'next': page_obj.has_next(),
-            'previous': page_obj.has_previous(),
-            'current_page': page_obj.number,
-            'total_pages': paginator.num_pages,
-        })
+            **pagination,
+        }), etag)
     
     def post(self, request):
         """
@@ -58,20 +65,30 @@ class CourseDetailView(APIView):
     """
     Retrieve, update or delete a course instance.
     """
+    values_serializer_class = CourseValuesSerializer
     
-    def get_object(self, pk):
+    def get_object(self, pk, values_serializer=None):
         """
         Get course object or raise 404.
         """
-        return get_object_or_404(Course, pk=pk)
+        queryset = Course.objects.with_counts()
+        if values_serializer:
+            queryset = values_serializer.values(queryset)
+        return get_object_or_404(queryset, pk=pk)
     
+    @cache_response('courses')
     def get(self, request, pk):
         """
         Retrieve a specific course.
         """
-        course = self.get_object(pk)
-        serializer = CourseSerializer(course)
-        return Response(serializer.data)
+        values_serializer = values_serializer_for(self)
+        course = self.get_object(pk, values_serializer)
+        etag = detail_etag('courses', course)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        serializer = (values_serializer or CourseSerializer)(course)
+        return with_etag(Response(serializer.data), etag)
     
     def put(self, request, pk):
         """
@@ -92,3 +109,19 @@ class CourseDetailView(APIView):
         course = self.get_object(pk)
         course.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class CourseStatisticsView(APIView):
+    """
+    Enrollment statistics of a course, overall and per grade.
+    """
+    
+    def get(self, request, pk):
+        """
+        Read the course's rows of the enrollment statistics table.
+        """
+        summary = EnrollmentStatistic.objects.filter(course_id=pk).summary('grade')
+        if not summary['grades']:
+            # No statistics yet; only a missing course is a 404
+            get_object_or_404(Course.objects.only('pk'), pk=pk)
+        return Response({'course': pk, **summary})
@@ -9,9 +9,7 @@ class EnrollmentAdmin(admin.ModelAdmin):
         'status', 'final_grade', 'created_at'
     ]
     list_filter = ['status', 'enrollment_date', 'course', 'student__grade']
-    search_fields = [
-        'student__name', 'student__student_id', 'course__name'
-    ]
+    search_fields = ['search_document']
     ordering = ['-enrollment_date']
     date_hierarchy = 'enrollment_date'
     readonly_fields = ['enrollment_date', 'created_at', 'updated_at']
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class EnrollmentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'enrollments'
+    
+    def ready(self):
+        from . import signals  # noqa: F401
+        from mini_university.response_cache import invalidate_on_change
+        from .models import Enrollment
+        from students.models import Student
+        from courses.models import Course
+        
+        # Conditional GET ETags include these models' rows and counts
+        invalidate_on_change('enrollments', Enrollment, Student, Course)
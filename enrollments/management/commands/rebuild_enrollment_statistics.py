@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from enrollments.models import EnrollmentStatistic
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the enrollment statistics table from the enrollments table.
+    """
+    help = 'Recompute enrollment statistics per course, grade, section and status.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--course', type=int, action='append', dest='courses',
+            help='Only rebuild this course (repeatable).',
+        )
+        parser.add_argument(
+            '--section', type=int, action='append', dest='sections',
+            help='Only rebuild this section (repeatable).',
+        )
+    
+    def handle(self, *args, courses=None, sections=None, **options):
+        """
+        Replace the selected statistic rows in one transaction.
+        """
+        written = EnrollmentStatistic.objects.refresh(courses=courses, sections=sections)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} enrollment statistic rows.'))
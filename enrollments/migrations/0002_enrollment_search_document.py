@@ -0,0 +1,44 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, TextField, Value
+from django.db.models.functions import Concat
+
+from mini_university.search import search_indexes
+
+
+def populate_search_documents(apps, schema_editor):
+    Enrollment = apps.get_model('enrollments', 'Enrollment')
+    Student = apps.get_model('students', 'Student')
+    Course = apps.get_model('courses', 'Course')
+    students = Student.objects.filter(pk=OuterRef('student_id'))
+    courses = Course.objects.filter(pk=OuterRef('course_id'))
+    Enrollment.objects.update(search_document=Concat(
+        Subquery(students.values('name')[:1]),
+        Value(' '),
+        Subquery(students.values('student_id')[:1]),
+        Value(' '),
+        Subquery(courses.values('name')[:1]),
+        output_field=TextField(),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0001_initial'),
+        ('enrollments', '0001_initial'),
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enrollment',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(populate_search_documents, migrations.RunPython.noop),
+        search_indexes(
+            'enrollments.Enrollment',
+            trigram_fields=['search_document'],
+            vector_fields=['search_document'],
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.2 on 2026-10-17 15:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_course_courses_name_id_idx'),
+        ('enrollments', '0002_enrollment_search_document'),
+        ('students', '0002_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['-enrollment_date', 'id'], name='enrollments_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['status', '-enrollment_date', 'id'], name='enrollments_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['course', 'student'], name='enrollments_course_student_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['course'], name='enrollments_active_course_idx'),
+        ),
+    ]
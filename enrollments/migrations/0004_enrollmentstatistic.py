@@ -0,0 +1,59 @@
+# Generated by Django 5.1.2 on 2026-10-17 15:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def populate_statistics(apps, schema_editor):
+    Enrollment = apps.get_model('enrollments', 'Enrollment')
+    EnrollmentStatistic = apps.get_model('enrollments', 'EnrollmentStatistic')
+    rows = Enrollment.objects.order_by().values(
+        'course_id', 'student__grade_id', 'student__section_id', 'status'
+    ).annotate(total=Count('pk'), graded=Count('final_grade'), grade_sum=Sum('final_grade'))
+    EnrollmentStatistic.objects.bulk_create([
+        EnrollmentStatistic(
+            course_id=row['course_id'],
+            grade_id=row['student__grade_id'],
+            section_id=row['student__section_id'],
+            status=row['status'],
+            enrollments_count=row['total'],
+            graded_count=row['graded'],
+            final_grade_sum=row['grade_sum'] or 0,
+        )
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_course_courses_name_id_idx'),
+        ('enrollments', '0003_enrollment_enrollments_date_id_idx_and_more'),
+        ('grades', '0001_initial'),
+        ('sections', '0001_initial'),
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EnrollmentStatistic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('active', 'Active'), ('completed', 'Completed'), ('dropped', 'Dropped'), ('failed', 'Failed')], max_length=20)),
+                ('enrollments_count', models.PositiveIntegerField(default=0)),
+                ('graded_count', models.PositiveIntegerField(default=0)),
+                ('final_grade_sum', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='enrollment_statistics', to='courses.course')),
+                ('grade', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='enrollment_statistics', to='grades.grade')),
+                ('section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='enrollment_statistics', to='sections.section')),
+            ],
+            options={
+                'db_table': 'enrollment_statistics',
+                'indexes': [models.Index(fields=['grade', 'course'], name='enrollment_stats_grade_idx')],
+                'constraints': [models.UniqueConstraint(fields=('course', 'grade', 'section', 'status'), name='enrollment_statistics_group_uniq')],
+            },
+        ),
+        migrations.RunPython(populate_statistics, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,130 @@
-from django.db import models
+from decimal import Decimal
+from itertools import islice
+
+from django.db import connection, models, transaction
+from django.db.models import Count, OuterRef, Subquery, Sum, TextField, Value
+from django.db.models.functions import Concat
 from students.models import Student
 from courses.models import Course
+from grades.models import Grade
+from sections.models import Section
+
+
+def build_search_document(student, course):
+    """
+    Text indexed for enrollment search: student name, student ID and course name.
+    """
+    return f"{student.name} {student.student_id} {course.name}"
+
+
+class EnrollmentQuerySet(models.QuerySet):
+    """
+    Custom queryset for Enrollment model.
+    """
+    
+    def counts_by_grade_course(self, grade_courses):
+        """
+        Return a {(grade_id, course_id): count} lookup for the given
+        grade-course rows, computed with a single GROUP BY query.
+        
+        Accepts GradeCourse instances or ``.values()`` dicts with
+        ``grade_id`` and ``course_id`` keys.
+        """
+        return {
+            (row['student__grade_id'], row['course_id']): row['total']
+            for row in self.grade_course_count_rows(grade_courses)
+        }
+    
+    async def acounts_by_grade_course(self, grade_courses):
+        """
+        Async ``counts_by_grade_course``.
+        """
+        return {
+            (row['student__grade_id'], row['course_id']): row['total']
+            async for row in self.grade_course_count_rows(grade_courses)
+        }
+    
+    def grade_course_count_rows(self, grade_courses):
+        """
+        The grouped count query behind ``counts_by_grade_course``.
+        """
+        pairs = [
+            (gc['grade_id'], gc['course_id']) if isinstance(gc, dict) else (gc.grade_id, gc.course_id)
+            for gc in grade_courses
+        ]
+        if not pairs:
+            return self.none()
+        
+        return self.filter(
+            student__grade_id__in={grade_id for grade_id, _ in pairs},
+            course_id__in={course_id for _, course_id in pairs},
+        ).order_by().values('student__grade_id', 'course_id').annotate(total=Count('pk'))
+    
+    def refresh_search_documents(self):
+        """
+        Recompute search_document for these enrollments in a single UPDATE.
+        
+        Use after bulk writes that bypass the save signals, e.g. bulk_create()
+        of enrollments or queryset.update() of student or course names.
+        """
+        students = Student.objects.filter(pk=OuterRef('student_id'))
+        courses = Course.objects.filter(pk=OuterRef('course_id'))
+        return self.update(search_document=Concat(
+            Subquery(students.values('name')[:1]),
+            Value(' '),
+            Subquery(students.values('student_id')[:1]),
+            Value(' '),
+            Subquery(courses.values('name')[:1]),
+            output_field=TextField(),
+        ))
+    
+    def bulk_enroll(self, students, course_ids, batch_size=5000):
+        """
+        Enroll every student in ``students`` in each of ``course_ids``.
+        
+        Pairs that already exist are found with one query and skipped; the
+        rest are inserted in batches and their search documents and
+        statistics filled in afterwards. Returns the number of enrollments
+        created, not counting pairs a concurrent request inserted first.
+        Call inside a transaction so a failure leaves no partial enrollment.
+        """
+        course_ids = list(course_ids)
+        student_pks = students.order_by().values('pk')
+        student_ids = list(student_pks.values_list('pk', flat=True))
+        existing = set(
+            self.filter(student__in=student_pks, course_id__in=course_ids)
+            .order_by().values_list('student_id', 'course_id')
+        )
+        missing = (
+            self.model(student_id=student_id, course_id=course_id)
+            for student_id in student_ids
+            for course_id in course_ids
+            if (student_id, course_id) not in existing
+        )
+        
+        inserted = False
+        while True:
+            batch = list(islice(missing, batch_size))
+            if not batch:
+                break
+            # A concurrent enrollment of the same pair must not fail the batch
+            self.bulk_create(batch, batch_size=batch_size, ignore_conflicts=True)
+            inserted = True
+        
+        created_count = 0
+        if inserted:
+            # Only the rows inserted here still lack a search document: saved
+            # enrollments get theirs in pre_save, and other bulk enrollments
+            # fill theirs before committing. So the UPDATE's row count skips
+            # the pairs ignore_conflicts dropped.
+            created_count = self.filter(
+                student__in=student_pks, course_id__in=course_ids, search_document=''
+            ).refresh_search_documents()
+        if created_count:
+            EnrollmentStatistic.objects.refresh(
+                courses=course_ids, sections=students.order_by().values('section_id')
+            )
+        return created_count
 
 
 class Enrollment(models.Model):
@@ -19,13 +143,209 @@ class Enrollment(models.Model):
     enrollment_date = models.DateField(auto_now_add=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
     final_grade = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
+    # Denormalized from student and course so search does not join; kept in
+    # sync by enrollments.signals
+    search_document = models.TextField(blank=True, default='', editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = EnrollmentQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-enrollment_date']
         unique_together = ['student', 'course']
         db_table = 'enrollments'
+        indexes = [
+            # Default list ordering and cursor pagination
+            models.Index(fields=['-enrollment_date', 'id'], name='enrollments_date_id_idx'),
+            # List filtered by status
+            models.Index(fields=['status', '-enrollment_date', 'id'], name='enrollments_status_date_idx'),
+            # Per-course and grade-course counts (course first, then the
+            # student join); active counts use the partial index
+            models.Index(fields=['course', 'student'], name='enrollments_course_student_idx'),
+            models.Index(
+                fields=['course'],
+                condition=models.Q(status='active'),
+                name='enrollments_active_course_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.student.name} - {self.course.name} ({self.status})"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets the statistics signals retire the group an update moves away from
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+
+def summarize_statistics(totals):
+    """
+    Turn accumulated ``{status: [count, graded, grade_sum]}`` totals into
+    counts, pass and fail rates and the average final grade.
+    
+    Completed enrollments pass and failed ones fail; rates are over the
+    enrollments with an outcome and None when there are none yet.
+    """
+    status_counts = {key: 0 for key, _ in Enrollment.STATUS_CHOICES}
+    graded = 0
+    grade_sum = Decimal(0)
+    for status, (count, status_graded, status_sum) in totals.items():
+        status_counts[status] = count
+        graded += status_graded
+        grade_sum += status_sum
+    
+    decided = status_counts['completed'] + status_counts['failed']
+    return {
+        'enrollments_count': sum(status_counts.values()),
+        'status_counts': status_counts,
+        'pass_rate': round(status_counts['completed'] / decided, 4) if decided else None,
+        'fail_rate': round(status_counts['failed'] / decided, 4) if decided else None,
+        'average_final_grade': str((grade_sum / graded).quantize(Decimal('0.01'))) if graded else None,
+    }
+
+
+class EnrollmentStatisticQuerySet(models.QuerySet):
+    """
+    Custom queryset for EnrollmentStatistic model.
+    """
+    
+    def refresh(self, courses=None, sections=None):
+        """
+        Recompute the statistics of ``courses`` within ``sections`` from the
+        enrollments table.
+        
+        Both arguments take ids or a ``.values()`` subquery; None means all.
+        The matching rows are replaced with one grouped aggregate, so a
+        single enrollment write only recounts its own course and section.
+        Returns the number of statistic rows written.
+        
+        Concurrent refreshes of the same group are serialized by
+        ``group_lock`` until the enclosing transaction ends, so each counts
+        after the previous one committed. Rows are upserted, so a refresh
+        that does not lock cannot fail on the group's unique constraint.
+        """
+        statistics = self.all()
+        enrollments = Enrollment.objects.order_by()
+        if courses is not None:
+            statistics = statistics.filter(course__in=courses)
+            enrollments = enrollments.filter(course__in=courses)
+        if sections is not None:
+            statistics = statistics.filter(section__in=sections)
+            enrollments = enrollments.filter(student__section__in=sections)
+        
+        rows = enrollments.values(
+            'course_id', 'student__grade_id', 'student__section_id', 'status'
+        ).annotate(
+            total=Count('pk'),
+            graded=Count('final_grade'),
+            grade_sum=Sum('final_grade'),
+        )
+        # No savepoint: callers are usually inside a write's transaction
+        with transaction.atomic(savepoint=False):
+            lock = self.group_lock(courses, sections)
+            if lock is not None:
+                list(lock)
+            statistics.delete()
+            created = self.bulk_create([
+                self.model(
+                    course_id=row['course_id'],
+                    grade_id=row['student__grade_id'],
+                    section_id=row['student__section_id'],
+                    status=row['status'],
+                    enrollments_count=row['total'],
+                    graded_count=row['graded'],
+                    final_grade_sum=row['grade_sum'] or 0,
+                )
+                for row in rows
+            ], batch_size=1000, update_conflicts=True,
+                unique_fields=['course', 'grade', 'section', 'status'],
+                update_fields=['enrollments_count', 'graded_count', 'final_grade_sum'])
+        return len(created)
+    
+    def group_lock(self, courses=None, sections=None):
+        """
+        Query locking the sections (or, without sections, the courses) whose
+        statistics a refresh rewrites, in id order; None where the database
+        has no row locks or for a full rebuild.
+        
+        Every write path refreshes by section, so they all queue on the same
+        rows; a ``--course`` rebuild only relies on the upsert.
+        """
+        if not connection.features.has_select_for_update:
+            return None
+        if sections is not None:
+            parents = Section.objects.filter(pk__in=sections)
+        elif courses is not None:
+            parents = Course.objects.filter(pk__in=courses)
+        else:
+            return None
+        return parents.select_for_update().order_by('pk').values_list('pk', flat=True)
+    
+    def summary(self, breakdown):
+        """
+        Summarize these rows overall and per ``breakdown`` (``'course'`` or
+        ``'grade'``) from a single query.
+        """
+        rows = self.order_by().values_list(
+            f'{breakdown}_id', f'{breakdown}__name', 'status',
+            'enrollments_count', 'graded_count', 'final_grade_sum',
+        )
+        overall = {}
+        groups = {}
+        for group_id, name, status, count, graded, grade_sum in rows:
+            _, group = groups.setdefault(group_id, (name, {}))
+            for totals in (overall, group):
+                current = totals.setdefault(status, [0, 0, Decimal(0)])
+                current[0] += count
+                current[1] += graded
+                current[2] += grade_sum
+        
+        return {
+            **summarize_statistics(overall),
+            f'{breakdown}s': [
+                {breakdown: group_id, f'{breakdown}_name': name, **summarize_statistics(totals)}
+                for group_id, (name, totals) in sorted(groups.items(), key=lambda item: (item[1][0], item[0]))
+            ],
+        }
+
+
+class EnrollmentStatistic(models.Model):
+    """
+    Enrollment totals per course, grade, section and status.
+    
+    Maintained from enrollment writes by enrollments.signals and the bulk
+    endpoints, and rebuilt in full by the ``rebuild_enrollment_statistics``
+    management command.
+    """
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='enrollment_statistics')
+    grade = models.ForeignKey(Grade, on_delete=models.CASCADE, related_name='enrollment_statistics')
+    section = models.ForeignKey(Section, on_delete=models.CASCADE, related_name='enrollment_statistics')
+    status = models.CharField(max_length=20, choices=Enrollment.STATUS_CHOICES)
+    enrollments_count = models.PositiveIntegerField(default=0)
+    # Sum and count of non-null final grades, so averages can be rolled up
+    # exactly across sections and statuses
+    graded_count = models.PositiveIntegerField(default=0)
+    final_grade_sum = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    objects = EnrollmentStatisticQuerySet.as_manager()
+    
+    class Meta:
+        db_table = 'enrollment_statistics'
+        constraints = [
+            # Also serves the per-course stats lookup
+            models.UniqueConstraint(
+                fields=['course', 'grade', 'section', 'status'],
+                name='enrollment_statistics_group_uniq',
+            ),
+        ]
+        indexes = [
+            # Per-grade stats lookup
+            models.Index(fields=['grade', 'course'], name='enrollment_stats_grade_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.course_id}/{self.grade_id}/{self.section_id} {self.status}: {self.enrollments_count}"
@@ -1,7 +1,26 @@
 from rest_framework import serializers
+from mini_university.values import ValuesSerializer, date_value, datetime_value, decimal_value
 from .models import Enrollment
 from students.models import Student
 from courses.models import Course
+from grades.models import Grade
+from sections.models import Section
+from grade_course.models import GradeCourse
+
+
+def validate_final_grade_for_status(status, final_grade):
+    """
+    Check that final_grade is given exactly when the status requires it.
+    """
+    if status in ['completed', 'failed'] and final_grade is None:
+        raise serializers.ValidationError(
+            "Final grade is required when status is 'completed' or 'failed'."
+        )
+    
+    if status in ['active', 'dropped'] and final_grade is not None:
+        raise serializers.ValidationError(
+            "Final grade should not be provided when status is 'active' or 'dropped'."
+        )
 
 
 class EnrollmentSerializer(serializers.ModelSerializer):
@@ -22,6 +41,26 @@ class EnrollmentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'enrollment_date', 'created_at', 'updated_at']
 
 
+class EnrollmentValuesSerializer(ValuesSerializer):
+    """
+    Fast read path rendering the same output as EnrollmentSerializer from
+    ``Enrollment.objects.values()`` rows.
+    """
+    fields = [
+        ('id', 'id', None),
+        ('student', 'student_id', None),
+        ('student_name', 'student__name', None),
+        ('student_id_display', 'student__student_id', None),
+        ('course', 'course_id', None),
+        ('course_name', 'course__name', None),
+        ('enrollment_date', 'enrollment_date', date_value),
+        ('status', 'status', None),
+        ('final_grade', 'final_grade', decimal_value(5, 2)),
+        ('created_at', 'created_at', datetime_value),
+        ('updated_at', 'updated_at', datetime_value),
+    ]
+
+
 class EnrollmentCreateUpdateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating and updating Enrollment model.
@@ -56,15 +95,121 @@ class EnrollmentCreateUpdateSerializer(serializers.ModelSerializer):
                     "This student is already enrolled in this course."
                 )
         
-        # Validate final_grade based on status
-        if status in ['completed', 'failed'] and final_grade is None:
-            raise serializers.ValidationError(
-                "Final grade is required when status is 'completed' or 'failed'."
-            )
+        validate_final_grade_for_status(status, final_grade)
         
-        if status in ['active', 'dropped'] and final_grade is not None:
-            raise serializers.ValidationError(
-                "Final grade should not be provided when status is 'active' or 'dropped'."
+        return data
+
+
+class EnrollmentBulkCreateSerializer(serializers.Serializer):
+    """
+    Validates a bulk enrollment request for a whole section or grade.
+    
+    Exactly one of ``section`` or ``grade`` selects the students. ``courses``
+    defaults to the courses assigned to the grade through GradeCourse.
+    Validation runs a fixed number of queries, however many courses are sent.
+    """
+    section = serializers.IntegerField(required=False)
+    grade = serializers.IntegerField(required=False)
+    courses = serializers.ListField(
+        child=serializers.IntegerField(), required=False, allow_empty=False
+    )
+    
+    def validate(self, data):
+        """
+        Resolve the target students and courses.
+        """
+        section_id = data.get('section')
+        grade_id = data.get('grade')
+        if (section_id is None) == (grade_id is None):
+            raise serializers.ValidationError("Provide exactly one of 'section' or 'grade'.")
+        
+        if section_id is not None:
+            grade_id = Section.objects.filter(pk=section_id).order_by().values_list('grade_id', flat=True).first()
+            if grade_id is None:
+                raise serializers.ValidationError({'section': [f'Invalid pk "{section_id}" - object does not exist.']})
+            students = Student.objects.filter(section_id=section_id)
+        else:
+            if not Grade.objects.filter(pk=grade_id).exists():
+                raise serializers.ValidationError({'grade': [f'Invalid pk "{grade_id}" - object does not exist.']})
+            students = Student.objects.filter(grade_id=grade_id)
+        
+        course_ids = list(dict.fromkeys(data.get('courses', [])))
+        if course_ids:
+            found = set(Course.objects.filter(pk__in=course_ids).values_list('pk', flat=True))
+            missing = [course_id for course_id in course_ids if course_id not in found]
+            if missing:
+                raise serializers.ValidationError({
+                    'courses': [f'Invalid pk "{course_id}" - object does not exist.' for course_id in missing]
+                })
+        else:
+            course_ids = list(
+                GradeCourse.objects.filter(grade_id=grade_id).order_by().values_list('course_id', flat=True)
             )
+            if not course_ids:
+                raise serializers.ValidationError({'courses': ["No courses are assigned to this grade."]})
+        
+        data['students'] = students
+        data['course_ids'] = course_ids
+        return data
+
+
+class EnrollmentBulkUpdateItemSerializer(serializers.Serializer):
+    """
+    Validates one item of a bulk status/final grade update.
+    
+    Omitted fields keep their current value; the combined status and final
+    grade are checked against the enrollment by apply_enrollment_updates.
+    """
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Enrollment.STATUS_CHOICES, required=False)
+    final_grade = serializers.DecimalField(
+        max_digits=5, decimal_places=2, required=False, allow_null=True
+    )
+
+
+def apply_enrollment_updates(items):
+    """
+    Validate bulk update items and apply them to their enrollments in memory.
+    
+    Loads all referenced enrollments with one query. Returns the changed,
+    unsaved enrollments and a per-item result list in request order; failed
+    items carry an ``errors`` dict and leave their enrollment untouched.
+    """
+    item_serializers = [EnrollmentBulkUpdateItemSerializer(data=item) for item in items]
+    valid = [serializer.is_valid() for serializer in item_serializers]
+    ids = [serializer.validated_data['id'] for serializer, ok in zip(item_serializers, valid) if ok]
+    enrollments = Enrollment.objects.order_by().only('id', 'status', 'final_grade').in_bulk(ids)
+    
+    seen = set()
+    changed = []
+    results = []
+    for item, serializer, ok in zip(items, item_serializers, valid):
+        if not ok:
+            item_id = item.get('id') if isinstance(item, dict) else None
+            results.append({'id': item_id, 'updated': False, 'errors': serializer.errors})
+            continue
+        
+        data = serializer.validated_data
+        enrollment = enrollments.get(data['id'])
+        errors = None
+        if enrollment is None:
+            errors = {'id': ["Enrollment not found."]}
+        elif data['id'] in seen:
+            errors = {'id': ["This enrollment appears more than once in the request."]}
+        else:
+            status = data.get('status', enrollment.status)
+            final_grade = data.get('final_grade', enrollment.final_grade)
+            try:
+                validate_final_grade_for_status(status, final_grade)
+            except serializers.ValidationError as exc:
+                errors = {'non_field_errors': exc.detail}
         
-        return data
\ No newline at end of file
+        if errors is not None:
+            results.append({'id': data['id'], 'updated': False, 'errors': errors})
+            continue
+        seen.add(enrollment.id)
+        enrollment.status = status
+        enrollment.final_grade = final_grade
+        changed.append(enrollment)
+        results.append({'id': enrollment.id, 'updated': True})
+    return changed, results
@@ -0,0 +1,143 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from courses.models import Course
+from students.models import Student
+from .models import Enrollment, EnrollmentStatistic, build_search_document
+
+# Enrollment fields that feed the statistics
+STATISTIC_FIELDS = {'student', 'student_id', 'course', 'course_id', 'status', 'final_grade'}
+
+
+def is_delete_origin(sender, instance, origin):
+    """
+    True unless ``instance`` is being removed by a cascade from another model.
+    
+    Statistic rows are deleted by their own cascade from grades, sections
+    and courses, so receivers only refresh for direct deletes.
+    """
+    if isinstance(origin, QuerySet):
+        return origin.model is sender
+    return origin is None or origin is instance
+
+
+def indexed_fields_changed(instance, fields):
+    """
+    True if any of ``fields`` differs from the value loaded from the database.
+    
+    Instances that were not loaded, or were loaded without one of the
+    fields, count as changed. The loaded values are then moved forward so a
+    later save of the same instance compares against what it wrote.
+    """
+    loaded = getattr(instance, '_loaded_values', None)
+    current = {field: getattr(instance, field) for field in fields}
+    changed = loaded is None or any(
+        field not in loaded or loaded[field] != value for field, value in current.items()
+    )
+    if loaded is not None:
+        loaded.update(current)
+    return changed
+
+
+@receiver(pre_save, sender=Enrollment)
+def set_enrollment_search_document(sender, instance, raw=False, **kwargs):
+    """
+    Fill search_document from the enrollment's student and course.
+    """
+    if raw:
+        return
+    instance.search_document = build_search_document(instance.student, instance.course)
+
+
+@receiver(post_save, sender=Student)
+def refresh_student_enrollment_search(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Propagate student name and ID changes to their enrollments.
+    """
+    if created:
+        return
+    if update_fields is not None and not {'name', 'student_id'} & set(update_fields):
+        return
+    if not indexed_fields_changed(instance, ['name', 'student_id']):
+        return
+    Enrollment.objects.filter(student=instance).refresh_search_documents()
+
+
+@receiver(post_save, sender=Course)
+def refresh_course_enrollment_search(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Propagate course name changes to its enrollments.
+    """
+    if created:
+        return
+    if update_fields is not None and 'name' not in update_fields:
+        return
+    if not indexed_fields_changed(instance, ['name']):
+        return
+    Enrollment.objects.filter(course=instance).refresh_search_documents()
+
+
+@receiver(post_save, sender=Enrollment)
+def refresh_enrollment_statistics(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Recount the statistics of the enrollment's course and section, and of
+    the ones it moved away from.
+    """
+    if raw:
+        return
+    if update_fields is not None and not STATISTIC_FIELDS & set(update_fields):
+        return
+    
+    courses = {instance.course_id}
+    sections = {instance.student.section_id}
+    loaded = getattr(instance, '_loaded_values', {})
+    if loaded.get('course_id', instance.course_id) != instance.course_id:
+        courses.add(loaded['course_id'])
+    if loaded.get('student_id', instance.student_id) != instance.student_id:
+        sections.update(
+            Student.objects.filter(pk=loaded['student_id']).values_list('section_id', flat=True)
+        )
+    EnrollmentStatistic.objects.refresh(courses=courses, sections=sections)
+    # A later save of this instance moves away from what was just written
+    loaded.update(course_id=instance.course_id, student_id=instance.student_id)
+
+
+@receiver(post_delete, sender=Enrollment)
+def retire_enrollment_statistics(sender, instance, origin=None, **kwargs):
+    """
+    Recount the statistics of a deleted enrollment's course and section.
+    """
+    if not is_delete_origin(sender, instance, origin):
+        return
+    EnrollmentStatistic.objects.refresh(
+        courses=[instance.course_id],
+        sections=Student.objects.filter(pk=instance.student_id).values('section_id'),
+    )
+
+
+@receiver(post_save, sender=Student)
+def move_student_statistics(sender, instance, created, raw=False, **kwargs):
+    """
+    Recount the sections a student left and joined.
+    """
+    if created or raw:
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    old_grade = loaded.get('grade_id', instance.grade_id)
+    old_section = loaded.get('section_id', instance.section_id)
+    if (old_grade, old_section) == (instance.grade_id, instance.section_id):
+        return
+    EnrollmentStatistic.objects.refresh(sections={old_section, instance.section_id})
+    # A later save of this instance moves away from what was just written
+    loaded.update(grade_id=instance.grade_id, section_id=instance.section_id)
+
+
+@receiver(post_delete, sender=Student)
+def retire_student_statistics(sender, instance, origin=None, **kwargs):
+    """
+    Recount the section of a deleted student.
+    """
+    if not is_delete_origin(sender, instance, origin):
+        return
+    EnrollmentStatistic.objects.refresh(sections=[instance.section_id])
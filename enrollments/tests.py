@@ -1,3 +1,524 @@
-from django.test import TestCase
+import io
+import json
+from decimal import Decimal
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from .models import Enrollment, EnrollmentQuerySet, EnrollmentStatistic, EnrollmentStatisticQuerySet
+from grades.models import Grade
+from sections.models import Section
+from students.models import Student
+from courses.models import Course
+from grade_course.models import GradeCourse
+
+
+class EnrollmentCursorPaginationTestCase(APITestCase):
+    """Test cases for keyset pagination on the enrollment list"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='staff', password='staffpass123')
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('enrollments:enrollment-list-create')
+        
+        grade = Grade.objects.create(name="Grade 1")
+        section = Section.objects.create(name="A", grade=grade)
+        courses = [Course.objects.create(name=f"Course {i}") for i in range(5)]
+        for i in range(5):
+            student = Student.objects.create(
+                name=f"Student {i}", birthdate="2010-01-01",
+                student_id=f"S{i:03d}", grade=grade, section=section
+            )
+            for course in courses:
+                Enrollment.objects.create(student=student, course=course)
+    
+    def walk(self, direction, cursor):
+        """Follow cursors in one direction, collecting ids"""
+        ids = []
+        while cursor is not None:
+            response = self.client.get(self.url, {'cursor': cursor, 'page_size': 7})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            page_ids = [row['id'] for row in response.data['results']]
+            ids = page_ids + ids if direction == 'previous' else ids + page_ids
+            cursor = response.data[direction]
+        return ids, response
+    
+    def test_cursor_walks_all_rows_in_order(self):
+        """Test that following next cursors visits every row exactly once"""
+        ids, last = self.walk('next', '')
+        expected = list(
+            Enrollment.objects.order_by('-enrollment_date', 'id').values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+        self.assertNotIn('count', last.data)
+    
+    def test_cursor_previous_returns_to_start(self):
+        """Test that previous cursors walk back over the same rows"""
+        ids, last = self.walk('next', '')
+        back_ids, first = self.walk('previous', last.data['previous'])
+        self.assertEqual(back_ids + ids[-len(last.data['results']):], ids)
+        self.assertIsNone(first.data['previous'])
+    
+    def test_cursor_with_filters(self):
+        """Test that cursor mode respects list filters"""
+        response = self.client.get(self.url, {'cursor': '', 'status': 'dropped'})
+        self.assertEqual(response.data['results'], [])
+        self.assertIsNone(response.data['next'])
+    
+    def test_invalid_cursor(self):
+        """Test that a malformed cursor is rejected"""
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_page_number_mode_unchanged(self):
+        """Test that page-number pagination still reports totals"""
+        response = self.client.get(self.url, {'page': 2, 'page_size': 10})
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual(response.data['total_pages'], 3)
+        self.assertEqual(response.data['current_page'], 2)
+        self.assertTrue(response.data['next'])
+        self.assertTrue(response.data['previous'])
+
+
+class EnrollmentSearchDocumentTestCase(APITestCase):
+    """Test cases for the denormalized enrollment search document"""
+    
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='staff', password='staffpass123')
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('enrollments:enrollment-list-create')
+        
+        grade = Grade.objects.create(name="Grade 1")
+        section = Section.objects.create(name="A", grade=grade)
+        self.student = Student.objects.create(
+            name="Alice Smith", birthdate="2010-01-01",
+            student_id="A001", grade=grade, section=section
+        )
+        self.course = Course.objects.create(name="Mathematics")
+        self.enrollment = Enrollment.objects.create(student=self.student, course=self.course)
+    
+    def search(self, term):
+        response = self.client.get(self.url, {'search': term})
+        return [row['id'] for row in response.data['results']]
+    
+    def test_document_set_on_save(self):
+        """Test that saving an enrollment fills its search document"""
+        self.enrollment.refresh_from_db()
+        self.assertEqual(self.enrollment.search_document, "Alice Smith A001 Mathematics")
+        self.assertEqual(self.search('a001'), [self.enrollment.id])
+        self.assertEqual(self.search('math'), [self.enrollment.id])
+    
+    def test_student_and_course_renames_propagate(self):
+        """Test that student and course saves refresh their enrollments"""
+        self.student.name = "Alice Jones"
+        self.student.save()
+        self.course.name = "Algebra"
+        self.course.save()
+        self.assertEqual(self.search('jones'), [self.enrollment.id])
+        self.assertEqual(self.search('algebra'), [self.enrollment.id])
+        self.assertEqual(self.search('smith'), [])
+    
+    def test_unindexed_changes_skip_refresh(self):
+        """Test that saves leaving the indexed fields alone do not touch enrollments"""
+        student = Student.objects.get(pk=self.student.pk)
+        course = Course.objects.get(pk=self.course.pk)
+        student.birthdate = "2011-01-01"
+        course.description = "Numbers"
+        with CaptureQueriesContext(connection) as queries:
+            student.save()
+            course.save()
+        self.assertFalse([q for q in queries.captured_queries if 'enrollments' in q['sql']])
+        
+        # Changed and changed back on the same instance still propagates
+        course.name = "Algebra"
+        course.save()
+        course.name = "Mathematics"
+        course.save()
+        self.assertEqual(self.search('math'), [self.enrollment.id])
+    
+    def test_refresh_after_bulk_update(self):
+        """Test refreshing documents after writes that bypass signals"""
+        Course.objects.filter(pk=self.course.pk).update(name="Geometry")
+        self.assertEqual(self.search('geometry'), [])
+        Enrollment.objects.filter(course=self.course).refresh_search_documents()
+        self.assertEqual(self.search('geometry'), [self.enrollment.id])
+    
+    def test_search_does_not_join(self):
+        """Test that the filtered enrollment query touches only its own table"""
+        with CaptureQueriesContext(connection) as queries:
+            self.search('alice')
+        count_sql = queries.captured_queries[0]['sql']
+        self.assertNotIn('JOIN', count_sql)
+
+
+class EnrollmentBulkCreateTestCase(APITestCase):
+    """Test cases for bulk enrollment of sections and grades"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='staff', password='staffpass123')
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('enrollments:enrollment-bulk-create')
+        
+        self.grade = Grade.objects.create(name="Grade 1")
+        self.section_a = Section.objects.create(name="A", grade=self.grade)
+        self.section_b = Section.objects.create(name="B", grade=self.grade)
+        self.courses = [Course.objects.create(name=f"Course {i}") for i in range(3)]
+        for course in self.courses[:2]:
+            GradeCourse.objects.create(grade=self.grade, course=course)
+        self.students = [
+            Student.objects.create(
+                name=f"Student {i}", birthdate="2010-01-01", student_id=f"S{i:03d}",
+                grade=self.grade, section=self.section_a if i < 4 else self.section_b
+            )
+            for i in range(6)
+        ]
+        Enrollment.objects.create(student=self.students[0], course=self.courses[0])
+    
+    def test_section_defaults_to_grade_courses(self):
+        """Test enrolling a section in its grade's courses, skipping existing pairs"""
+        response = self.client.post(self.url, {'section': self.section_a.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created_count'], 7)
+        self.assertEqual(sorted(response.data['courses']), [self.courses[0].id, self.courses[1].id])
+        self.assertEqual(Enrollment.objects.filter(student__section=self.section_b).count(), 0)
+        
+        enrollment = Enrollment.objects.get(student=self.students[1], course=self.courses[1])
+        self.assertEqual(enrollment.status, 'active')
+        self.assertEqual(enrollment.search_document, "Student 1 S001 Course 1")
+        
+        response = self.client.post(self.url, {'section': self.section_a.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created_count'], 0)
+    
+    def test_concurrently_enrolled_pairs_are_not_counted(self):
+        """Test that pairs ignored as conflicts are left out of created_count"""
+        bulk_create = EnrollmentQuerySet.bulk_create
+        
+        def racing_bulk_create(queryset, objs, *args, **kwargs):
+            # Another request enrolls one of the pairs after the existing
+            # pairs were read
+            Enrollment.objects.create(student=self.students[1], course=self.courses[1])
+            return bulk_create(queryset, objs, *args, **kwargs)
+        
+        with mock.patch.object(EnrollmentQuerySet, 'bulk_create', racing_bulk_create):
+            response = self.client.post(self.url, {'section': self.section_a.id}, format='json')
+        self.assertEqual(response.data['created_count'], 6)
+        self.assertEqual(Enrollment.objects.filter(student__section=self.section_a).count(), 8)
+    
+    def test_grade_with_explicit_courses(self):
+        """Test enrolling a whole grade in the given courses"""
+        data = {'grade': self.grade.id, 'courses': [self.courses[2].id]}
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created_count'], 6)
+        self.assertEqual(Enrollment.objects.filter(course=self.courses[2]).count(), 6)
+    
+    def test_invalid_requests(self):
+        """Test target and course validation"""
+        response = self.client.post(self.url, {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        data = {'grade': self.grade.id, 'courses': [9999]}
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('courses', response.data)
+        self.assertEqual(Enrollment.objects.count(), 1)
+    
+    def test_query_count_does_not_grow_with_students(self):
+        """Test that bulk enrollment runs a fixed number of queries"""
+        # Grade, grade courses, student ids, existing pairs, insert, search
+        # document refresh, statistics refresh (delete, aggregate, insert),
+        # plus the transaction savepoints
+        with self.assertNumQueries(11):
+            self.client.post(self.url, {'grade': self.grade.id}, format='json')
+        self.assertEqual(Enrollment.objects.count(), 12)
+
+
+class EnrollmentBulkUpdateTestCase(APITestCase):
+    """Test cases for batched enrollment status and final grade updates"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='staff', password='staffpass123')
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('enrollments:enrollment-bulk-update')
+        
+        grade = Grade.objects.create(name="Grade 1")
+        section = Section.objects.create(name="A", grade=grade)
+        course = Course.objects.create(name="Mathematics")
+        self.enrollments = [
+            Enrollment.objects.create(
+                student=Student.objects.create(
+                    name=f"Student {i}", birthdate="2010-01-01",
+                    student_id=f"S{i:03d}", grade=grade, section=section
+                ),
+                course=course,
+            )
+            for i in range(20)
+        ]
+    
+    def test_bulk_update_with_item_errors(self):
+        """Test that valid items are saved and invalid ones reported in order"""
+        first, second, third = self.enrollments[:3]
+        data = [
+            {'id': first.id, 'status': 'completed', 'final_grade': '91.50'},
+            {'id': second.id, 'status': 'completed'},
+            {'id': 9999, 'status': 'dropped'},
+            {'id': third.id, 'status': 'dropped'},
+            {'id': first.id, 'status': 'dropped'},
+            {'status': 'active'},
+        ]
+        response = self.client.patch(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated_count'], 2)
+        self.assertEqual(
+            [result['updated'] for result in response.data['results']],
+            [True, False, False, True, False, False]
+        )
+        self.assertIn('non_field_errors', response.data['results'][1]['errors'])
+        self.assertIn('id', response.data['results'][5]['errors'])
+        
+        first.refresh_from_db()
+        second.refresh_from_db()
+        third.refresh_from_db()
+        self.assertEqual((first.status, str(first.final_grade)), ('completed', '91.50'))
+        self.assertEqual(second.status, 'active')
+        self.assertEqual(third.status, 'dropped')
+    
+    def test_partial_item_keeps_current_values(self):
+        """Test that omitted fields are checked against the stored values"""
+        enrollment = self.enrollments[0]
+        Enrollment.objects.filter(pk=enrollment.pk).update(status='completed', final_grade=70)
+        response = self.client.patch(self.url, [{'id': enrollment.id, 'final_grade': '75.00'}], format='json')
+        self.assertEqual(response.data['updated_count'], 1)
+        enrollment.refresh_from_db()
+        self.assertEqual(str(enrollment.final_grade), '75.00')
+    
+    def test_query_count_does_not_grow_with_items(self):
+        """Test that a batch of updates runs a fixed number of queries"""
+        data = [
+            {'id': enrollment.id, 'status': 'completed', 'final_grade': '80.00'}
+            for enrollment in self.enrollments
+        ]
+        # One select, one UPDATE ... CASE, the statistics refresh (delete,
+        # aggregate, insert), plus the transaction savepoints
+        with self.assertNumQueries(7):
+            response = self.client.patch(self.url, data, format='json')
+        self.assertEqual(response.data['updated_count'], 20)
+    
+    def test_non_list_body(self):
+        """Test that a single object is rejected"""
+        response = self.client.patch(self.url, {'id': self.enrollments[0].id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class EnrollmentExportTestCase(APITestCase):
+    """Test cases for the streaming enrollment export"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='staff', password='staffpass123')
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('enrollments:enrollment-export')
+        
+        grade = Grade.objects.create(name="Grade 1")
+        section = Section.objects.create(name="A", grade=grade)
+        course = Course.objects.create(name="Mathematics")
+        for i in range(10):
+            student = Student.objects.create(
+                name=f"Student {i}", birthdate="2010-01-01",
+                student_id=f"S{i:03d}", grade=grade, section=section
+            )
+            Enrollment.objects.create(
+                student=student, course=course,
+                status='completed' if i < 4 else 'active',
+                final_grade=Decimal('88.50') if i < 4 else None,
+            )
+    
+    def test_ndjson_export_applies_status_filter(self):
+        """Test that the export honours the list filters and API formatting"""
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'status': 'completed', 'export_format': 'ndjson'})
+            rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0]['final_grade'], '88.50')
+        self.assertEqual(rows[0]['course_name'], 'Mathematics')
+    
+    def test_csv_export_leaves_nulls_empty(self):
+        """Test that missing final grades export as empty CSV cells"""
+        response = self.client.get(self.url, {'status': 'active'})
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 7)
+        self.assertEqual(lines[1].split(',')[8], '')
+
+
+class EnrollmentStatisticsTestCase(APITestCase):
+    """Test cases for the incrementally maintained enrollment statistics"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='staff', password='staffpass123')
+        self.client.force_authenticate(user=self.user)
+        self.grade = Grade.objects.create(name="Grade 1")
+        self.section_a = Section.objects.create(name="A", grade=self.grade)
+        self.section_b = Section.objects.create(name="B", grade=self.grade)
+        self.course = Course.objects.create(name="Mathematics")
+        self.students = [
+            Student.objects.create(
+                name=f"Student {i}", birthdate="2010-01-01", student_id=f"S{i:03d}",
+                grade=self.grade, section=self.section_a if i < 2 else self.section_b
+            )
+            for i in range(4)
+        ]
+        self.enrollments = [
+            Enrollment.objects.create(student=student, course=self.course)
+            for student in self.students
+        ]
+        self.course_url = reverse('courses:course-stats', kwargs={'pk': self.course.id})
+    
+    def statistic_rows(self):
+        return set(EnrollmentStatistic.objects.values_list(
+            'course_id', 'grade_id', 'section_id', 'status', 'enrollments_count',
+            'graded_count', 'final_grade_sum',
+        ))
+    
+    def test_updates_maintain_statistics(self):
+        """Test that single writes keep the course statistics current"""
+        for enrollment, grade in zip(self.enrollments[:3], ['90.00', '70.00', '40.00']):
+            response = self.client.put(
+                reverse('enrollments:enrollment-detail', kwargs={'pk': enrollment.id}),
+                {
+                    'student': enrollment.student_id, 'course': self.course.id,
+                    'status': 'failed' if grade == '40.00' else 'completed', 'final_grade': grade,
+                },
+                format='json'
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        with self.assertNumQueries(1):
+            response = self.client.get(self.course_url)
+        self.assertEqual(response.data['enrollments_count'], 4)
+        self.assertEqual(
+            response.data['status_counts'],
+            {'active': 1, 'completed': 2, 'dropped': 0, 'failed': 1}
+        )
+        self.assertEqual(response.data['pass_rate'], 0.6667)
+        self.assertEqual(response.data['fail_rate'], 0.3333)
+        self.assertEqual(response.data['average_final_grade'], '66.67')
+        self.assertEqual(response.data['grades'][0]['grade_name'], 'Grade 1')
+        
+        self.client.delete(reverse('enrollments:enrollment-detail', kwargs={'pk': self.enrollments[3].id}))
+        response = self.client.get(self.course_url)
+        self.assertEqual(response.data['status_counts']['active'], 0)
+    
+    def test_repeated_saves_of_one_instance(self):
+        """Test that each save of the same instance retires the group it left"""
+        enrollment = Enrollment.objects.get(pk=self.enrollments[0].pk)
+        for name in ("Physics", "Chemistry"):
+            enrollment.course = Course.objects.create(name=name)
+            enrollment.save()
+        maintained = self.statistic_rows()
+        
+        EnrollmentStatistic.objects.all().delete()
+        call_command('rebuild_enrollment_statistics', stdout=io.StringIO())
+        self.assertEqual(self.statistic_rows(), maintained)
+        self.assertFalse(EnrollmentStatistic.objects.filter(course__name="Physics").exists())
+    
+    def test_student_moves_and_deletes(self):
+        """Test that section changes and student deletes move the counts"""
+        student = Student.objects.get(pk=self.students[0].pk)
+        student.section = self.section_b
+        student.save()
+        counts = dict(
+            EnrollmentStatistic.objects.values_list('section_id', 'enrollments_count')
+        )
+        self.assertEqual(counts, {self.section_a.id: 1, self.section_b.id: 3})
+        
+        self.client.delete(reverse('students:student-detail', kwargs={'pk': self.students[1].id}))
+        self.assertFalse(EnrollmentStatistic.objects.filter(section=self.section_a).exists())
+        
+        self.section_b.delete()
+        self.assertFalse(EnrollmentStatistic.objects.exists())
+    
+    def test_student_moves_back(self):
+        """Test that moving one instance away and back leaves the original counts"""
+        student = Student.objects.get(pk=self.students[0].pk)
+        for section in (self.section_b, self.section_a):
+            student.section = section
+            student.save()
+        counts = dict(
+            EnrollmentStatistic.objects.values_list('section_id', 'enrollments_count')
+        )
+        self.assertEqual(counts, {self.section_a.id: 2, self.section_b.id: 2})
+    
+    def test_bulk_writes_and_rebuild_agree(self):
+        """Test that bulk paths leave the same rows as a full rebuild"""
+        other = Course.objects.create(name="English")
+        self.client.post(
+            reverse('enrollments:enrollment-bulk-create'),
+            {'grade': self.grade.id, 'courses': [other.id]}, format='json'
+        )
+        self.client.patch(
+            reverse('enrollments:enrollment-bulk-update'),
+            [{'id': self.enrollments[0].id, 'status': 'completed', 'final_grade': '88.50'}],
+            format='json'
+        )
+        maintained = self.statistic_rows()
+        self.assertEqual(len(maintained), 5)
+        
+        EnrollmentStatistic.objects.all().delete()
+        call_command('rebuild_enrollment_statistics', stdout=io.StringIO())
+        self.assertEqual(self.statistic_rows(), maintained)
+        
+        grade_url = reverse('grades:grade-stats', kwargs={'pk': self.grade.id})
+        response = self.client.get(grade_url)
+        self.assertEqual(response.data['enrollments_count'], 8)
+        self.assertEqual(
+            [row['course_name'] for row in response.data['courses']], ['English', 'Mathematics']
+        )
+        self.assertEqual(response.data['courses'][1]['average_final_grade'], '88.50')
+    
+    def test_refresh_upserts_concurrently_inserted_groups(self):
+        """Test a group inserted by another writer mid-refresh is overwritten, not a conflict"""
+        expected = self.statistic_rows()
+        delete = EnrollmentStatisticQuerySet.delete
+        
+        def delete_then_race(queryset):
+            result = delete(queryset)
+            # A concurrent refresh of the same group commits a stale row
+            EnrollmentStatistic.objects.create(
+                course=self.course, grade=self.grade, section=self.section_a,
+                status='active', enrollments_count=99, graded_count=0, final_grade_sum=0,
+            )
+            return result
+        
+        with mock.patch.object(EnrollmentStatisticQuerySet, 'delete', delete_then_race):
+            EnrollmentStatistic.objects.refresh(courses=[self.course.id], sections=[self.section_a.id])
+        self.assertEqual(self.statistic_rows(), expected)
+    
+    @skipUnless(connection.features.has_select_for_update, 'needs SELECT ... FOR UPDATE')
+    def test_refresh_locks_its_group(self):
+        """Test a refresh locks its sections before recounting"""
+        with CaptureQueriesContext(connection) as queries:
+            EnrollmentStatistic.objects.refresh(courses=[self.course.id], sections=[self.section_a.id])
+        locks = [query['sql'] for query in queries.captured_queries if 'FOR UPDATE' in query['sql']]
+        self.assertEqual(len(locks), 1)
+        self.assertIn('"sections"', locks[0])
+    
+    def test_missing_and_empty(self):
+        """Test that only a missing course or grade is a 404"""
+        response = self.client.get(reverse('courses:course-stats', kwargs={'pk': 999}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        
+        empty = Grade.objects.create(name="Grade 2")
+        response = self.client.get(reverse('grades:grade-stats', kwargs={'pk': empty.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['enrollments_count'], 0)
+        self.assertIsNone(response.data['pass_rate'])
+        self.assertIsNone(response.data['average_final_grade'])
+        self.assertEqual(response.data['courses'], [])
@@ -1,9 +1,15 @@
 from django.urls import path
+
+from mini_university.async_views import read_view
+
 from . import views
 
 app_name = 'enrollments'
 
 urlpatterns = [
-    path('', views.EnrollmentListCreateView.as_view(), name='enrollment-list-create'),
-    path('<int:pk>/', views.EnrollmentDetailView.as_view(), name='enrollment-detail'),
+    path('', read_view(views.EnrollmentListCreateView, views.AsyncEnrollmentListCreateView).as_view(), name='enrollment-list-create'),
+    path('<int:pk>/', read_view(views.EnrollmentDetailView, views.AsyncEnrollmentDetailView).as_view(), name='enrollment-detail'),
+    path('bulk/', views.EnrollmentBulkCreateView.as_view(), name='enrollment-bulk-create'),
+    path('bulk-update/', views.EnrollmentBulkUpdateView.as_view(), name='enrollment-bulk-update'),
+    path('export/', views.EnrollmentExportView.as_view(), name='enrollment-export'),
 ]
\ No newline at end of file
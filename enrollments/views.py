@@ -1,35 +1,47 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from django.shortcuts import get_object_or_404
-from django.core.paginator import Paginator
-from django.db.models import Q
+from django.shortcuts import aget_object_or_404, get_object_or_404
+from django.db import transaction
+from django.utils import timezone
 
-from .models import Enrollment
-from .serializers import EnrollmentSerializer, EnrollmentCreateUpdateSerializer
+from mini_university.async_views import AsyncAPIView
+from mini_university.conditional import (
+    alist_etag, detail_etag, etag_matches, list_etag, not_modified, with_etag,
+)
+from mini_university.export import get_export_format, stream_export
+from mini_university.pagination import apaginate, paginate
+from mini_university.response_cache import invalidate_for
+from mini_university.search import CONTAINS, apply_search
+from mini_university.values import values_serializer_for
 
+from .models import Enrollment, EnrollmentStatistic
+from .serializers import (
+    EnrollmentSerializer,
+    EnrollmentValuesSerializer,
+    EnrollmentCreateUpdateSerializer,
+    EnrollmentBulkCreateSerializer,
+    apply_enrollment_updates,
+)
 
-class EnrollmentListCreateView(APIView):
+
+class EnrollmentFilterMixin:
     """
-    List all enrollments or create a new enrollment.
+    Search and filters shared by the enrollment list and export views.
     """
+    search_fields = ['search_document']
     
-    def get(self, request):
+    def filter_queryset(self, request, enrollments):
         """
-        Retrieve all enrollments with optional search and pagination.
+        Apply the ``search``, ``student``, ``course`` and ``status`` query parameters.
         """
         search = request.query_params.get('search', '')
+        search_mode = request.query_params.get('search_mode', CONTAINS)
         student_id = request.query_params.get('student', '')
         course_id = request.query_params.get('course', '')
         status_filter = request.query_params.get('status', '')
-        enrollments = Enrollment.objects.select_related('student', 'course').all()
         
-        if search:
-            enrollments = enrollments.filter(
-                Q(student__name__icontains=search) |
-                Q(student__student_id__icontains=search) |
-                Q(course__name__icontains=search)
-            )
+        enrollments = apply_search(enrollments, search, self.search_fields, search_mode)
         
         if student_id:
             enrollments = enrollments.filter(student_id=student_id)
@@ -40,21 +52,39 @@ class EnrollmentListCreateView(APIView):
         if status_filter:
             enrollments = enrollments.filter(status=status_filter)
         
+        return enrollments
+
+
+class EnrollmentListCreateView(EnrollmentFilterMixin, APIView):
+    """
+    List all enrollments or create a new enrollment.
+    """
+    values_serializer_class = EnrollmentValuesSerializer
+    cursor_ordering = ['-enrollment_date', 'id']
+    
+    def get(self, request):
+        """
+        Retrieve all enrollments with optional search and pagination.
+        """
+        enrollments = self.filter_queryset(
+            request, Enrollment.objects.select_related('student', 'course').all()
+        )
+        
+        etag, count = list_etag(request, 'enrollments', enrollments)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        values_serializer = values_serializer_for(self)
+        fields = values_serializer.lookups() if values_serializer else None
+        
         # Pagination
-        page_number = request.query_params.get('page', 1)
-        page_size = request.query_params.get('page_size', 20)
-        paginator = Paginator(enrollments, page_size)
-        page_obj = paginator.get_page(page_number)
+        page, pagination = paginate(request, enrollments, self.cursor_ordering, fields, count)
         
-        serializer = EnrollmentSerializer(page_obj, many=True)
-        return Response({
+        serializer = (values_serializer or EnrollmentSerializer)(page, many=True)
+        return with_etag(Response({
             'results': serializer.data,
-            'count': paginator.count,
-            'next': page_obj.has_next(),
-            'previous': page_obj.has_previous(),
-            'current_page': page_obj.number,
-            'total_pages': paginator.num_pages,
-        })
+            **pagination,
+        }), etag)
     
     def post(self, request):
         """
@@ -68,24 +98,67 @@ class EnrollmentListCreateView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class EnrollmentExportView(EnrollmentFilterMixin, APIView):
+    """
+    Export all enrollments matching the list filters as CSV or NDJSON.
+    """
+    ordering = ['-enrollment_date', 'id']
+    export_fields = [
+        ('id', 'id'),
+        ('student', 'student_id'),
+        ('student_name', 'student__name'),
+        ('student_id_display', 'student__student_id'),
+        ('course', 'course_id'),
+        ('course_name', 'course__name'),
+        ('enrollment_date', 'enrollment_date'),
+        ('status', 'status'),
+        ('final_grade', 'final_grade'),
+        ('created_at', 'created_at'),
+        ('updated_at', 'updated_at'),
+    ]
+    
+    def get(self, request):
+        """
+        Stream the filtered enrollments with constant memory.
+        """
+        export_format = get_export_format(request)
+        enrollments = self.filter_queryset(request, Enrollment.objects.order_by(*self.ordering))
+        return stream_export(enrollments, self.export_fields, 'enrollments', export_format)
+
+
 class EnrollmentDetailView(APIView):
     """
     Retrieve, update or delete an enrollment instance.
     """
+    values_serializer_class = EnrollmentValuesSerializer
     
-    def get_object(self, pk):
+    def object_queryset(self, values_serializer=None):
+        """
+        Queryset single enrollments are looked up in.
+        """
+        queryset = Enrollment.objects.select_related('student', 'course')
+        if values_serializer:
+            queryset = values_serializer.values(queryset)
+        return queryset
+    
+    def get_object(self, pk, values_serializer=None):
         """
         Get enrollment object or raise 404.
         """
-        return get_object_or_404(Enrollment, pk=pk)
+        return get_object_or_404(self.object_queryset(values_serializer), pk=pk)
     
     def get(self, request, pk):
         """
         Retrieve a specific enrollment.
         """
-        enrollment = self.get_object(pk)
-        serializer = EnrollmentSerializer(enrollment)
-        return Response(serializer.data)
+        values_serializer = values_serializer_for(self)
+        enrollment = self.get_object(pk, values_serializer)
+        etag = detail_etag('enrollments', enrollment)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        serializer = (values_serializer or EnrollmentSerializer)(enrollment)
+        return with_etag(Response(serializer.data), etag)
     
     def put(self, request, pk):
         """
@@ -106,3 +179,131 @@ class EnrollmentDetailView(APIView):
         enrollment = self.get_object(pk)
         enrollment.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class EnrollmentBulkCreateView(APIView):
+    """
+    Enroll a whole section or grade in a set of courses at once.
+    """
+    batch_size = 5000
+    
+    def post(self, request):
+        """
+        Create the missing enrollments for every student and course pair.
+        
+        Students who are already enrolled in a course are skipped. All
+        enrollments are inserted in a single transaction.
+        """
+        serializer = EnrollmentBulkCreateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        course_ids = serializer.validated_data['course_ids']
+        with transaction.atomic():
+            created_count = Enrollment.objects.bulk_enroll(
+                serializer.validated_data['students'], course_ids, self.batch_size
+            )
+            if created_count:
+                invalidate_for(Enrollment)
+        
+        response_data = {
+            'created_count': created_count,
+            'courses': course_ids,
+        }
+        if created_count:
+            return Response(response_data, status=status.HTTP_201_CREATED)
+        return Response(response_data, status=status.HTTP_200_OK)
+
+
+class EnrollmentBulkUpdateView(APIView):
+    """
+    Update the status and final grade of many enrollments at once.
+    """
+    batch_size = 1000
+    
+    def patch(self, request):
+        """
+        Apply a list of ``{id, status, final_grade}`` items.
+        
+        Items are validated with the same status and final grade rules as
+        single updates. Valid items are written with bulk_update and every
+        item gets a result in request order.
+        """
+        items = request.data
+        if not isinstance(items, list):
+            return Response(
+                {'error': 'Expected a JSON array of enrollment updates.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        enrollments, results = apply_enrollment_updates(items)
+        now = timezone.now()
+        for enrollment in enrollments:
+            enrollment.updated_at = now
+        with transaction.atomic():
+            Enrollment.objects.bulk_update(
+                enrollments, ['status', 'final_grade', 'updated_at'], batch_size=self.batch_size
+            )
+            if enrollments:
+                # bulk_update sends no post_save signals
+                updated = Enrollment.objects.filter(pk__in=[enrollment.pk for enrollment in enrollments])
+                EnrollmentStatistic.objects.refresh(
+                    courses=updated.values('course_id'), sections=updated.values('student__section_id')
+                )
+                invalidate_for(Enrollment)
+        
+        response_data = {
+            'updated_count': len(enrollments),
+            'results': results,
+        }
+        if enrollments or not items:
+            return Response(response_data, status=status.HTTP_200_OK)
+        return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+
+class AsyncEnrollmentListCreateView(AsyncAPIView, EnrollmentListCreateView):
+    """
+    EnrollmentListCreateView with an async GET.
+    """
+    
+    async def get(self, request):
+        """
+        Retrieve all enrollments with optional search and pagination.
+        """
+        enrollments = self.filter_queryset(
+            request, Enrollment.objects.select_related('student', 'course').all()
+        )
+        
+        etag, count = await alist_etag(request, 'enrollments', enrollments)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        values_serializer = values_serializer_for(self)
+        fields = values_serializer.lookups() if values_serializer else None
+        
+        page, pagination = await apaginate(request, enrollments, self.cursor_ordering, fields, count)
+        
+        serializer = (values_serializer or EnrollmentSerializer)(page, many=True)
+        return with_etag(Response({
+            'results': serializer.data,
+            **pagination,
+        }), etag)
+
+
+class AsyncEnrollmentDetailView(AsyncAPIView, EnrollmentDetailView):
+    """
+    EnrollmentDetailView with an async GET.
+    """
+    
+    async def get(self, request, pk):
+        """
+        Retrieve a specific enrollment.
+        """
+        values_serializer = values_serializer_for(self)
+        enrollment = await aget_object_or_404(self.object_queryset(values_serializer), pk=pk)
+        etag = detail_etag('enrollments', enrollment)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        serializer = (values_serializer or EnrollmentSerializer)(enrollment)
+        return with_etag(Response(serializer.data), etag)
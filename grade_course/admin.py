@@ -24,6 +24,9 @@ class GradeCourseAdmin(admin.ModelAdmin):
     
     def enrollments_count(self, obj):
         """Get count of enrollments for this course in this grade"""
+        if hasattr(obj, 'enrollments_count'):
+            return obj.enrollments_count
+        
         from enrollments.models import Enrollment
         return Enrollment.objects.filter(
             course=obj.course,
@@ -31,6 +34,17 @@ class GradeCourseAdmin(admin.ModelAdmin):
         ).count()
     enrollments_count.short_description = 'Enrollments'
     
+    def get_changelist_instance(self, request):
+        """Attach enrollment counts for the current page in one grouped query"""
+        from enrollments.models import Enrollment
+        changelist = super().get_changelist_instance(request)
+        counts = Enrollment.objects.counts_by_grade_course(changelist.result_list)
+        for grade_course in changelist.result_list:
+            grade_course.enrollments_count = counts.get(
+                (grade_course.grade_id, grade_course.course_id), 0
+            )
+        return changelist
+    
     def get_queryset(self, request):
         """Optimize queries by selecting related objects"""
         return super().get_queryset(request).select_related('grade', 'course')
@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class GradeCourseConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'grade_course'
+    
+    def ready(self):
+        from mini_university.response_cache import invalidate_on_change
+        from .models import GradeCourse
+        from grades.models import Grade
+        from courses.models import Course
+        from enrollments.models import Enrollment
+        from students.models import Student
+        
+        # Cached GET responses include these models' rows and counts
+        invalidate_on_change('grade_courses', GradeCourse, Grade, Course, Enrollment, Student)
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from mini_university.values import ValuesSerializer, datetime_value
 from .models import GradeCourse
 from grades.models import Grade
 from courses.models import Course
@@ -23,6 +24,10 @@ class GradeCourseSerializer(serializers.ModelSerializer):
     
     def get_enrollments_count(self, obj):
         """Get count of enrollments for this course in this grade"""
+        counts = self.context.get('enrollment_counts')
+        if counts is not None:
+            return counts.get((obj.grade_id, obj.course_id), 0)
+        
         from enrollments.models import Enrollment
         return Enrollment.objects.filter(
             course=obj.course,
@@ -30,6 +35,33 @@ class GradeCourseSerializer(serializers.ModelSerializer):
         ).count()
 
 
+class GradeCourseValuesSerializer(ValuesSerializer):
+    """
+    Fast read path rendering the same output as GradeCourseSerializer from
+    ``GradeCourse.objects.values()`` rows.
+    """
+    fields = [
+        ('id', 'id', None),
+        ('grade', 'grade_id', None),
+        ('grade_name', 'grade__name', None),
+        ('course', 'course_id', None),
+        ('course_name', 'course__name', None),
+        ('course_description', 'course__description', None),
+        ('enrollments_count', None, None),
+        ('created_at', 'created_at', datetime_value),
+        ('updated_at', 'updated_at', datetime_value),
+    ]
+    
+    def to_representation(self, row):
+        data = super().to_representation(row)
+        counts = self.context.get('enrollment_counts')
+        if counts is None:
+            from enrollments.models import Enrollment
+            counts = Enrollment.objects.counts_by_grade_course([row])
+        data['enrollments_count'] = counts.get((row['grade_id'], row['course_id']), 0)
+        return data
+
+
 class GradeCourseCreateUpdateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating and updating GradeCourse model.
@@ -65,6 +97,31 @@ class GradeCourseCreateUpdateSerializer(serializers.ModelSerializer):
         return data
 
 
+class BulkAssignCoursesSerializer(serializers.Serializer):
+    """
+    Validates the shape of a bulk course assignment request.
+    
+    ``grade_id`` and ``grade_ids`` are merged into one ``grade_ids`` list,
+    in order and without duplicates. Course items are left to the view,
+    which reports each unknown course without rejecting the others.
+    """
+    grade_id = serializers.IntegerField(required=False)
+    grade_ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+    courses = serializers.ListField(allow_empty=False)
+    
+    def validate(self, data):
+        """
+        Require at least one grade.
+        """
+        grade_ids = data.get('grade_ids', [])
+        if data.get('grade_id') is not None:
+            grade_ids = [data['grade_id'], *grade_ids]
+        if not grade_ids:
+            raise serializers.ValidationError({'grade_id': ['Provide grade_id or grade_ids.']})
+        data['grade_ids'] = list(dict.fromkeys(grade_ids))
+        return data
+
+
 class GradeCourseSummarySerializer(serializers.ModelSerializer):
     """
     Simplified serializer for listing grade-course relationships.
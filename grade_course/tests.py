@@ -1,10 +1,14 @@
 from django.test import TestCase
+from django.contrib.auth.models import User
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
 from .models import GradeCourse
 from grades.models import Grade
 from courses.models import Course
+from sections.models import Section
+from students.models import Student
+from enrollments.models import Enrollment
 
 
 class GradeCourseModelTestCase(TestCase):
@@ -87,3 +91,133 @@ class GradeCourseAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['grades']), 1)
         self.assertEqual(response.data['grades'][0]['name'], 'Grade 1')
+
+
+class GradeCourseEnrollmentCountTestCase(APITestCase):
+    """Test cases for batched enrollment counts on grade-course listings"""
+    
+    def setUp(self):
+        self.grade1 = Grade.objects.create(name="Grade 1")
+        self.grade2 = Grade.objects.create(name="Grade 2")
+        self.course1 = Course.objects.create(name="Mathematics")
+        self.course2 = Course.objects.create(name="English")
+        for grade in (self.grade1, self.grade2):
+            for course in (self.course1, self.course2):
+                GradeCourse.objects.create(grade=grade, course=course)
+        
+        section = Section.objects.create(name="A", grade=self.grade1)
+        for i in range(3):
+            student = Student.objects.create(
+                name=f"Student {i}", birthdate="2010-01-01",
+                student_id=f"S{i:03d}", grade=self.grade1, section=section
+            )
+            Enrollment.objects.create(student=student, course=self.course1)
+        
+        self.admin_user = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='adminpass123'
+        )
+    
+    def test_list_enrollment_counts(self):
+        """Test that enrollment counts are computed per (grade, course) pair"""
+        url = reverse('grade_course:grade-course-list-create')
+        # Paginator count, page rows and one grouped enrollment count
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        counts = {
+            (row['grade'], row['course']): row['enrollments_count']
+            for row in response.data['results']
+        }
+        self.assertEqual(counts[(self.grade1.id, self.course1.id)], 3)
+        self.assertEqual(counts[(self.grade1.id, self.course2.id)], 0)
+        self.assertEqual(counts[(self.grade2.id, self.course1.id)], 0)
+    
+    def test_admin_changelist_enrollment_counts(self):
+        """Test that the admin changelist renders batched enrollment counts"""
+        self.client.force_login(self.admin_user)
+        response = self.client.get(reverse('admin:grade_course_gradecourse_changelist'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        counts = {
+            (gc.grade_id, gc.course_id): gc.enrollments_count
+            for gc in response.context['cl'].result_list
+        }
+        self.assertEqual(counts[(self.grade1.id, self.course1.id)], 3)
+        self.assertEqual(counts[(self.grade2.id, self.course2.id)], 0)
+    
+    def test_list_cursor_pagination(self):
+        """Test keyset pagination ordered by grade and course name"""
+        url = reverse('grade_course:grade-course-list-create')
+        response = self.client.get(url, {'cursor': '', 'page_size': 3})
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertIsNone(response.data['previous'])
+        
+        response = self.client.get(url, {'cursor': response.data['next'], 'page_size': 3})
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNone(response.data['next'])
+        self.assertEqual(response.data['results'][0]['grade_name'], 'Grade 2')
+        self.assertEqual(response.data['results'][0]['course_name'], 'Mathematics')
+
+
+class BulkAssignCoursesTestCase(APITestCase):
+    """Test cases for the set-based bulk assignment endpoint"""
+    
+    def setUp(self):
+        self.url = reverse('grade_course:bulk-assign-courses')
+        self.grade1 = Grade.objects.create(name="Grade 1")
+        self.grade2 = Grade.objects.create(name="Grade 2")
+        self.courses = [Course.objects.create(name=f"Course {i}") for i in range(10)]
+        GradeCourse.objects.create(grade=self.grade1, course=self.courses[0])
+    
+    def test_bulk_assign_to_multiple_grades(self):
+        """Test assigning courses to several grades, skipping existing pairs"""
+        data = {
+            'grade_ids': [self.grade1.id, self.grade2.id],
+            'courses': [{'course_id': self.courses[0].id}, {'course_id': self.courses[1].id}],
+        }
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created_count'], 3)
+        self.assertEqual(response.data['errors'], [
+            "Course 'Course 0' is already assigned to grade 'Grade 1'"
+        ])
+        self.assertEqual(GradeCourse.objects.count(), 4)
+        created = {(row['grade'], row['course']) for row in response.data['created']}
+        self.assertNotIn((self.grade1.id, self.courses[0].id), created)
+    
+    def test_unknown_course_and_grade(self):
+        """Test that unknown courses are reported and unknown grades rejected"""
+        data = {'grade_id': self.grade2.id, 'courses': [{'course_id': 9999}]}
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['errors'], ["Course with ID 9999 not found"])
+        
+        data = {'grade_ids': [self.grade2.id, 9999], 'courses': [{'course_id': self.courses[1].id}]}
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(GradeCourse.objects.filter(grade=self.grade2).exists())
+    
+    def test_malformed_grade_ids(self):
+        """Test that grade ids that are not a list of integers are a bad request"""
+        courses = [{'course_id': self.courses[1].id}]
+        for data in (
+            {'grade_ids': [self.grade2.id, 'abc'], 'courses': courses},
+            {'grade_ids': str(self.grade2.id), 'courses': courses},
+            {'grade_id': 'abc', 'courses': courses},
+            {'courses': courses},
+            {'grade_id': self.grade2.id, 'courses': 'abc'},
+        ):
+            with self.subTest(data=data):
+                response = self.client.post(self.url, data, format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(GradeCourse.objects.filter(grade=self.grade2).exists())
+    
+    def test_query_count_does_not_grow_with_courses(self):
+        """Test that assigning many courses uses a fixed number of queries"""
+        data = {
+            'grade_id': self.grade2.id,
+            'courses': [{'course_id': course.id} for course in self.courses],
+        }
+        # Grades, courses, existing pairs, insert, created rows, enrollment
+        # counts, plus the transaction savepoints
+        with self.assertNumQueries(8):
+            response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.data['created_count'], 10)
@@ -1,12 +1,15 @@
 from django.urls import path
+
+from mini_university.async_views import read_view
+
 from . import views
 
 app_name = 'grade_course'
 
 urlpatterns = [
     # Basic CRUD operations
-    path('', views.GradeCourseListCreateView.as_view(), name='grade-course-list-create'),
-    path('<int:pk>/', views.GradeCourseDetailView.as_view(), name='grade-course-detail'),
+    path('', read_view(views.GradeCourseListCreateView, views.AsyncGradeCourseListCreateView).as_view(), name='grade-course-list-create'),
+    path('<int:pk>/', read_view(views.GradeCourseDetailView, views.AsyncGradeCourseDetailView).as_view(), name='grade-course-detail'),
     
     # Specialized views
     path('grade/<int:grade_id>/courses/', views.CoursesByGradeView.as_view(), name='courses-by-grade'),
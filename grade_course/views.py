@@ -1,21 +1,33 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
-from django.shortcuts import get_object_or_404
-from django.core.paginator import Paginator
-from django.db.models import Q
+from django.db import transaction
+from django.shortcuts import aget_object_or_404, get_object_or_404
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
+from mini_university.async_views import AsyncAPIView
+from mini_university.conditional import (
+    alist_etag, detail_etag, etag_matches, list_etag, not_modified, with_etag,
+)
+from mini_university.pagination import apaginate, paginate
+from mini_university.response_cache import cache_response, invalidate_for
+from mini_university.search import CONTAINS, apply_search
+from mini_university.throttling import ClientRateThrottle
+from mini_university.values import values_serializer_for
+
 from .models import GradeCourse
 from grades.models import Grade
 from courses.models import Course
+from enrollments.models import Enrollment
 from .serializers import (
     GradeCourseSerializer, 
+    GradeCourseValuesSerializer,
     GradeCourseCreateUpdateSerializer,
     GradeCourseSummarySerializer,
     CoursesByGradeSerializer,
-    GradesByCourseSerializer
+    GradesByCourseSerializer,
+    BulkAssignCoursesSerializer
 )
 
 
@@ -24,36 +36,65 @@ class GradeCourseListCreateView(APIView):
     List all grade-course relationships or create a new one.
     """
     permission_classes = [permissions.AllowAny]  # Adjust as needed
+    throttle_classes = [ClientRateThrottle]
+    values_serializer_class = GradeCourseValuesSerializer
+    cursor_ordering = ['grade__name', 'course__name', 'id']
+    search_fields = ['grade__name', 'course__name', 'course__description']
     
     @swagger_auto_schema(
         operation_description="List all grade-course relationships",
         manual_parameters=[
             openapi.Parameter('search', openapi.IN_QUERY, description="Search by grade or course name", type=openapi.TYPE_STRING),
+            openapi.Parameter('search_mode', openapi.IN_QUERY, description="'contains' (default) or 'fulltext' for ranked full-text search", type=openapi.TYPE_STRING),
             openapi.Parameter('grade', openapi.IN_QUERY, description="Filter by grade ID", type=openapi.TYPE_INTEGER),
             openapi.Parameter('course', openapi.IN_QUERY, description="Filter by course ID", type=openapi.TYPE_INTEGER),
 
             openapi.Parameter('page', openapi.IN_QUERY, description="Page number", type=openapi.TYPE_INTEGER),
             openapi.Parameter('page_size', openapi.IN_QUERY, description="Page size", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('cursor', openapi.IN_QUERY, description="Keyset pagination cursor (empty for the first page); skips the total count", type=openapi.TYPE_STRING),
         ],
         responses={200: GradeCourseSerializer(many=True)}
     )
+    @cache_response('grade_courses')
     def get(self, request):
         """
         Retrieve all grade-course relationships with optional filtering and pagination.
         """
+        grade_courses = self.filter_queryset(request)
+        
+        etag, count = list_etag(request, 'grade_courses', grade_courses)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        values_serializer = values_serializer_for(self)
+        fields = values_serializer.lookups() if values_serializer else None
+        
+        # Pagination
+        page, pagination = paginate(request, grade_courses, self.cursor_ordering, fields, count)
+        
+        # Count enrollments for the whole page in one grouped query
+        enrollment_counts = Enrollment.objects.counts_by_grade_course(page)
+        serializer = (values_serializer or GradeCourseSerializer)(
+            page, many=True, context={'enrollment_counts': enrollment_counts}
+        )
+        return with_etag(Response({
+            'results': serializer.data,
+            **pagination,
+        }), etag)
+    
+    def filter_queryset(self, request):
+        """
+        Grade-courses matching the ``search``, ``grade`` and ``course`` query parameters.
+        """
         search = request.query_params.get('search', '')
+        search_mode = request.query_params.get('search_mode', CONTAINS)
         grade_id = request.query_params.get('grade', '')
         course_id = request.query_params.get('course', '')
         
         grade_courses = GradeCourse.objects.select_related('grade', 'course').all()
         
         # Apply filters
-        if search:
-            grade_courses = grade_courses.filter(
-                Q(grade__name__icontains=search) | 
-                Q(course__name__icontains=search) |
-                Q(course__description__icontains=search)
-            )
+        grade_courses = apply_search(grade_courses, search, self.search_fields, search_mode)
         
         if grade_id:
             grade_courses = grade_courses.filter(grade_id=grade_id)
@@ -61,21 +102,7 @@ class GradeCourseListCreateView(APIView):
         if course_id:
             grade_courses = grade_courses.filter(course_id=course_id)
         
-        # Pagination
-        page_number = request.query_params.get('page', 1)
-        page_size = request.query_params.get('page_size', 20)
-        paginator = Paginator(grade_courses, page_size)
-        page_obj = paginator.get_page(page_number)
-        
-        serializer = GradeCourseSerializer(page_obj, many=True)
-        return Response({
-            'results': serializer.data,
-            'count': paginator.count,
-            'next': page_obj.has_next(),
-            'previous': page_obj.has_previous(),
-            'current_page': page_obj.number,
-            'total_pages': paginator.num_pages,
-        })
+        return grade_courses
     
     @swagger_auto_schema(
         operation_description="Create a new grade-course relationship",
@@ -102,22 +129,37 @@ class GradeCourseDetailView(APIView):
     Retrieve, update or delete a grade-course relationship.
     """
     permission_classes = [permissions.AllowAny]  # Adjust as needed
+    throttle_classes = [ClientRateThrottle]
+    values_serializer_class = GradeCourseValuesSerializer
+    
+    def object_queryset(self, values_serializer=None):
+        """Queryset single grade-courses are looked up in."""
+        queryset = GradeCourse.objects.select_related('grade', 'course')
+        if values_serializer:
+            queryset = values_serializer.values(queryset)
+        return queryset
     
-    def get_object(self, pk):
+    def get_object(self, pk, values_serializer=None):
         """Get grade-course object or raise 404."""
-        return get_object_or_404(GradeCourse, pk=pk)
+        return get_object_or_404(self.object_queryset(values_serializer), pk=pk)
     
     @swagger_auto_schema(
         operation_description="Retrieve a specific grade-course relationship",
         responses={200: GradeCourseSerializer}
     )
+    @cache_response('grade_courses')
     def get(self, request, pk):
         """
         Retrieve a specific grade-course relationship.
         """
-        grade_course = self.get_object(pk)
-        serializer = GradeCourseSerializer(grade_course)
-        return Response(serializer.data)
+        values_serializer = values_serializer_for(self)
+        grade_course = self.get_object(pk, values_serializer)
+        etag = detail_etag('grade_courses', grade_course)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        serializer = (values_serializer or GradeCourseSerializer)(grade_course)
+        return with_etag(Response(serializer.data), etag)
     
     @swagger_auto_schema(
         operation_description="Update a specific grade-course relationship",
@@ -158,11 +200,13 @@ class CoursesByGradeView(APIView):
     Get all courses for a specific grade.
     """
     permission_classes = [permissions.AllowAny]  # Adjust as needed
+    throttle_classes = [ClientRateThrottle]
     
     @swagger_auto_schema(
         operation_description="Get all courses for a specific grade",
         responses={200: CoursesByGradeSerializer}
     )
+    @cache_response('grade_courses')
     def get(self, request, grade_id):
         """
         Get all courses assigned to a specific grade.
@@ -177,11 +221,13 @@ class GradesByCourseView(APIView):
     Get all grades for a specific course.
     """
     permission_classes = [permissions.AllowAny]  # Adjust as needed
+    throttle_classes = [ClientRateThrottle]
     
     @swagger_auto_schema(
         operation_description="Get all grades for a specific course",
         responses={200: GradesByCourseSerializer}
     )
+    @cache_response('grade_courses')
     def get(self, request, course_id):
         """
         Get all grades that have this course assigned.
@@ -196,11 +242,13 @@ class GradeCourseSummaryView(APIView):
     Get a summary of all grade-course relationships.
     """
     permission_classes = [permissions.AllowAny]  # Adjust as needed
+    throttle_classes = [ClientRateThrottle]
     
     @swagger_auto_schema(
         operation_description="Get a summary of all grade-course relationships",
         responses={200: GradeCourseSummarySerializer(many=True)}
     )
+    @cache_response('grade_courses')
     def get(self, request):
         """
         Get a simplified list of all grade-course relationships.
@@ -212,16 +260,22 @@ class GradeCourseSummaryView(APIView):
 
 class BulkAssignCoursesToGradeView(APIView):
     """
-    Bulk assign multiple courses to a grade.
+    Bulk assign multiple courses to one or more grades.
     """
     permission_classes = [permissions.AllowAny]  # Adjust as needed
+    throttle_classes = [ClientRateThrottle]
     
     @swagger_auto_schema(
-        operation_description="Bulk assign multiple courses to a grade",
+        operation_description="Bulk assign multiple courses to one or more grades",
         request_body=openapi.Schema(
             type=openapi.TYPE_OBJECT,
             properties={
                 'grade_id': openapi.Schema(type=openapi.TYPE_INTEGER),
+                'grade_ids': openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_INTEGER),
+                    description="Assign the courses to several grades at once"
+                ),
                 'courses': openapi.Schema(
                     type=openapi.TYPE_ARRAY,
                     items=openapi.Schema(
@@ -240,46 +294,78 @@ class BulkAssignCoursesToGradeView(APIView):
     )
     def post(self, request):
         """
-        Bulk assign multiple courses to a specific grade.
-        """
-        grade_id = request.data.get('grade_id')
-        courses_data = request.data.get('courses', [])
+        Bulk assign multiple courses to the given grades.
         
-        if not grade_id:
-            return Response({'error': 'grade_id is required'}, status=status.HTTP_400_BAD_REQUEST)
+        Grades, courses and existing assignments are each looked up with a
+        single query, and the missing pairs are inserted together in one
+        transaction, so the query count does not grow with the request.
+        """
+        serializer = BulkAssignCoursesSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
-        if not courses_data:
-            return Response({'error': 'courses list is required'}, status=status.HTTP_400_BAD_REQUEST)
+        grade_ids = serializer.validated_data['grade_ids']
+        courses_data = serializer.validated_data['courses']
         
-        try:
-            grade = Grade.objects.get(pk=grade_id)
-        except Grade.DoesNotExist:
+        grades = Grade.objects.order_by().in_bulk(grade_ids)
+        if len(grades) != len(grade_ids):
             return Response({'error': 'Grade not found'}, status=status.HTTP_404_NOT_FOUND)
         
-        created_relationships = []
         errors = []
-        
+        course_ids = []
         for course_data in courses_data:
-            course_id = course_data.get('course_id')
-            
+            course_id = course_data.get('course_id') if isinstance(course_data, dict) else None
             try:
-                course = Course.objects.get(pk=course_id)
-                
-                # Check if relationship already exists
-                if GradeCourse.objects.filter(grade=grade, course=course).exists():
-                    errors.append(f"Course '{course.name}' is already assigned to grade '{grade.name}'")
-                    continue
-                
-                grade_course = GradeCourse.objects.create(
-                    grade=grade,
-                    course=course
-                )
-                created_relationships.append(GradeCourseSerializer(grade_course).data)
-                
-            except Course.DoesNotExist:
+                course_ids.append(int(course_id))
+            except (TypeError, ValueError):
                 errors.append(f"Course with ID {course_id} not found")
-            except Exception as e:
-                errors.append(f"Error creating relationship for course {course_id}: {str(e)}")
+        course_ids = list(dict.fromkeys(course_ids))
+        
+        courses = Course.objects.order_by().in_bulk(course_ids)
+        errors.extend(
+            f"Course with ID {course_id} not found"
+            for course_id in course_ids if course_id not in courses
+        )
+        
+        with transaction.atomic():
+            existing = set(
+                GradeCourse.objects.filter(grade_id__in=grades, course_id__in=courses)
+                .order_by().values_list('grade_id', 'course_id')
+            )
+            new_pairs = []
+            for grade_id in grade_ids:
+                for course_id in course_ids:
+                    if course_id not in courses:
+                        continue
+                    if (grade_id, course_id) in existing:
+                        errors.append(
+                            f"Course '{courses[course_id].name}' is already assigned "
+                            f"to grade '{grades[grade_id].name}'"
+                        )
+                    else:
+                        new_pairs.append((grade_id, course_id))
+            
+            created = []
+            if new_pairs:
+                # ignore_conflicts keeps a concurrent assignment of the same
+                # pair from failing the whole batch
+                GradeCourse.objects.bulk_create(
+                    [GradeCourse(grade_id=grade_id, course_id=course_id) for grade_id, course_id in new_pairs],
+                    ignore_conflicts=True,
+                )
+                invalidate_for(GradeCourse)
+                # Rows inserted with ignore_conflicts come back without pks
+                created = [
+                    grade_course for grade_course in GradeCourse.objects.filter(
+                        grade_id__in=grades, course_id__in=courses
+                    ).select_related('grade', 'course')
+                    if (grade_course.grade_id, grade_course.course_id) not in existing
+                ]
+        
+        enrollment_counts = Enrollment.objects.counts_by_grade_course(created)
+        created_relationships = GradeCourseSerializer(
+            created, many=True, context={'enrollment_counts': enrollment_counts}
+        ).data
         
         response_data = {
             'created': created_relationships,
@@ -291,3 +377,65 @@ class BulkAssignCoursesToGradeView(APIView):
             return Response(response_data, status=status.HTTP_201_CREATED)
         else:
             return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+
+class AsyncGradeCourseListCreateView(AsyncAPIView, GradeCourseListCreateView):
+    """
+    GradeCourseListCreateView with an async GET.
+    """
+    
+    @swagger_auto_schema(
+        operation_description="List all grade-course relationships",
+        responses={200: GradeCourseSerializer(many=True)}
+    )
+    @cache_response('grade_courses')
+    async def get(self, request):
+        """
+        Retrieve all grade-course relationships with optional filtering and pagination.
+        """
+        grade_courses = self.filter_queryset(request)
+        
+        etag, count = await alist_etag(request, 'grade_courses', grade_courses)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        values_serializer = values_serializer_for(self)
+        fields = values_serializer.lookups() if values_serializer else None
+        
+        page, pagination = await apaginate(request, grade_courses, self.cursor_ordering, fields, count)
+        
+        enrollment_counts = await Enrollment.objects.acounts_by_grade_course(page)
+        serializer = (values_serializer or GradeCourseSerializer)(
+            page, many=True, context={'enrollment_counts': enrollment_counts}
+        )
+        return with_etag(Response({
+            'results': serializer.data,
+            **pagination,
+        }), etag)
+
+
+class AsyncGradeCourseDetailView(AsyncAPIView, GradeCourseDetailView):
+    """
+    GradeCourseDetailView with an async GET.
+    """
+    
+    @swagger_auto_schema(
+        operation_description="Retrieve a specific grade-course relationship",
+        responses={200: GradeCourseSerializer}
+    )
+    @cache_response('grade_courses')
+    async def get(self, request, pk):
+        """
+        Retrieve a specific grade-course relationship.
+        """
+        values_serializer = values_serializer_for(self)
+        grade_course = await aget_object_or_404(self.object_queryset(values_serializer), pk=pk)
+        etag = detail_etag('grade_courses', grade_course)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        enrollment_counts = await Enrollment.objects.acounts_by_grade_course([grade_course])
+        serializer = (values_serializer or GradeCourseSerializer)(
+            grade_course, context={'enrollment_counts': enrollment_counts}
+        )
+        return with_etag(Response(serializer.data), etag)
@@ -10,9 +10,13 @@ class GradeAdmin(admin.ModelAdmin):
     readonly_fields = ['created_at', 'updated_at']
     
     def sections_count(self, obj):
-        return obj.sections.count()
+        return obj.sections_count
     sections_count.short_description = 'Sections'
     
     def students_count(self, obj):
-        return obj.students.count()
+        return obj.students_count
     students_count.short_description = 'Students'
+    
+    def get_queryset(self, request):
+        """Annotate counts in the changelist query instead of per row"""
+        return super().get_queryset(request).with_counts()
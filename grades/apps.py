@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class GradesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'grades'
+    
+    def ready(self):
+        from mini_university.response_cache import invalidate_on_change
+        from .models import Grade
+        from sections.models import Section
+        from students.models import Student
+        
+        # Cached GET responses include these models' rows and counts
+        invalidate_on_change('grades', Grade, Section, Student)
@@ -1,5 +1,22 @@
 from django.db import models
 
+from mini_university.querysets import count_related
+
+
+class GradeQuerySet(models.QuerySet):
+    """
+    Custom queryset for Grade model.
+    """
+    
+    def with_counts(self):
+        """
+        Annotate sections_count and students_count on each grade.
+        """
+        return self.annotate(
+            sections_count=count_related(self.model, 'sections'),
+            students_count=count_related(self.model, 'students'),
+        )
+
 
 class Grade(models.Model):
     """
@@ -9,6 +26,8 @@ class Grade(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = GradeQuerySet.as_manager()
+    
     class Meta:
         ordering = ['name']
         db_table = 'grades'
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from mini_university.values import ValuesSerializer, datetime_value
 from .models import Grade
 
 
@@ -15,12 +16,31 @@ class GradeSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
     
     def get_sections_count(self, obj):
+        if hasattr(obj, 'sections_count'):
+            return obj.sections_count
         return obj.sections.count()
     
     def get_students_count(self, obj):
+        if hasattr(obj, 'students_count'):
+            return obj.students_count
         return obj.students.count()
 
 
+class GradeValuesSerializer(ValuesSerializer):
+    """
+    Fast read path rendering the same output as GradeSerializer from
+    ``Grade.objects.with_counts().values()`` rows.
+    """
+    fields = [
+        ('id', 'id', None),
+        ('name', 'name', None),
+        ('sections_count', 'sections_count', None),
+        ('students_count', 'students_count', None),
+        ('created_at', 'created_at', datetime_value),
+        ('updated_at', 'updated_at', datetime_value),
+    ]
+
+
 class GradeCreateUpdateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating and updating Grade model.
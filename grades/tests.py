@@ -1,3 +1,37 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from .models import Grade
+from sections.models import Section
+from students.models import Student
 
-# Create your tests here.
+
+class GradeListAPITestCase(APITestCase):
+    """Test cases for Grade list endpoint"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='staff', password='staffpass123')
+        self.client.force_authenticate(user=self.user)
+        
+        self.grade1 = Grade.objects.create(name="Grade 1")
+        self.grade2 = Grade.objects.create(name="Grade 2")
+        section_a = Section.objects.create(name="A", grade=self.grade1)
+        Section.objects.create(name="B", grade=self.grade1)
+        for i in range(4):
+            Student.objects.create(
+                name=f"Student {i}", birthdate="2010-01-01",
+                student_id=f"S{i:03d}", grade=self.grade1, section=section_a
+            )
+    
+    def test_list_grades_counts(self):
+        """Test that sections and students are counted without row multiplication"""
+        url = reverse('grades:grade-list-create')
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = {row['name']: row for row in response.data['results']}
+        self.assertEqual(results['Grade 1']['sections_count'], 2)
+        self.assertEqual(results['Grade 1']['students_count'], 4)
+        self.assertEqual(results['Grade 2']['sections_count'], 0)
+        self.assertEqual(results['Grade 2']['students_count'], 0)
@@ -6,4 +6,5 @@ app_name = 'grades'
 urlpatterns = [
     path('', views.GradeListCreateView.as_view(), name='grade-list-create'),
     path('<int:pk>/', views.GradeDetailView.as_view(), name='grade-detail'),
+    path('<int:pk>/stats/', views.GradeStatisticsView.as_view(), name='grade-stats'),
 ]
\ No newline at end of file
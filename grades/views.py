@@ -2,43 +2,51 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
-from django.core.paginator import Paginator
 from django.db.models import Q
 
+from mini_university.conditional import detail_etag, etag_matches, list_etag, not_modified, with_etag
+from mini_university.pagination import paginate
+from mini_university.response_cache import cache_response
+from mini_university.values import values_serializer_for
+from enrollments.models import EnrollmentStatistic
+
 from .models import Grade
-from .serializers import GradeSerializer, GradeCreateUpdateSerializer
+from .serializers import GradeSerializer, GradeValuesSerializer, GradeCreateUpdateSerializer
 
 
 class GradeListCreateView(APIView):
     """
     List all grades or create a new grade.
     """
+    values_serializer_class = GradeValuesSerializer
+    cursor_ordering = ['name', 'id']
     
+    @cache_response('grades')
     def get(self, request):
         """
         Retrieve all grades with optional search and pagination.
         """
         search = request.query_params.get('search', '')
-        grades = Grade.objects.all()
+        grades = Grade.objects.with_counts()
         
         if search:
             grades = grades.filter(name__icontains=search)
         
+        etag, count = list_etag(request, 'grades', grades)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        values_serializer = values_serializer_for(self)
+        fields = values_serializer.lookups() if values_serializer else None
+        
         # Pagination
-        page_number = request.query_params.get('page', 1)
-        page_size = request.query_params.get('page_size', 20)
-        paginator = Paginator(grades, page_size)
-        page_obj = paginator.get_page(page_number)
+        page, pagination = paginate(request, grades, self.cursor_ordering, fields, count)
         
-        serializer = GradeSerializer(page_obj, many=True)
-        return Response({
+        serializer = (values_serializer or GradeSerializer)(page, many=True)
+        return with_etag(Response({
             'results': serializer.data,
-            'count': paginator.count,
-            'next': page_obj.has_next(),
-            'previous': page_obj.has_previous(),
-            'current_page': page_obj.number,
-            'total_pages': paginator.num_pages,
-        })
+            **pagination,
+        }), etag)
     
     def post(self, request):
         """
@@ -56,20 +64,30 @@ class GradeDetailView(APIView):
     """
     Retrieve, update or delete a grade instance.
     """
+    values_serializer_class = GradeValuesSerializer
     
-    def get_object(self, pk):
+    def get_object(self, pk, values_serializer=None):
         """
         Get grade object or raise 404.
         """
-        return get_object_or_404(Grade, pk=pk)
+        queryset = Grade.objects.with_counts()
+        if values_serializer:
+            queryset = values_serializer.values(queryset)
+        return get_object_or_404(queryset, pk=pk)
     
+    @cache_response('grades')
     def get(self, request, pk):
         """
         Retrieve a specific grade.
         """
-        grade = self.get_object(pk)
-        serializer = GradeSerializer(grade)
-        return Response(serializer.data)
+        values_serializer = values_serializer_for(self)
+        grade = self.get_object(pk, values_serializer)
+        etag = detail_etag('grades', grade)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        serializer = (values_serializer or GradeSerializer)(grade)
+        return with_etag(Response(serializer.data), etag)
     
     def put(self, request, pk):
         """
@@ -90,3 +108,19 @@ class GradeDetailView(APIView):
         grade = self.get_object(pk)
         grade.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class GradeStatisticsView(APIView):
+    """
+    Enrollment statistics of a grade, overall and per course.
+    """
+    
+    def get(self, request, pk):
+        """
+        Read the grade's rows of the enrollment statistics table.
+        """
+        summary = EnrollmentStatistic.objects.filter(grade_id=pk).summary('course')
+        if not summary['courses']:
+            # No statistics yet; only a missing grade is a 404
+            get_object_or_404(Grade.objects.only('pk'), pk=pk)
+        return Response({'grade': pk, **summary})
@@ -0,0 +1,68 @@
+"""
+Async support for the read endpoints.
+
+``AsyncAPIView`` is an ``APIView`` whose handlers may be coroutines. The
+request is set up as usual (authentication, permissions, throttles) in a
+worker thread, because authentication may query the user table; an async
+handler then runs on the event loop and queries through Django's async ORM,
+while sync handlers (POST, PUT, DELETE) keep running in a worker thread.
+
+The async views subclass the sync ones and only replace ``get``, so both
+paths share filters, serializers and responses. ``ASYNC_READ_VIEWS``
+selects them in the URLconfs; serve them with an ASGI server such as
+uvicorn (``mini_university.asgi:application``).
+"""
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.utils.functional import classproperty
+from rest_framework.views import APIView
+
+
+def read_view(sync_view, async_view):
+    """
+    The view class ``ASYNC_READ_VIEWS`` selects for a URL.
+    """
+    return async_view if getattr(settings, 'ASYNC_READ_VIEWS', False) else sync_view
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView dispatching to coroutine handlers on the event loop.
+    """
+
+    @classproperty
+    def view_is_async(cls):
+        # Async as soon as one handler is; Django's check requires all of them
+        return any(
+            iscoroutinefunction(getattr(cls, method))
+            for method in cls.http_method_names
+            if method != 'options' and hasattr(cls, method)
+        )
+
+    async def dispatch(self, request, *args, **kwargs):
+        """
+        ``APIView.dispatch`` awaiting async handlers.
+        """
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
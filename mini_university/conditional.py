@@ -0,0 +1,120 @@
+"""
+Conditional GET (``ETag`` / ``If-None-Match``) for list and detail views.
+
+Detail ETags are derived from the row's ``(pk, updated_at)``; list ETags
+from ``MAX(updated_at)`` and ``COUNT(*)`` over the filtered queryset, taken in
+one aggregate query (see ``pagination.summarize_rows``) whose count also
+serves as the page total, plus the page parameters. Both also include the
+resource's version token from ``mini_university.response_cache``, which
+changes when a related row that appears in the response (a grade name, an
+enrollment count) is written without touching this row's ``updated_at``.
+
+With ``CACHE_SHARED`` every process sees each version change, including
+the ones made by bulk writes and the admin, so list ETags hash the version
+alone and cost no query. A process-local cache only sees its own writes,
+so there the aggregate stays the validator.
+
+A matching ``If-None-Match`` is answered with 304 before the page is
+fetched or serialized.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from .pagination import asummarize_rows, summarize_rows
+from .response_cache import aget_version, get_version, response_cache, version_age
+from .routers import reading_from_replica
+
+
+def make_etag(resource, *parts, version=None):
+    """
+    Quoted ETag hashing ``parts`` together with the resource version.
+    """
+    if version is None:
+        version = get_version(response_cache(), resource)
+    payload = json.dumps([resource, version, *parts], default=str)
+    return quote_etag(hashlib.md5(payload.encode()).hexdigest())
+
+
+def detail_etag(resource, obj):
+    """
+    ETag of a single row, model instance or ``.values()`` dict.
+    """
+    if isinstance(obj, dict):
+        return make_etag(resource, obj['id'], obj['updated_at'])
+    return make_etag(resource, obj.pk, obj.updated_at)
+
+
+def list_etag(request, resource, queryset):
+    """
+    ETag of a list page, or None when it cannot be trusted, and the row
+    count of ``queryset`` if one was taken.
+
+    The count is returned so pagination can reuse it instead of counting
+    again.
+    """
+    if getattr(settings, 'CACHE_SHARED', False):
+        return version_list_etag(request, resource, get_version(response_cache(), resource)), None
+    summary = summarize_rows(request, queryset)
+    return list_summary_etag(request, resource, summary), summary['total']
+
+
+async def alist_etag(request, resource, queryset):
+    """
+    Async ``list_etag``.
+    """
+    if getattr(settings, 'CACHE_SHARED', False):
+        return version_list_etag(request, resource, await aget_version(response_cache(), resource)), None
+    summary = await asummarize_rows(request, queryset)
+    return list_summary_etag(request, resource, summary), summary['total']
+
+
+def list_summary_etag(request, resource, summary):
+    params = sorted(request.query_params.lists())
+    return make_etag(resource, request.path, params, summary['last_updated'], summary['total'])
+
+
+def version_list_etag(request, resource, version):
+    """
+    List ETag from the shared version token alone.
+
+    A replica may not have the write behind a version change yet, so lists
+    read from one get no ETag within ``REPLICA_PIN_SECONDS`` of that change:
+    the stale body would otherwise be revalidated until the next write.
+    """
+    if reading_from_replica() and version_age(version) < getattr(settings, 'REPLICA_PIN_SECONDS', 5):
+        return None
+    params = sorted(request.query_params.lists())
+    return make_etag(resource, request.path, params, version=version)
+
+
+def etag_matches(request, etag):
+    """
+    True when the request's ``If-None-Match`` covers ``etag``.
+    """
+    header = request.headers.get('If-None-Match')
+    if not header or not etag:
+        return False
+    etags = parse_etags(header)
+    # Weak comparison, as RFC 9110 prescribes for If-None-Match
+    return '*' in etags or etag.removeprefix('W/') in {tag.removeprefix('W/') for tag in etags}
+
+
+def not_modified(etag):
+    """
+    Empty 304 response carrying ``etag``.
+    """
+    return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+
+def with_etag(response, etag):
+    """
+    Set the ``ETag`` header on ``response``, if there is one, and return it.
+    """
+    if etag:
+        response['ETag'] = etag
+    return response
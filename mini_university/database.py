@@ -0,0 +1,97 @@
+"""
+Database connection settings from the environment.
+
+``database_config()`` builds a ``DATABASES`` entry from ``DB_*`` variables.
+Connections are persistent by default: each worker keeps its connection for
+``DB_CONN_MAX_AGE`` seconds and checks it is still usable before reusing it
+for a new request, so requests under gunicorn do not pay for a new
+PostgreSQL connection each time.
+
+``DB_POOL=True`` switches to psycopg 3's connection pool (Django 5.1+)
+instead, which holds ``DB_POOL_MIN_SIZE`` to ``DB_POOL_MAX_SIZE`` open
+connections per process and lends one to each request. Django requires
+``CONN_MAX_AGE`` to be 0 with a pool, so it is forced there.
+
+``DB_REPLICA_HOSTS`` lists read replicas as ``host`` or ``host:port``; each
+becomes a ``replica_<n>`` alias with the primary's other settings, used by
+``mini_university.routers``.
+"""
+import copy
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+POSTGRESQL_ENGINE = 'django.db.backends.postgresql'
+
+
+def env_bool(name, default):
+    return os.getenv(name, str(default)).lower() == 'true'
+
+
+def env_max_age(name, default):
+    """
+    ``CONN_MAX_AGE`` from the environment; ``None`` keeps connections open
+    for the life of the worker.
+    """
+    value = os.getenv(name, str(default))
+    return None if value.lower() == 'none' else int(value)
+
+
+def database_config(prefix='DB'):
+    """
+    Build a ``DATABASES`` entry from ``<prefix>_*`` environment variables.
+
+    Connection details default to the local development database.
+    """
+    engine = os.getenv(f'{prefix}_ENGINE', POSTGRESQL_ENGINE)
+    config = {
+        'ENGINE': engine,
+        'NAME': os.getenv(f'{prefix}_NAME', 'mini_university_db'),
+        'USER': os.getenv(f'{prefix}_USER', 'django'),
+        'PASSWORD': os.getenv(f'{prefix}_PASSWORD', 'django'),
+        'HOST': os.getenv(f'{prefix}_HOST', 'localhost'),
+        'PORT': os.getenv(f'{prefix}_PORT', '5432'),
+        'CONN_MAX_AGE': env_max_age(f'{prefix}_CONN_MAX_AGE', 60),
+        'CONN_HEALTH_CHECKS': env_bool(f'{prefix}_CONN_HEALTH_CHECKS', True),
+        'OPTIONS': {},
+    }
+    if engine != POSTGRESQL_ENGINE:
+        return config
+
+    connect_timeout = os.getenv(f'{prefix}_CONNECT_TIMEOUT')
+    if connect_timeout:
+        config['OPTIONS']['connect_timeout'] = int(connect_timeout)
+
+    if env_bool(f'{prefix}_POOL', False):
+        try:
+            import psycopg_pool  # noqa: F401
+        except ImportError:
+            raise ImproperlyConfigured(
+                f'{prefix}_POOL requires psycopg 3 with its pool: pip install "psycopg[binary,pool]"'
+            )
+        config['CONN_MAX_AGE'] = 0
+        config['OPTIONS']['pool'] = {
+            'min_size': int(os.getenv(f'{prefix}_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.getenv(f'{prefix}_POOL_MAX_SIZE', '10')),
+            # Seconds a request waits for a free connection before failing
+            'timeout': float(os.getenv(f'{prefix}_POOL_TIMEOUT', '10')),
+        }
+    return config
+
+
+def replica_configs(primary, prefix='DB'):
+    """
+    ``DATABASES`` entries for the replicas in ``<prefix>_REPLICA_HOSTS``.
+
+    In tests each replica mirrors ``default`` instead of getting its own
+    test database.
+    """
+    hosts = [host.strip() for host in os.getenv(f'{prefix}_REPLICA_HOSTS', '').split(',') if host.strip()]
+    replicas = {}
+    for number, host in enumerate(hosts, 1):
+        config = copy.deepcopy(primary)
+        config['HOST'], _, port = host.partition(':')
+        config['PORT'] = port or primary['PORT']
+        config['TEST'] = {'MIRROR': 'default'}
+        replicas[f'replica_{number}'] = config
+    return replicas
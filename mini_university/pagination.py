@@ -0,0 +1,384 @@
+"""
+Shared pagination for the list endpoints.
+
+Page-number pagination is the default. Passing ``cursor`` (empty for the
+first page) switches to keyset pagination, which seeks on the view's
+ordering columns instead of using OFFSET and skips the total count.
+
+Page-number totals avoid a full ``COUNT(*)`` where they can: unfiltered
+lists on PostgreSQL use the planner's row estimate once the table is large,
+and filtered lists cache their count briefly per normalized filter set.
+``exact=1`` always runs the real count. ``summarize_rows`` applies the same
+strategies to the ``MAX(updated_at)`` + count summary behind list ETags.
+
+``apaginate``, ``acount_rows`` and ``asummarize_rows`` are the same for
+async views, querying through Django's async ORM.
+"""
+import base64
+import hashlib
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Count, Max, Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+
+DEFAULT_PAGE_SIZE = 20
+
+# Query parameters that select a page rather than filter the list
+PAGINATION_PARAMS = {'page', 'page_size', 'cursor', 'exact'}
+
+
+class CountStrategyPaginator(Paginator):
+    """
+    Paginator that takes its total from a callable instead of ``COUNT(*)``.
+    """
+
+    def __init__(self, object_list, per_page, count_func, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_func = count_func
+
+    @cached_property
+    def count(self):
+        return self.count_func()
+
+    def page(self, number):
+        """
+        Slice a full page even when the total is an estimate or slightly
+        stale, rather than truncating the last page to ``count``.
+        """
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        return self._get_page(self.object_list[bottom:top], number, self)
+
+
+def paginate(request, queryset, cursor_ordering, fields=None, count=None):
+    """
+    Paginate ``queryset`` for ``request``.
+
+    Returns a tuple of the rows for the requested page and a dict with the
+    pagination fields to merge into the response. With ``fields`` the rows
+    are ``.values(*fields)`` dicts; the count still runs on ``queryset`` so
+    it does not pick up the joins those fields need. A ``count`` already
+    taken by ``summarize_rows`` is used as the page-number total instead of
+    counting again.
+    """
+    if 'cursor' in request.query_params:
+        return paginate_by_cursor(request, queryset, cursor_ordering, fields)
+    return paginate_by_page(request, queryset, fields, count)
+
+
+async def apaginate(request, queryset, cursor_ordering, fields=None, count=None):
+    """
+    Async ``paginate``.
+    """
+    if 'cursor' in request.query_params:
+        return await apaginate_by_cursor(request, queryset, cursor_ordering, fields)
+    return await apaginate_by_page(request, queryset, fields, count)
+
+
+def paginate_by_page(request, queryset, fields=None, count=None):
+    """
+    Page-number pagination with total count.
+    """
+    paginator, page_obj = get_page(
+        request, queryset, fields,
+        lambda: count_rows(request, queryset) if count is None else count
+    )
+    return list(page_obj), page_fields(paginator, page_obj)
+
+
+async def apaginate_by_page(request, queryset, fields=None, count=None):
+    """
+    Async ``paginate_by_page``.
+    """
+    if count is None:
+        count = await acount_rows(request, queryset)
+    paginator, page_obj = get_page(request, queryset, fields, lambda: count)
+    return [row async for row in page_obj.object_list], page_fields(paginator, page_obj)
+
+
+def get_page(request, queryset, fields, count_func):
+    """
+    The paginator and requested page, with the page's rows not yet fetched.
+    """
+    rows = queryset.values(*fields) if fields else queryset
+    paginator = CountStrategyPaginator(rows, get_page_size(request), count_func)
+    return paginator, paginator.get_page(request.query_params.get('page', 1))
+
+
+def page_fields(paginator, page_obj):
+    """
+    Page-number pagination fields of the response.
+    """
+    return {
+        'count': paginator.count,
+        'next': page_obj.has_next(),
+        'previous': page_obj.has_previous(),
+        'current_page': page_obj.number,
+        'total_pages': paginator.num_pages,
+    }
+
+
+def count_rows(request, queryset):
+    """
+    Total for page-number pagination, using the cheapest acceptable strategy.
+    """
+    if request.query_params.get('exact') in ('1', 'true'):
+        return queryset.count()
+
+    if not queryset.query.has_filters():
+        estimate = estimate_table_rows(queryset)
+        threshold = getattr(settings, 'PAGINATION_ESTIMATE_THRESHOLD', 10000)
+        if estimate is not None and estimate >= threshold:
+            return estimate
+        return queryset.count()
+
+    timeout = getattr(settings, 'PAGINATION_COUNT_CACHE_TIMEOUT', 30)
+    return cache.get_or_set(count_cache_key(request), queryset.count, timeout)
+
+
+async def acount_rows(request, queryset):
+    """
+    Async ``count_rows``.
+    """
+    if request.query_params.get('exact') in ('1', 'true'):
+        return await queryset.acount()
+
+    if not queryset.query.has_filters():
+        estimate = await sync_to_async(estimate_table_rows)(queryset)
+        threshold = getattr(settings, 'PAGINATION_ESTIMATE_THRESHOLD', 10000)
+        if estimate is not None and estimate >= threshold:
+            return estimate
+        return await queryset.acount()
+
+    key = count_cache_key(request)
+    total = await cache.aget(key)
+    if total is None:
+        total = await queryset.acount()
+        await cache.aset(key, total, getattr(settings, 'PAGINATION_COUNT_CACHE_TIMEOUT', 30))
+    return total
+
+
+def summarize_rows(request, queryset):
+    """
+    ``{'last_updated', 'total'}`` for ``queryset`` in one aggregate query.
+
+    The total follows the same strategies as ``count_rows``: large
+    unfiltered tables only aggregate ``MAX(updated_at)`` and take the
+    planner's estimate, and filtered summaries are cached per filter set.
+    """
+    def aggregate():
+        return queryset.order_by().aggregate(last_updated=Max('updated_at'), total=Count('pk'))
+
+    if request.query_params.get('exact') in ('1', 'true'):
+        return aggregate()
+
+    if not queryset.query.has_filters():
+        estimate = estimate_table_rows(queryset)
+        threshold = getattr(settings, 'PAGINATION_ESTIMATE_THRESHOLD', 10000)
+        if estimate is not None and estimate >= threshold:
+            summary = queryset.order_by().aggregate(last_updated=Max('updated_at'))
+            return {**summary, 'total': estimate}
+        return aggregate()
+
+    timeout = getattr(settings, 'PAGINATION_COUNT_CACHE_TIMEOUT', 30)
+    return cache.get_or_set(f'{count_cache_key(request)}:summary', aggregate, timeout)
+
+
+async def asummarize_rows(request, queryset):
+    """
+    Async ``summarize_rows``.
+    """
+    async def aggregate():
+        return await queryset.order_by().aaggregate(last_updated=Max('updated_at'), total=Count('pk'))
+
+    if request.query_params.get('exact') in ('1', 'true'):
+        return await aggregate()
+
+    if not queryset.query.has_filters():
+        estimate = await sync_to_async(estimate_table_rows)(queryset)
+        threshold = getattr(settings, 'PAGINATION_ESTIMATE_THRESHOLD', 10000)
+        if estimate is not None and estimate >= threshold:
+            summary = await queryset.order_by().aaggregate(last_updated=Max('updated_at'))
+            return {**summary, 'total': estimate}
+        return await aggregate()
+
+    key = f'{count_cache_key(request)}:summary'
+    summary = await cache.aget(key)
+    if summary is None:
+        summary = await aggregate()
+        await cache.aset(key, summary, getattr(settings, 'PAGINATION_COUNT_CACHE_TIMEOUT', 30))
+    return summary
+
+
+def estimate_table_rows(queryset):
+    """
+    Return PostgreSQL's row estimate for the queryset's table, or None.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    # reltuples is -1 until the table has been vacuumed or analyzed
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+def count_cache_key(request):
+    """
+    Cache key for a list count, from the path and its normalized filters.
+    """
+    filters = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        if key not in PAGINATION_PARAMS
+        for value in values
+        if value
+    )
+    digest = hashlib.md5(json.dumps([request.path, filters]).encode()).hexdigest()
+    return f'pagination-count:{digest}'
+
+
+def paginate_by_cursor(request, queryset, cursor_ordering, fields=None):
+    """
+    Keyset pagination on ``cursor_ordering``.
+
+    The ordering must end with a unique column (``id``) and its columns must
+    not be nullable, so that every row has exactly one position.
+    """
+    rows, page = cursor_page(request, queryset, cursor_ordering, fields)
+    return page(list(rows))
+
+
+async def apaginate_by_cursor(request, queryset, cursor_ordering, fields=None):
+    """
+    Async ``paginate_by_cursor``.
+    """
+    rows, page = cursor_page(request, queryset, cursor_ordering, fields)
+    return page([row async for row in rows])
+
+
+def cursor_page(request, queryset, cursor_ordering, fields=None):
+    """
+    The unevaluated rows of a cursor page and a function turning the fetched
+    rows into the ``(rows, pagination fields)`` result.
+    """
+    page_size = get_page_size(request)
+    position, reverse = decode_cursor(request.query_params.get('cursor'), cursor_ordering)
+
+    ordering = [invert_ordering(field) for field in cursor_ordering] if reverse else list(cursor_ordering)
+    queryset = queryset.order_by(*ordering)
+    if position is not None:
+        try:
+            queryset = queryset.filter(keyset_filter(ordering, position))
+        except (ValueError, ValidationError):
+            raise NotFound('Invalid cursor.')
+
+    if fields:
+        queryset = queryset.values(*fields)
+
+    def page(rows):
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+            has_next, has_previous = position is not None, has_more
+        else:
+            has_next, has_previous = has_more, position is not None
+
+        return rows, {
+            'next': encode_cursor(rows[-1], cursor_ordering) if rows and has_next else None,
+            'previous': encode_cursor(rows[0], cursor_ordering, reverse=True) if rows and has_previous else None,
+        }
+
+    return queryset[:page_size + 1], page
+
+
+def get_page_size(request):
+    """
+    Read ``page_size`` from the query string, falling back to the default.
+    """
+    try:
+        page_size = int(request.query_params.get('page_size', DEFAULT_PAGE_SIZE))
+    except (TypeError, ValueError):
+        return DEFAULT_PAGE_SIZE
+    return page_size if page_size > 0 else DEFAULT_PAGE_SIZE
+
+
+def invert_ordering(field):
+    """
+    Flip the direction of a single ``order_by`` term.
+    """
+    return field[1:] if field.startswith('-') else f'-{field}'
+
+
+def keyset_filter(ordering, position):
+    """
+    Build the filter selecting rows strictly after ``position`` in ``ordering``.
+
+    For ``(a, -b, id)`` this is ``a > x OR (a = x AND b < y) OR
+    (a = x AND b = y AND id > z)``.
+    """
+    condition = Q()
+    equal = {}
+    for field, value in zip(ordering, position):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        condition |= Q(**equal, **{f'{name}__{lookup}': value})
+        equal[name] = value
+    return condition
+
+
+def resolve_field(obj, name):
+    """
+    Follow a ``__`` separated field path on a model instance, or read it
+    from a ``.values()`` row.
+    """
+    if isinstance(obj, dict):
+        return obj[name]
+    for attr in name.split('__'):
+        obj = getattr(obj, attr)
+    return obj
+
+
+def encode_cursor(obj, cursor_ordering, reverse=False):
+    """
+    Encode the position of ``obj`` as an opaque cursor token.
+    """
+    position = [resolve_field(obj, field.lstrip('-')) for field in cursor_ordering]
+    payload = json.dumps({'p': position, 'r': reverse}, cls=DjangoJSONEncoder)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, cursor_ordering):
+    """
+    Decode a cursor token into ``(position, reverse)``.
+
+    An empty token is the first page and decodes to ``(None, False)``.
+    """
+    if not token:
+        return None, False
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        position, reverse = payload['p'], bool(payload['r'])
+    except (ValueError, TypeError, KeyError):
+        raise NotFound('Invalid cursor.')
+    if not isinstance(position, list) or len(position) != len(cursor_ordering):
+        raise NotFound('Invalid cursor.')
+    return position, reverse
@@ -0,0 +1,53 @@
+"""
+Extra request parsers.
+"""
+import codecs
+import csv
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+from .renderers import FastJSONRenderer, orjson
+
+
+class CSVParser(BaseParser):
+    """
+    Parses a ``text/csv`` body with a header row.
+
+    Returns a lazy ``csv.DictReader`` over the request stream, so large
+    uploads are decoded row by row instead of being loaded into memory; a
+    body that is not in the request's charset raises ``UnicodeDecodeError``
+    while it is read. UTF-8 bodies may start with a byte order mark, as
+    spreadsheet exports do.
+    """
+    media_type = 'text/csv'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if codecs.lookup(encoding).name == 'utf-8':
+            # Otherwise the BOM sticks to the first header name
+            encoding = 'utf-8-sig'
+        return csv.DictReader(codecs.iterdecode(stream, encoding))
+
+
+class FastJSONParser(JSONParser):
+    """
+    ``JSONParser`` that decodes UTF-8 bodies with orjson.
+
+    Falls back to the stdlib parser when orjson is not installed or the
+    request uses another charset.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
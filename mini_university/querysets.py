@@ -0,0 +1,30 @@
+"""
+Shared queryset helpers for the list and detail endpoints.
+"""
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_related(model, related_name, **filters):
+    """
+    Build a correlated ``COUNT`` subquery over a reverse relation of ``model``.
+
+    Unlike ``Count(related_name)`` this does not join and GROUP BY the whole
+    outer table, so several counts can be annotated on the same queryset and
+    the database only evaluates them for the rows of the requested page.
+    """
+    relation = model._meta.get_field(related_name)
+    fk_name = relation.field.name
+    related = relation.related_model._default_manager.filter(
+        **{fk_name: OuterRef('pk')}, **filters
+    )
+    return Coalesce(
+        Subquery(
+            related.order_by()
+            .values(fk_name)
+            .annotate(total=Count('pk'))
+            .values('total')[:1],
+            output_field=IntegerField(),
+        ),
+        0,
+    )
@@ -0,0 +1,38 @@
+"""
+JSON renderer backed by orjson.
+
+``FastJSONRenderer`` produces the same bytes as DRF's ``JSONRenderer`` for
+the default settings (compact, UTF-8, strict): types orjson does not encode
+the DRF way (datetimes, dates, times, Decimal, lazy strings, querysets) are
+handed to DRF's own ``JSONEncoder.default``. When orjson is not installed,
+or an indented or ASCII-only response is requested, it falls back to the
+stdlib renderer.
+"""
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+if orjson is not None:
+    # Dates go through DRF's encoder so their format matches; dict keys are
+    # coerced to strings as json.dumps does
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Drop-in replacement for ``JSONRenderer`` that encodes with orjson.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        # Match JSONRenderer, which escapes these so the output is valid JavaScript
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
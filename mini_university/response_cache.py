@@ -0,0 +1,280 @@
+"""
+Response cache for read-mostly GET endpoints.
+
+``cache_response(resource)`` stores a GET handler's response data under a
+key built from the request path, its normalized query parameters and the
+resource's current version token. Writes never delete entries: they replace
+the version token (``invalidate``), so every key for that resource misses
+from then on and old entries simply expire. This works the same on the
+local-memory cache and on a shared backend (Redis, Memcached) configured in
+``CACHES``.
+
+Each app registers which models its cached responses are built from with
+``invalidate_on_change``; saves and deletes of those models, including
+deletes cascaded from a parent, bump the version. Bulk writes that bypass
+model signals call ``invalidate_for`` themselves.
+
+Version tokens only expire entries in processes that share the cache, so
+responses are only cached with ``CACHE_SHARED``; with a process-local cache
+the handlers run on every request.
+
+Responses read from a replica are not cached within ``REPLICA_PIN_SECONDS``
+of a version change, as the replica may not have the write yet.
+"""
+import functools
+import hashlib
+import json
+import time
+import uuid
+from collections import defaultdict
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from rest_framework import status
+from rest_framework.response import Response
+
+from .routers import reading_from_replica
+
+# model class -> names of the resources whose responses it appears in
+_dependents = defaultdict(set)
+
+
+def response_cache():
+    """
+    The cache backend holding cached responses.
+    """
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def version_key(resource):
+    return f'response-cache:{resource}:version'
+
+
+def new_version():
+    """
+    A fresh version token, recording when it was made in milliseconds.
+    """
+    return f'{uuid.uuid4().hex}.{time.time_ns() // 1_000_000}'
+
+
+def version_age(version):
+    """
+    Seconds since ``version`` was made.
+    """
+    return time.time() - int(version.partition('.')[2] or 0) / 1000
+
+
+def get_version(cache, resource):
+    """
+    Current version token of ``resource``, creating one if needed.
+    """
+    key = version_key(resource)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, new_version(), None)
+        version = cache.get(key)
+    return version
+
+
+async def aget_version(cache, resource):
+    """
+    Async ``get_version``.
+    """
+    key = version_key(resource)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, new_version(), None)
+        version = await cache.aget(key)
+    return version
+
+
+def bump_versions(resources):
+    """
+    Replace the version token of each of ``resources``.
+    """
+    if resources:
+        response_cache().set_many({version_key(resource): new_version() for resource in resources}, None)
+
+
+class PendingInvalidation:
+    """
+    Resources invalidated in the current transaction, bumped again when it
+    commits.
+    """
+    def __init__(self):
+        self.resources = set()
+        # id(delete origin) -> (origin, resources it has bumped); the origin
+        # is kept so its id cannot be reused within the transaction
+        self.origins = {}
+
+    def __call__(self):
+        bump_versions(self.resources)
+
+    def first_for_origin(self, origin, resource):
+        """
+        True the first time ``resource`` is invalidated by a delete from ``origin``.
+        """
+        _, invalidated = self.origins.setdefault(id(origin), (origin, set()))
+        if resource in invalidated:
+            return False
+        invalidated.add(resource)
+        return True
+
+
+def pending_invalidation():
+    """
+    The ``PendingInvalidation`` of the current transaction, or None in
+    autocommit mode.
+    """
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        return None
+    pending = getattr(connection, 'response_cache_pending', None)
+    # A rollback discards the callback, and with it what it had collected
+    if pending is None or not any(func is pending for _, func, _ in connection.run_on_commit):
+        pending = connection.response_cache_pending = PendingInvalidation()
+        transaction.on_commit(pending)
+    return pending
+
+
+def invalidate(*resources):
+    """
+    Expire every cached response of ``resources``.
+
+    The version is replaced now and again once the surrounding transaction
+    commits, so a read that runs before the commit cannot keep old rows
+    cached under the new version. The commit bumps are collected per
+    transaction, so each resource is bumped once on commit however many
+    rows changed.
+    """
+    bump_versions(resources)
+    pending = pending_invalidation()
+    if pending is not None:
+        pending.resources.update(resources)
+
+
+def invalidate_for(*models):
+    """
+    Expire the cached responses built from any of ``models``.
+    """
+    resources = set()
+    for model in models:
+        resources |= _dependents[model]
+    if resources:
+        invalidate(*sorted(resources))
+
+
+def invalidate_on_change(resource, *models):
+    """
+    Expire ``resource`` whenever an instance of one of ``models`` is saved or deleted.
+    """
+    def receiver(sender, raw=False, origin=None, **kwargs):
+        if raw:
+            return
+        # Every row removed by one delete() shares its origin, so a cascade
+        # bumps each resource once rather than once per row
+        pending = pending_invalidation() if origin is not None else None
+        if pending is not None and not pending.first_for_origin(origin, resource):
+            return
+        invalidate(resource)
+
+    for model in models:
+        _dependents[model].add(resource)
+        uid = f'response-cache:{resource}:{model._meta.label}'
+        post_save.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
+        post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
+
+
+def request_cache_key(resource, version, request):
+    """
+    Cache key for a GET from its path and normalized query parameters.
+    """
+    params = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+        if value
+    )
+    digest = hashlib.md5(json.dumps([request.path, params]).encode()).hexdigest()
+    return f'response-cache:{resource}:{version}:{digest}'
+
+
+def cache_response(resource):
+    """
+    Decorator caching a view's GET handler as part of ``resource``.
+
+    Only successful responses are cached, together with their ``ETag`` so
+    a cached hit can still answer ``If-None-Match`` with 304. Authentication
+    and permissions still run on every request because the handler is
+    wrapped, not the view. Async handlers get an async wrapper using the
+    cache's async API. Without ``CACHE_SHARED`` the handler is called
+    directly.
+    """
+    def decorator(handler):
+        if iscoroutinefunction(handler):
+            @functools.wraps(handler)
+            async def async_wrapper(view, request, *args, **kwargs):
+                if not getattr(settings, 'CACHE_SHARED', False):
+                    return await handler(view, request, *args, **kwargs)
+                cache = response_cache()
+                version = await aget_version(cache, resource)
+                key = request_cache_key(resource, version, request)
+                cached = await cache.aget(key)
+                if cached is not None:
+                    return cached_response(request, cached)
+
+                response = await handler(view, request, *args, **kwargs)
+                if is_cacheable(response, version):
+                    await cache.aset(key, cache_entry(response), getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300))
+                return response
+            return async_wrapper
+
+        @functools.wraps(handler)
+        def wrapper(view, request, *args, **kwargs):
+            if not getattr(settings, 'CACHE_SHARED', False):
+                return handler(view, request, *args, **kwargs)
+            cache = response_cache()
+            version = get_version(cache, resource)
+            key = request_cache_key(resource, version, request)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached_response(request, cached)
+
+            response = handler(view, request, *args, **kwargs)
+            if is_cacheable(response, version):
+                cache.set(key, cache_entry(response), getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300))
+            return response
+        return wrapper
+    return decorator
+
+
+def cache_entry(response):
+    return response.data, response.get('ETag')
+
+
+def cached_response(request, cached):
+    """
+    Response for a cache hit: 304 when ``If-None-Match`` matches its ETag.
+    """
+    # Imported here because mini_university.conditional imports this module
+    from .conditional import etag_matches, not_modified
+
+    data, etag = cached
+    if etag and etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(data, headers={'ETag': etag} if etag else None)
+
+
+def is_cacheable(response, version):
+    """
+    Cache successful responses, except replica reads that may predate the
+    write behind a recent version change.
+    """
+    lagging = (
+        reading_from_replica()
+        and version_age(version) < getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+    )
+    return response.status_code == status.HTTP_200_OK and not lagging
@@ -0,0 +1,134 @@
+"""
+Primary/replica database routing.
+
+``ReplicaRoutingMiddleware`` marks GET, HEAD and OPTIONS requests as safe to
+read from a replica, and ``PrimaryReplicaRouter`` then sends their reads to
+one of ``REPLICA_DATABASES``. Every other read and every write goes to
+``default``, and so do:
+
+* the rest of a request once it has written anything, or while it has a
+  transaction open on ``default``;
+* the same client's requests for ``REPLICA_PIN_SECONDS`` after a write, so it
+  reads its own writes while the replicas catch up. Clients are told apart
+  by their Authorization header, or by address without one, and pins are
+  kept in the default cache, which must be shared (Redis, Memcached) for
+  the pin to hold across workers.
+
+The routing state is a context variable, so it follows a request into
+``sync_to_async`` threads and async views alike.
+"""
+import hashlib
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_routing_state = ContextVar('replica_routing_state', default=None)
+
+
+class RoutingState:
+    """
+    Routing decisions of the request being handled.
+    """
+
+    def __init__(self, use_replicas):
+        self.use_replicas = use_replicas
+        self.wrote = False
+
+
+def replica_databases():
+    return getattr(settings, 'REPLICA_DATABASES', [])
+
+
+def reading_from_replica():
+    """
+    True when reads in the current request go to a replica.
+    """
+    state = _routing_state.get()
+    if not (state and state.use_replicas and not state.wrote and replica_databases()):
+        return False
+    # Reads inside a transaction must see its uncommitted writes
+    return not connections[DEFAULT_DB_ALIAS].in_atomic_block
+
+
+def pin_key(request):
+    """
+    Cache key of the primary pin for the client making ``request``.
+    """
+    identity = request.META.get('HTTP_AUTHORIZATION') or request.META.get('REMOTE_ADDR', '')
+    return f'replica-pin:{hashlib.md5(identity.encode()).hexdigest()}'
+
+
+class PrimaryReplicaRouter:
+    """
+    Route replica-safe reads to a random replica and everything else to
+    ``default``.
+    """
+
+    def db_for_read(self, model, **hints):
+        if reading_from_replica():
+            return random.choice(replica_databases())
+        return None
+
+    def db_for_write(self, model, **hints):
+        state = _routing_state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replica_databases():
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Let safe requests read from replicas unless their client wrote recently.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def begin(self, request):
+        use_replicas = request.method in SAFE_METHODS and not cache.get(pin_key(request))
+        state = RoutingState(use_replicas)
+        return state, _routing_state.set(state)
+
+    def finish(self, request, state, token):
+        _routing_state.reset(token)
+        if state.wrote:
+            cache.set(pin_key(request), True, getattr(settings, 'REPLICA_PIN_SECONDS', 5))
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not replica_databases():
+            return self.get_response(request)
+        state, token = self.begin(request)
+        try:
+            return self.get_response(request)
+        finally:
+            self.finish(request, state, token)
+
+    async def __acall__(self, request):
+        if not replica_databases():
+            return await self.get_response(request)
+        state, token = self.begin(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            self.finish(request, state, token)
@@ -0,0 +1,118 @@
+"""
+Shared search backend for the list endpoints.
+
+On PostgreSQL each view's ``search_fields`` are matched per table: fields of
+the listed model are filtered directly and fields on a related model become
+an ``fk IN (SELECT ...)`` subquery, so every ``icontains`` can use that
+table's pg_trgm GIN index instead of scanning an OR across a join. The ``fulltext``
+mode additionally matches and ranks the model's own fields with
+``SearchVector``/``SearchRank``, backed by an expression GIN index.
+
+Other databases (SQLite in tests) fall back to a plain ``icontains`` OR-chain.
+"""
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections, migrations
+from django.db.models import Q
+from django.db.models.functions import Upper
+
+# Names and identifiers are not natural language, so skip stemming
+SEARCH_CONFIG = 'simple'
+
+CONTAINS = 'contains'
+FULLTEXT = 'fulltext'
+
+
+def apply_search(queryset, search, search_fields, mode=CONTAINS):
+    """
+    Filter ``queryset`` to rows matching ``search`` in any of ``search_fields``.
+    """
+    if not search:
+        return queryset
+
+    if connections[queryset.db].vendor != 'postgresql':
+        return queryset.filter(contains_filter(search_fields, search))
+
+    local_fields = [field for field in search_fields if '__' not in field]
+    condition = related_filter(queryset.model, search_fields, search)
+
+    if mode == FULLTEXT and local_fields:
+        query = SearchQuery(search, config=SEARCH_CONFIG, search_type='websearch')
+        vector = SearchVector(*local_fields, config=SEARCH_CONFIG)
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        return queryset.annotate(
+            search_vector=vector,
+            search_rank=SearchRank(vector, query),
+        ).filter(
+            Q(search_vector=query) | condition
+        ).order_by('-search_rank', *ordering)
+
+    return queryset.filter(contains_filter(local_fields, search) | condition)
+
+
+def contains_filter(fields, search):
+    """
+    OR together ``icontains`` lookups on ``fields``.
+    """
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f'{field}__icontains': search})
+    return condition
+
+
+def related_filter(model, search_fields, search):
+    """
+    Turn related ``search_fields`` into one ``IN`` subquery per relation.
+    """
+    related = {}
+    for field in search_fields:
+        if '__' in field:
+            relation, related_field = field.split('__', 1)
+            related.setdefault(relation, []).append(related_field)
+
+    condition = Q()
+    for relation, fields in related.items():
+        related_model = model._meta.get_field(relation).related_model
+        matches = related_model._default_manager.filter(contains_filter(fields, search))
+        condition |= Q(**{f'{relation}__in': matches.values('pk')})
+    return condition
+
+
+def search_indexes(model_name, trigram_fields=(), vector_fields=()):
+    """
+    Migration operation creating the search indexes for ``model_name``.
+
+    The indexes only exist on PostgreSQL, so they are created from
+    ``RunPython`` rather than declared in ``Meta.indexes``. Both are built
+    from the expressions the ORM emits for ``icontains`` (``UPPER(col)``)
+    and for ``apply_search``'s ``SearchVector`` so the planner can match them.
+    """
+    def build_indexes(model):
+        table = model._meta.db_table
+        indexes = [
+            GinIndex(OpClass(Upper(field), name='gin_trgm_ops'), name=f'{table}_{field}_trgm')
+            for field in trigram_fields
+        ]
+        if vector_fields:
+            indexes.append(GinIndex(
+                SearchVector(*vector_fields, config=SEARCH_CONFIG),
+                name=f'{table}_search_fts',
+            ))
+        return indexes
+
+    def forwards(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        model = apps.get_model(model_name)
+        for index in build_indexes(model):
+            schema_editor.add_index(model, index)
+
+    def backwards(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        model = apps.get_model(model_name)
+        for index in build_indexes(model):
+            schema_editor.remove_index(model, index)
+
+    return migrations.RunPython(forwards, backwards)
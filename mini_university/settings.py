@@ -42,6 +42,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework_simplejwt',
     'rest_framework_simplejwt.token_blacklist',
@@ -65,6 +66,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'mini_university.routers.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'mini_university.urls'
@@ -90,16 +92,20 @@ WSGI_APPLICATION = 'mini_university.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Connection details, persistent connections and pooling come from DB_*
+# variables (see mini_university/database.py)
+from mini_university.database import database_config, replica_configs
+
 DATABASES = {
-  'default': {
-    'ENGINE': 'django.db.backends.postgresql',
-    'NAME': 'mini_university_db',
-    'USER': 'django',
-    'PASSWORD': 'django',
-    'HOST': 'localhost',
-    'PORT': '5432',
-  }
+  'default': database_config(),
 }
+DATABASES.update(replica_configs(DATABASES['default']))
+
+# Safe requests read from the replicas; writes, and a client's reads for
+# REPLICA_PIN_SECONDS after its writes, use default (see mini_university/routers.py)
+REPLICA_DATABASES = [alias for alias in DATABASES if alias != 'default']
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', '5'))
+DATABASE_ROUTERS = ['mini_university.routers.PrimaryReplicaRouter']
 
 
 # Password validation
@@ -120,6 +126,18 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashers, preferred first. Hashes made by any of them verify and
+# are rehashed with the first on login. PASSWORD_HASHERS takes a comma
+# separated list of hasher paths, e.g. to prefer Argon2 (needs argon2-cffi).
+PASSWORD_HASHERS = os.getenv('PASSWORD_HASHERS', ','.join([
+    'auth_app.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+])).split(',')
+# PBKDF2 iterations per hash; empty uses Django's default (see auth_app/hashers.py)
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv('PASSWORD_PBKDF2_ITERATIONS') or 0) or None
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -143,23 +161,97 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# JWT authentication: 'cached' keeps token users in a per-process LRU cache
+# (see auth_app/authentication.py), 'database' loads the user on every request
+JWT_AUTHENTICATION_CLASSES = {
+    'cached': 'auth_app.authentication.CachedJWTAuthentication',
+    'database': 'rest_framework_simplejwt.authentication.JWTAuthentication',
+}
+JWT_AUTHENTICATION = os.getenv('JWT_AUTHENTICATION', 'cached')
+# Seconds a cached user is trusted, and the most users cached per process
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv('AUTH_USER_CACHE_TIMEOUT', '60'))
+AUTH_USER_CACHE_SIZE = int(os.getenv('AUTH_USER_CACHE_SIZE', '10000'))
+
 # Django REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        JWT_AUTHENTICATION_CLASSES[JWT_AUTHENTICATION],
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',
+        'mini_university.renderers.FastJSONRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'mini_university.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    # Reverse proxies in front of the app: throttles key on the client address
+    # this many hops from the end of X-Forwarded-For. 0 uses REMOTE_ADDR and
+    # ignores the header, which a client could otherwise rotate freely.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', '0')),
 }
 
+# The browsable API is only loaded where explicitly enabled (defaults to DEBUG)
+BROWSABLE_API = os.getenv('BROWSABLE_API', str(DEBUG)).lower() == 'true'
+if BROWSABLE_API:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].append('rest_framework.renderers.BrowsableAPIRenderer')
+
+# Cache backend for pagination counts, throttles and cached GET responses.
+# Local memory by default, which is per process: with several workers point
+# CACHE_BACKEND/CACHE_LOCATION at Redis or Memcached, as a write in one
+# worker can only expire the others' entries through a shared cache.
+LOCAL_MEMORY_CACHE = 'django.core.cache.backends.locmem.LocMemCache'
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', LOCAL_MEMORY_CACHE),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+# Whether every process sees the same default cache. Anything a write in one
+# process must invalidate for all of them (GET responses, version-token list
+# ETags, "not blacklisted" refresh tokens) is only cached when it does;
+# defaults to True for any backend but local memory.
+CACHE_SHARED = os.getenv(
+    'CACHE_SHARED', str(CACHES['default']['BACKEND'] != LOCAL_MEMORY_CACHE)
+).lower() == 'true'
+
+# Response cache for grades, sections, courses and grade-courses; off unless
+# CACHE_SHARED (see mini_university/response_cache.py)
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', '300'))
+
+# Pagination count strategy (see mini_university/pagination.py)
+# Unfiltered lists on tables at least this large report the planner estimate
+PAGINATION_ESTIMATE_THRESHOLD = int(os.getenv('PAGINATION_ESTIMATE_THRESHOLD', '10000'))
+# Seconds a filtered list's total is cached
+PAGINATION_COUNT_CACHE_TIMEOUT = int(os.getenv('PAGINATION_COUNT_CACHE_TIMEOUT', '30'))
+
+# Cache holding refresh token blacklist flags (see auth_app/tokens.py)
+TOKEN_BLACKLIST_CACHE_ALIAS = 'default'
+
+# Request rates per throttle scope, '<count>/<period>'; an empty rate turns
+# the throttle off (see mini_university/throttling.py)
+THROTTLE_CACHE_ALIAS = 'default'
+THROTTLE_RATES = {
+    'login_ip': os.getenv('THROTTLE_LOGIN_IP', '30/min'),
+    'login_username': os.getenv('THROTTLE_LOGIN_USERNAME', '10/min'),
+    'register': os.getenv('THROTTLE_REGISTER', '10/hour'),
+    'api_client': os.getenv('THROTTLE_API_CLIENT', '600/min'),
+}
+
+# Render list and detail GETs from .values() rows (see mini_university/values.py)
+FAST_READ_SERIALIZERS = os.getenv('FAST_READ_SERIALIZERS', 'True').lower() == 'true'
+
+# Serve student, enrollment and grade-course list/detail GETs from async views;
+# enable when running under ASGI (see mini_university/async_views.py)
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', 'False').lower() == 'true'
+
 # CORS settings for development
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -198,6 +290,10 @@ SIMPLE_JWT = {
     'TOKEN_TYPE_CLAIM': 'token_type',
     'TOKEN_USER_CLASS': 'rest_framework_simplejwt.models.TokenUser',
 
+    # Refresh tokens check the blacklist through the cache (see auth_app/tokens.py)
+    'TOKEN_OBTAIN_SERIALIZER': 'auth_app.tokens.CachedTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'auth_app.tokens.CachedTokenRefreshSerializer',
+
     'JTI_CLAIM': 'jti',
 
     'SLIDING_TOKEN_REFRESH_EXP_CLAIM': 'refresh_exp',
@@ -0,0 +1,99 @@
+"""
+Test data helpers shared by the query budget and benchmark tests.
+"""
+import os
+from datetime import date, timedelta
+from types import SimpleNamespace
+from unittest import skipUnless
+
+from courses.models import Course
+from enrollments.models import Enrollment, EnrollmentStatistic
+from grade_course.models import GradeCourse
+from grades.models import Grade
+from mini_university.response_cache import invalidate_for
+from sections.models import Section
+from students.models import Student
+
+
+# Timings depend on the machine, so timing assertions and benchmark reports
+# only run when asked for
+RUN_BENCHMARKS = os.getenv('RUN_BENCHMARKS', '').lower() in ('1', 'true')
+
+benchmark = skipUnless(RUN_BENCHMARKS, 'Set RUN_BENCHMARKS=1 to run benchmarks')
+
+
+def env_int(name, default):
+    """
+    Read an integer tuning knob from the environment.
+    """
+    return int(os.getenv(name, default))
+
+
+def seed_university(grades=10, sections_per_grade=4, students=1000, courses=20,
+                    courses_per_grade=5, enrollments_per_student=3):
+    """
+    Bulk-create a university of the given size and return handles to it.
+
+    Rows are inserted with ``bulk_create`` in batches so large seeds (100k
+    students) stay fast; enrollment search documents are refreshed once at
+    the end, along with the enrollment statistics, and cached responses
+    expired, because ``bulk_create`` skips the save signals.
+    """
+    grade_objs = Grade.objects.bulk_create(
+        Grade(name=f"Grade {i:03d}") for i in range(grades)
+    )
+    section_objs = Section.objects.bulk_create(
+        Section(name=f"Section {j}", grade=grade)
+        for grade in grade_objs
+        for j in range(sections_per_grade)
+    )
+    course_objs = Course.objects.bulk_create(
+        Course(name=f"Course {i:03d}", description=f"Description of course {i}")
+        for i in range(courses)
+    )
+    GradeCourse.objects.bulk_create(
+        GradeCourse(grade=grade, course=course_objs[(g + c) % courses])
+        for g, grade in enumerate(grade_objs)
+        for c in range(min(courses_per_grade, courses))
+    )
+
+    birthdate = date(2008, 1, 1)
+    student_objs = Student.objects.bulk_create(
+        (
+            Student(
+                name=f"Student {i:06d}",
+                birthdate=birthdate + timedelta(days=i % 1000),
+                student_id=f"S{i:06d}",
+                grade=section_objs[i % len(section_objs)].grade,
+                section=section_objs[i % len(section_objs)],
+            )
+            for i in range(students)
+        ),
+        batch_size=5000,
+    )
+    statuses = ['active', 'active', 'completed', 'dropped']
+    Enrollment.objects.bulk_create(
+        (
+            Enrollment(
+                student=student,
+                course=course_objs[(i + k) % courses],
+                status=statuses[(i + k) % len(statuses)],
+                final_grade=75 if statuses[(i + k) % len(statuses)] == 'completed' else None,
+            )
+            for i, student in enumerate(student_objs)
+            for k in range(min(enrollments_per_student, courses))
+        ),
+        batch_size=5000,
+    )
+    Enrollment.objects.refresh_search_documents()
+    EnrollmentStatistic.objects.refresh()
+    invalidate_for(Grade, Section, Course, GradeCourse, Student, Enrollment)
+
+    return SimpleNamespace(
+        grade=grade_objs[0],
+        section=section_objs[0],
+        student=student_objs[0],
+        course=course_objs[0],
+        enrollment=Enrollment.objects.filter(student=student_objs[0]).first(),
+        grade_course=GradeCourse.objects.filter(grade=grade_objs[0]).first(),
+    )
@@ -0,0 +1,1107 @@
+import asyncio
+import io
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time as clock, timezone
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import request_finished, request_started
+from django.conf import settings
+from django.db import connection, connections, router
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from django.test import AsyncClient, Client, RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, path, reverse
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, APITestCase, APITransactionTestCase, force_authenticate
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from grades.models import Grade
+from sections.models import Section
+from students.models import Student
+from courses.models import Course
+from enrollments.models import Enrollment
+from grade_course.models import GradeCourse
+from grades.serializers import GradeSerializer, GradeValuesSerializer
+from sections.serializers import SectionSerializer, SectionValuesSerializer
+from students.serializers import StudentSerializer, StudentValuesSerializer
+from courses.serializers import CourseSerializer, CourseValuesSerializer
+from enrollments.serializers import EnrollmentSerializer, EnrollmentValuesSerializer
+from grade_course.serializers import GradeCourseSerializer, GradeCourseValuesSerializer
+from students import views as student_views
+from enrollments import views as enrollment_views
+from grade_course import views as grade_course_views
+from . import renderers
+from .database import database_config
+from .parsers import FastJSONParser
+from .response_cache import PendingInvalidation, bump_versions, cache_response
+from .routers import PrimaryReplicaRouter, ReplicaRoutingMiddleware
+from .throttling import SlidingWindowThrottle, TokenBucketThrottle
+from .renderers import FastJSONRenderer
+from .testing import RUN_BENCHMARKS, benchmark, env_int, seed_university
+
+
+class ListQueryPlanTestCase(APITestCase):
+    """Test that list endpoint queries are served by indexes, not table scans"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='staff', password='staffpass123')
+        cls.grade = Grade.objects.create(name="Grade 1")
+        cls.section = Section.objects.create(name="A", grade=cls.grade)
+        cls.course = Course.objects.create(name="Mathematics")
+        GradeCourse.objects.create(grade=cls.grade, course=cls.course)
+        for i in range(5):
+            student = Student.objects.create(
+                name=f"Student {i}", birthdate="2010-01-01",
+                student_id=f"S{i:03d}", grade=cls.grade, section=cls.section
+            )
+            Enrollment.objects.create(student=student, course=cls.course)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(user=self.user)
+        if connection.vendor == 'postgresql':
+            # Small test tables would otherwise always be read sequentially
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+
+    def get_page_query_plan(self, url, params):
+        """Run a list request and EXPLAIN the query that fetched the page"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        page_sql = [q['sql'] for q in queries.captured_queries if 'LIMIT' in q['sql']][-1]
+
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute(f'EXPLAIN QUERY PLAN {page_sql}')
+                return [row[-1] for row in cursor.fetchall()]
+            cursor.execute(f'EXPLAIN {page_sql}')
+            return [row[0] for row in cursor.fetchall()]
+
+    def assertNoTableScan(self, plan):
+        for line in plan:
+            if connection.vendor == 'sqlite':
+                # "SCAN t" without "USING ... INDEX" reads the whole table
+                if line.startswith('SCAN ') and 'INDEX' not in line:
+                    self.fail(f"Full table scan in plan: {plan}")
+            elif 'Seq Scan' in line:
+                self.fail(f"Sequential scan in plan: {plan}")
+
+    def test_list_endpoints_use_indexes(self):
+        cases = [
+            ('grades:grade-list-create', {}),
+            ('sections:section-list-create', {'grade': self.grade.id}),
+            ('students:student-list-create', {}),
+            ('students:student-list-create', {'grade': self.grade.id, 'section': self.section.id}),
+            ('students:student-list-create', {'section': self.section.id}),
+            ('courses:course-list-create', {}),
+            ('enrollments:enrollment-list-create', {}),
+            ('enrollments:enrollment-list-create', {'status': 'active'}),
+            ('enrollments:enrollment-list-create', {'course': self.course.id}),
+            ('enrollments:enrollment-list-create', {'cursor': ''}),
+            ('grade_course:grade-course-list-create', {'grade': self.grade.id}),
+        ]
+        for name, params in cases:
+            with self.subTest(endpoint=name, params=params):
+                self.assertNoTableScan(self.get_page_query_plan(reverse(name), params))
+
+
+def route_names(patterns, namespace=None):
+    """Yield the fully qualified name of every named route"""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace == 'admin':
+                continue
+            child_namespace = pattern.namespace or namespace
+            if namespace and pattern.namespace:
+                child_namespace = f'{namespace}:{pattern.namespace}'
+            yield from route_names(pattern.url_patterns, child_namespace)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield f'{namespace}:{pattern.name}' if namespace else pattern.name
+
+
+class QueryBudgetTestCase(APITestCase):
+    """
+    Query budget and latency ceiling for every route.
+
+    Budgets are absolute query counts and must not grow with the data: a
+    change that adds a query per row fails here. The seed is small by default
+    so the suite stays fast; set BENCHMARK_STUDENTS=100000 (and friends) to
+    run the same budgets against production-sized data. The latency ceiling
+    (BENCHMARK_LATENCY_CEILING_MS) is only checked with RUN_BENCHMARKS=1,
+    and never for the routes that hash a password.
+    """
+
+    # (route name, kwargs key, method, request data, max queries)
+    # kwargs key names an attribute of the seeded data whose pk fills the URL.
+    BUDGETS = [
+        ('grades:grade-list-create', None, 'get', {}, 2),
+        ('grades:grade-list-create', None, 'post', {'name': 'Budget Grade'}, 4),
+        ('grades:grade-detail', 'grade', 'get', {}, 1),
+        ('grades:grade-stats', 'grade', 'get', {}, 1),
+        ('grades:grade-detail', 'grade', 'put', {'name': 'Grade 000'}, 3),
+        ('sections:section-list-create', None, 'get', {}, 2),
+        ('sections:section-list-create', None, 'get', {'grade': 'grade'}, 2),
+        ('sections:section-detail', 'section', 'get', {}, 1),
+        ('students:student-list-create', None, 'get', {}, 2),
+        ('students:student-list-create', None, 'get', {'search': 'Student 0000'}, 2),
+        ('students:student-list-create', None, 'get', {'cursor': ''}, 2),
+        ('students:student-detail', 'student', 'get', {}, 1),
+        ('students:student-export', None, 'get', {}, 1),
+        ('students:student-export', None, 'get', {'grade': 'grade', 'export_format': 'ndjson'}, 1),
+        ('students:student-bulk-create', None, 'post', [
+            {'name': f'Bulk {i}', 'birthdate': '2010-01-01', 'student_id': f'BULK{i}',
+             'grade': 'grade', 'section': 'section'}
+            for i in range(50)
+        ], 5),
+        ('courses:course-list-create', None, 'get', {}, 2),
+        ('courses:course-detail', 'course', 'get', {}, 1),
+        ('courses:course-stats', 'course', 'get', {}, 1),
+        ('enrollments:enrollment-list-create', None, 'get', {}, 2),
+        ('enrollments:enrollment-list-create', None, 'get', {'status': 'active'}, 2),
+        ('enrollments:enrollment-list-create', None, 'get', {'cursor': ''}, 2),
+        ('enrollments:enrollment-detail', 'enrollment', 'get', {}, 1),
+        ('enrollments:enrollment-export', None, 'get', {'status': 'active'}, 1),
+        ('enrollments:enrollment-bulk-create', None, 'post', {'section': 'spare_section'}, 11),
+        ('enrollments:enrollment-bulk-update', None, 'patch', [
+            {'id': 'enrollment', 'status': 'completed', 'final_grade': '88.50'},
+        ], 7),
+        ('grade_course:grade-course-list-create', None, 'get', {}, 3),
+        ('grade_course:grade-course-detail', 'grade_course', 'get', {}, 2),
+        ('grade_course:courses-by-grade', 'grade', 'get', {}, 2),
+        ('grade_course:grades-by-course', 'course', 'get', {}, 2),
+        ('grade_course:grade-course-summary', None, 'get', {}, 1),
+        ('grade_course:bulk-assign-courses', None, 'post', {'grade_ids': ['spare_grade', 'grade'], 'courses': [{'course_id': 'course'}, {'course_id': 'spare_course'}]}, 8),
+        ('user-register', None, 'post', {
+            'username': 'budget', 'email': 'budget@example.com', 'password': 'budgetpass123',
+            'password_confirm': 'budgetpass123',
+        }, 2),
+        ('user-login', None, 'post', {'username': 'staff', 'password': 'staffpass123'}, 2),
+        ('token-refresh', None, 'post', {'refresh': 'refresh_token'}, 13),
+        ('user-logout', None, 'post', {'refresh': 'logout_token'}, 7),
+        ('user-profile', None, 'get', {}, 0),
+        ('change-password', None, 'post', {
+            'old_password': 'staffpass123', 'new_password': 'staffpass456',
+            'confirm_password': 'staffpass456',
+        }, 2),
+        ('auth-status', None, 'get', {}, 0),
+        ('schema-json', None, 'get', {}, 0),
+        ('schema-swagger-ui', None, 'get', {}, 0),
+        ('schema-redoc', None, 'get', {}, 0),
+        # Deletes last, on rows nothing else depends on. Cascaded rows are
+        # selected rather than fast-deleted so the response cache sees them;
+        # direct student and enrollment deletes also recount one statistics
+        # group (delete, aggregate, insert).
+        ('students:student-detail', 'spare_student', 'delete', {}, 6),
+        ('sections:section-detail', 'spare_section', 'delete', {}, 4),
+        ('enrollments:enrollment-detail', 'enrollment', 'delete', {}, 5),
+        ('grade_course:grade-course-detail', 'grade_course', 'delete', {}, 2),
+        ('courses:course-detail', 'spare_course', 'delete', {}, 6),
+        ('grades:grade-detail', 'spare_grade', 'delete', {}, 7),
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = seed_university(
+            grades=env_int('BENCHMARK_GRADES', 10),
+            sections_per_grade=env_int('BENCHMARK_SECTIONS_PER_GRADE', 4),
+            students=env_int('BENCHMARK_STUDENTS', 500),
+            courses=env_int('BENCHMARK_COURSES', 20),
+        )
+        cls.user = User.objects.create_user(username='staff', password='staffpass123')
+        cls.data.spare_grade = Grade.objects.create(name="Spare Grade")
+        cls.data.spare_section = Section.objects.create(name="Spare", grade=cls.data.grade)
+        cls.data.spare_course = Course.objects.create(name="Spare Course")
+        cls.data.spare_student = Student.objects.create(
+            name="Spare Student", birthdate="2010-01-01", student_id="SPARE1",
+            grade=cls.data.grade, section=cls.data.spare_section
+        )
+        cls.data.refresh_token = str(RefreshToken.for_user(cls.user))
+        cls.data.logout_token = str(RefreshToken.for_user(cls.user))
+
+    # (route name, method) that refresh enrollment statistics, which takes one
+    # more query for the group lock on databases with row locks
+    STATISTICS_LOCKS = {
+        ('students:student-detail', 'delete'),
+        ('enrollments:enrollment-detail', 'delete'),
+        ('enrollments:enrollment-bulk-create', 'post'),
+        ('enrollments:enrollment-bulk-update', 'patch'),
+    }
+
+    # Routes whose time is spent hashing a password (PASSWORD_PBKDF2_ITERATIONS)
+    PASSWORD_HASHING_ROUTES = {'user-register', 'user-login', 'change-password'}
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(user=self.user)
+
+    def resolve(self, value):
+        """Replace references to seeded objects with their pk or token"""
+        if isinstance(value, dict):
+            return {key: self.resolve(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.resolve(item) for item in value]
+        if isinstance(value, str) and hasattr(self.data, value):
+            target = getattr(self.data, value)
+            return target if isinstance(target, str) else target.pk
+        return value
+
+    def test_every_route_has_a_budget(self):
+        budgeted = {name for name, *_ in self.BUDGETS}
+        missing = set(route_names(get_resolver().url_patterns)) - budgeted
+        self.assertFalse(missing, f"Routes without a query budget: {sorted(missing)}")
+
+    def test_query_budgets(self):
+        ceiling_ms = env_int('BENCHMARK_LATENCY_CEILING_MS', 1000) if RUN_BENCHMARKS else None
+        for name, kwargs_key, method, data, budget in self.BUDGETS:
+            kwargs = {'pk': self.resolve(kwargs_key)} if kwargs_key else {}
+            if name == 'grade_course:courses-by-grade':
+                kwargs = {'grade_id': kwargs['pk']}
+            elif name == 'grade_course:grades-by-course':
+                kwargs = {'course_id': kwargs['pk']}
+            elif name == 'schema-json':
+                kwargs = {'format': '.json'}
+            url = reverse(name, kwargs=kwargs)
+            request = getattr(self.client, method)
+            data = self.resolve(data)
+            if (name, method) in self.STATISTICS_LOCKS and connection.features.has_select_for_update:
+                budget += 1
+
+            with self.subTest(route=name, method=method, data=data):
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    if method == 'get':
+                        response = request(url, data)
+                    else:
+                        response = request(url, data, format='json')
+                    if response.streaming:
+                        b''.join(response.streaming_content)
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+
+                self.assertLess(response.status_code, 400, getattr(response, 'data', None))
+                self.assertLessEqual(
+                    len(queries), budget,
+                    "\n".join(q['sql'] for q in queries.captured_queries)
+                )
+                if ceiling_ms is not None and name not in self.PASSWORD_HASHING_ROUTES:
+                    self.assertLess(elapsed_ms, ceiling_ms)
+
+
+class ValuesSerializerTestCase(APITestCase):
+    """
+    The fast read path must render exactly what the ModelSerializers render.
+
+    ``test_benchmark`` times both paths over the same rows; raise
+    BENCHMARK_SERIALIZER_ROWS to profile at list-export sizes.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_university(
+            grades=4, sections_per_grade=2,
+            students=env_int('BENCHMARK_SERIALIZER_ROWS', 200), courses=6,
+        )
+        cls.user = User.objects.create_user(username='staff', password='staffpass123')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(user=self.user)
+
+    def serializer_pairs(self):
+        """Yield (queryset, ModelSerializer, ValuesSerializer, context) per resource"""
+        grade_courses = GradeCourse.objects.select_related('grade', 'course')
+        counts = Enrollment.objects.counts_by_grade_course(grade_courses)
+        yield Grade.objects.with_counts(), GradeSerializer, GradeValuesSerializer, {}
+        yield Section.objects.select_related('grade').with_counts(), SectionSerializer, SectionValuesSerializer, {}
+        yield Student.objects.select_related('grade', 'section').with_counts(), StudentSerializer, StudentValuesSerializer, {}
+        yield Course.objects.with_counts(), CourseSerializer, CourseValuesSerializer, {}
+        yield Enrollment.objects.select_related('student', 'course'), EnrollmentSerializer, EnrollmentValuesSerializer, {}
+        yield grade_courses, GradeCourseSerializer, GradeCourseValuesSerializer, {'enrollment_counts': counts}
+
+    def test_identical_output(self):
+        for queryset, serializer_class, values_serializer, context in self.serializer_pairs():
+            with self.subTest(serializer=serializer_class.__name__):
+                expected = serializer_class(queryset, many=True, context=context).data
+                actual = values_serializer(values_serializer.values(queryset), many=True, context=context).data
+                self.assertEqual(
+                    [list(row.items()) for row in actual],
+                    [list(row.items()) for row in expected],
+                )
+
+    def test_identical_responses(self):
+        cases = [
+            ('grades:grade-list-create', {}),
+            ('sections:section-list-create', {'cursor': ''}),
+            ('students:student-list-create', {'page': 2}),
+            ('courses:course-list-create', {}),
+            ('enrollments:enrollment-list-create', {'status': 'completed'}),
+            ('grade_course:grade-course-list-create', {}),
+            ('students:student-detail', {'pk': Student.objects.first().pk}),
+            ('enrollments:enrollment-detail', {'pk': Enrollment.objects.filter(status='completed').first().pk}),
+            ('grade_course:grade-course-detail', {'pk': GradeCourse.objects.first().pk}),
+        ]
+        for name, params in cases:
+            kwargs = {'pk': params.pop('pk')} if 'pk' in params else {}
+            url = reverse(name, kwargs=kwargs)
+            with self.subTest(route=name):
+                fast = self.client.get(url, params)
+                cache.clear()
+                with override_settings(FAST_READ_SERIALIZERS=False):
+                    slow = self.client.get(url, params)
+                self.assertEqual(fast.content, slow.content)
+
+    @benchmark
+    def test_benchmark(self):
+        timings = {}
+        for queryset, serializer_class, values_serializer, context in self.serializer_pairs():
+            # Fetching is timed too: the fast path also skips building model instances
+            started = time.perf_counter()
+            data = serializer_class(list(queryset), many=True, context=context).data
+            slow = time.perf_counter() - started
+
+            started = time.perf_counter()
+            values_serializer(list(values_serializer.values(queryset)), many=True, context=context).data
+            fast = time.perf_counter() - started
+
+            timings[serializer_class.__name__] = (len(data), slow * 1000, fast * 1000)
+
+        report = "\n".join(
+            f"{name}: {count} rows, ModelSerializer {slow:.1f} ms, ValuesSerializer {fast:.1f} ms"
+            for name, (count, slow, fast) in timings.items()
+        )
+        total_slow = sum(slow for _, slow, _ in timings.values())
+        total_fast = sum(fast for _, _, fast in timings.values())
+        self.assertLess(total_fast, total_slow, report)
+
+
+class FastJSONTestCase(APITestCase):
+    """FastJSONRenderer and FastJSONParser must match DRF's stdlib versions"""
+
+    data = {
+        'final_grade': Decimal('88.50'),
+        'enrollment_date': date(2026, 9, 1),
+        'created_at': datetime(2026, 9, 1, 8, 30, 15, 123456, tzinfo=timezone.utc),
+        'naive': datetime(2026, 9, 1, 8, 30),
+        'starts': clock(9, 15),
+        'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'name': 'Zoë \u2028 line',
+        'counts': {1: 2},
+        'results': [{'id': 1, 'status': None, 'active': True, 'ratio': 0.1}],
+    }
+
+    def test_renders_same_bytes_as_json_renderer(self):
+        self.assertEqual(FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_indent_and_fallback_use_stdlib(self):
+        expected = JSONRenderer().render(self.data, 'application/json; indent=4')
+        self.assertEqual(FastJSONRenderer().render(self.data, 'application/json; indent=4'), expected)
+        with mock.patch.object(renderers, 'orjson', None):
+            self.assertEqual(FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_parser_matches_json_parser(self):
+        body = b'{"id": 1, "name": "Zo\xc3\xab", "final_grade": 88.5, "items": [null, true]}'
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(body)),
+            JSONParser().parse(io.BytesIO(body)),
+        )
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"id": NaN}'))
+
+    def test_api_responses_use_fast_renderer(self):
+        user = User.objects.create_user(username='staff', password='staffpass123')
+        self.client.force_authenticate(user=user)
+        Grade.objects.create(name="Grade 1")
+        response = self.client.get(reverse('grades:grade-list-create'))
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+
+@override_settings(CACHE_SHARED=True)
+class ResponseCacheTestCase(APITestCase):
+    """Cached GET responses are reused until a write touches their models"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='staff', password='staffpass123')
+        self.client.force_authenticate(user=self.user)
+        self.grade = Grade.objects.create(name="Grade 1")
+        self.section = Section.objects.create(name="A", grade=self.grade)
+        self.course = Course.objects.create(name="Mathematics")
+        GradeCourse.objects.create(grade=self.grade, course=self.course)
+        self.student = Student.objects.create(
+            name="Alice", birthdate="2010-01-01", student_id="S001",
+            grade=self.grade, section=self.section
+        )
+        Enrollment.objects.create(student=self.student, course=self.course)
+
+    def test_repeat_get_is_served_from_cache(self):
+        url = reverse('grades:grade-list-create')
+        first = self.client.get(url, {'search': 'Grade', 'page': 1, 'cursor': ''})
+        # Same parameters in another order, plus an empty one
+        with self.assertNumQueries(0):
+            second = self.client.get(f'{url}?cursor=&page=1&search=Grade&grade=')
+        self.assertEqual(first.content, second.content)
+
+        courses_url = reverse('grade_course:courses-by-grade', kwargs={'grade_id': self.grade.id})
+        self.client.get(courses_url)
+        with self.assertNumQueries(0):
+            self.client.get(courses_url)
+        self.assertEqual(self.client.get(url, {'search': 'Other'}).data['results'], [])
+
+    @override_settings(CACHE_SHARED=False)
+    def test_process_local_cache_is_not_used(self):
+        url = reverse('grades:grade-list-create')
+        self.client.get(url)
+        with self.assertNumQueries(2):
+            self.client.get(url)
+
+    def test_save_invalidates_dependent_resources(self):
+        grades_url = reverse('grades:grade-list-create')
+        sections_url = reverse('sections:section-list-create')
+        self.assertEqual(self.client.get(grades_url).data['results'][0]['students_count'], 1)
+        self.client.get(sections_url)
+
+        self.client.put(
+            reverse('grades:grade-detail', kwargs={'pk': self.grade.id}), {'name': 'Grade One'}, format='json'
+        )
+        self.assertEqual(self.client.get(sections_url).data['results'][0]['grade_name'], 'Grade One')
+
+        Student.objects.create(
+            name="Bob", birthdate="2010-01-01", student_id="S002", grade=self.grade, section=self.section
+        )
+        self.assertEqual(self.client.get(grades_url).data['results'][0]['students_count'], 2)
+
+    def test_cascaded_deletes_invalidate(self):
+        courses_url = reverse('courses:course-list-create')
+        self.assertEqual(self.client.get(courses_url).data['results'][0]['enrollments_count'], 1)
+        # Deleting the grade cascades to its students and their enrollments
+        self.client.delete(reverse('grades:grade-detail', kwargs={'pk': self.grade.id}))
+        self.assertEqual(self.client.get(courses_url).data['results'][0]['enrollments_count'], 0)
+
+    def test_cascade_bumps_each_resource_once(self):
+        for i in range(2, 5):
+            Student.objects.create(
+                name=f"Student {i}", birthdate="2010-01-01", student_id=f"S00{i}",
+                grade=self.grade, section=self.section
+            )
+        with mock.patch('mini_university.response_cache.bump_versions', wraps=bump_versions) as bump:
+            self.client.delete(reverse('grades:grade-detail', kwargs={'pk': self.grade.id}))
+        bumped = [resource for call in bump.call_args_list for resource in call.args[0]]
+        self.assertEqual(sorted(bumped), sorted(set(bumped)))
+        self.assertIn('enrollments', bumped)
+        # The test's transaction holds a single commit callback for them all
+        pending = [func for _, func, _ in connection.run_on_commit if isinstance(func, PendingInvalidation)]
+        self.assertEqual(len(pending), 1)
+        self.assertLessEqual(set(bumped), pending[0].resources)
+
+    def test_bulk_writes_invalidate(self):
+        summary_url = reverse('grade_course:grade-course-list-create')
+        self.assertEqual(self.client.get(summary_url).data['count'], 1)
+        other = Course.objects.create(name="English")
+        self.client.post(
+            reverse('grade_course:bulk-assign-courses'),
+            {'grade_id': self.grade.id, 'courses': [{'course_id': other.id}]}, format='json'
+        )
+        self.assertEqual(self.client.get(summary_url).data['count'], 2)
+
+        courses_url = reverse('courses:course-list-create')
+        self.client.get(courses_url)
+        self.client.post(reverse('enrollments:enrollment-bulk-create'), {'grade': self.grade.id}, format='json')
+        counts = {row['name']: row['enrollments_count'] for row in self.client.get(courses_url).data['results']}
+        self.assertEqual(counts, {'English': 1, 'Mathematics': 1})
+
+
+class ConditionalGetTestCase(APITestCase):
+    """Test ETag and If-None-Match handling on list and detail views"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='staff', password='staffpass123')
+        self.client.force_authenticate(user=self.user)
+        self.grade = Grade.objects.create(name="Grade 1")
+        self.section = Section.objects.create(name="A", grade=self.grade)
+        self.course = Course.objects.create(name="Mathematics")
+        self.student = Student.objects.create(
+            name="Alice", birthdate="2010-01-01", student_id="S001",
+            grade=self.grade, section=self.section
+        )
+        self.enrollment = Enrollment.objects.create(student=self.student, course=self.course)
+
+    def test_detail_not_modified(self):
+        url = reverse('students:student-detail', kwargs={'pk': self.student.id})
+        response = self.client.get(url)
+        etag = response['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+        # Weak validators and lists of tags also match
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=f'"other", W/{etag}')
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.put(url, {
+            'name': 'Alicia', 'birthdate': '2010-01-01', 'student_id': 'S001',
+            'grade': self.grade.id, 'section': self.section.id,
+        }, format='json')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['name'], 'Alicia')
+
+    def test_list_not_modified(self):
+        url = reverse('enrollments:enrollment-list-create')
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        # Another page or filter is another representation
+        response = self.client.get(url, {'page_size': 5}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        Enrollment.objects.create(student=self.student, course=Course.objects.create(name="English"))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+
+    def test_write_unseen_by_version_changes_list_etag(self):
+        url = reverse('enrollments:enrollment-list-create')
+        etag = self.client.get(url)['ETag']
+        # Like a write from another process: no signal reaches this cache
+        Enrollment.objects.filter(pk=self.enrollment.pk).update(
+            status='dropped', updated_at=datetime(2030, 1, 1, tzinfo=timezone.utc)
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['status'], 'dropped')
+
+    def test_filtered_summary_is_cached(self):
+        url = reverse('enrollments:enrollment-list-create')
+        etag = self.client.get(url, {'status': 'active'})['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(url, {'status': 'active'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    @override_settings(CACHE_SHARED=True)
+    def test_shared_version_list_etag_costs_no_query(self):
+        url = reverse('enrollments:enrollment-list-create')
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Enrollment.objects.create(student=self.student, course=Course.objects.create(name="English"))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Cursor pages skip the count again
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'cursor': ''})
+        self.assertIn('ETag', response)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('COUNT(', queries[0]['sql'])
+
+    @override_settings(CACHE_SHARED=True)
+    def test_no_list_etag_from_lagging_replica(self):
+        url = reverse('enrollments:enrollment-list-create')
+        Enrollment.objects.create(student=self.student, course=Course.objects.create(name="English"))
+        with mock.patch('mini_university.conditional.reading_from_replica', return_value=True):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('ETag', response)
+
+    def test_related_write_changes_etag(self):
+        url = reverse('students:student-detail', kwargs={'pk': self.student.id})
+        etag = self.client.get(url)['ETag']
+        # The student row is untouched but its grade name appears in the response
+        self.grade.name = "Grade One"
+        self.grade.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['grade_name'], 'Grade One')
+
+    @override_settings(CACHE_SHARED=True)
+    def test_cached_response_answers_not_modified(self):
+        url = reverse('grades:grade-list-create')
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], etag)
+
+
+class DatabaseConfigTestCase(SimpleTestCase):
+    """DATABASES entries are built from DB_* environment variables"""
+
+    def config(self, **env):
+        # Start from no DB_* variables, whatever the suite itself runs with
+        environ = {key: value for key, value in os.environ.items() if not key.startswith('DB_')}
+        with mock.patch.dict(os.environ, {**environ, **env}, clear=True):
+            return database_config()
+
+    def test_persistent_connections_by_default(self):
+        config = self.config()
+        self.assertEqual(config['CONN_MAX_AGE'], 60)
+        self.assertTrue(config['CONN_HEALTH_CHECKS'])
+        self.assertNotIn('pool', config['OPTIONS'])
+
+    def test_environment_overrides(self):
+        config = self.config(
+            DB_HOST='db.internal', DB_CONN_MAX_AGE='None', DB_CONN_HEALTH_CHECKS='False',
+            DB_CONNECT_TIMEOUT='5',
+        )
+        self.assertEqual(config['HOST'], 'db.internal')
+        self.assertIsNone(config['CONN_MAX_AGE'])
+        self.assertFalse(config['CONN_HEALTH_CHECKS'])
+        self.assertEqual(config['OPTIONS'], {'connect_timeout': 5})
+
+    def test_pool_needs_psycopg_pool(self):
+        with mock.patch.dict(sys.modules, {'psycopg_pool': None}):
+            with self.assertRaises(ImproperlyConfigured):
+                self.config(DB_POOL='True')
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Connection setup cost is only measured on PostgreSQL')
+class ConnectionReuseBenchmarkTestCase(TransactionTestCase):
+    """
+    Connection setup must stay out of the request path.
+
+    Runs BENCHMARK_CONNECTION_REQUESTS request cycles (request_started, one
+    query, request_finished, as a gunicorn worker does) first opening a new
+    connection for every request, then with the configured persistent
+    connection or pool.
+    """
+
+    def request_cycles(self, count):
+        """Return (milliseconds per request, connections opened)"""
+        opened = []
+
+        def on_connect(sender, connection, **kwargs):
+            opened.append(connection.alias)
+
+        connection_created.connect(on_connect)
+        try:
+            started = time.perf_counter()
+            for _ in range(count):
+                request_started.send(sender=self.__class__)
+                Grade.objects.exists()
+                request_finished.send(sender=self.__class__)
+            elapsed = time.perf_counter() - started
+        finally:
+            connection_created.disconnect(on_connect)
+        return elapsed * 1000 / count, len(opened)
+
+    @benchmark
+    def test_benchmark(self):
+        count = env_int('BENCHMARK_CONNECTION_REQUESTS', 200)
+        pooled = 'pool' in connection.settings_dict['OPTIONS']
+        options = {key: value for key, value in connection.settings_dict['OPTIONS'].items() if key != 'pool'}
+
+        connection.close()
+        with mock.patch.dict(connection.settings_dict, {'CONN_MAX_AGE': 0, 'OPTIONS': options}):
+            per_request_ms, per_request_opened = self.request_cycles(count)
+        connection.close()
+        configured_ms, configured_opened = self.request_cycles(count)
+
+        report = (
+            f"{count} requests: new connection per request {per_request_ms:.2f} ms/request "
+            f"({per_request_opened} connections), configured {configured_ms:.2f} ms/request "
+            f"({configured_opened} connections{', pooled' if pooled else ''})"
+        )
+        self.assertEqual(per_request_opened, count, report)
+        if not pooled:
+            # A pool hands out its connections per request; only a
+            # persistent connection is opened just once
+            self.assertEqual(configured_opened, 1, report)
+        self.assertLess(configured_ms, per_request_ms, report)
+
+
+@override_settings(REPLICA_DATABASES=['replica_1'])
+class ReplicaRoutingTestCase(SimpleTestCase):
+    """Safe requests read from replicas unless they or their client wrote"""
+
+    def setUp(self):
+        cache.clear()
+
+    def route(self, method, write=False, token='Bearer alice'):
+        """Return the alias a read would use inside a request"""
+        seen = {}
+
+        def view(request):
+            if write:
+                seen['write'] = router.db_for_write(Grade)
+            seen['read'] = router.db_for_read(Grade)
+            return HttpResponse()
+
+        request = RequestFactory().generic(method, '/api/grades/', HTTP_AUTHORIZATION=token)
+        ReplicaRoutingMiddleware(view)(request)
+        self.assertEqual(seen.get('write', 'default'), 'default')
+        return seen['read']
+
+    def test_safe_methods_read_from_replicas(self):
+        self.assertEqual(self.route('GET'), 'replica_1')
+        self.assertEqual(self.route('HEAD'), 'replica_1')
+        self.assertEqual(self.route('POST'), 'default')
+        # Outside a request, reads use the primary
+        self.assertEqual(router.db_for_read(Grade), 'default')
+
+    def test_read_after_write_uses_primary(self):
+        self.assertEqual(self.route('GET', write=True), 'default')
+        self.assertEqual(self.route('POST', write=True), 'default')
+
+    def test_client_is_pinned_after_writing(self):
+        self.route('POST', write=True)
+        self.assertEqual(self.route('GET'), 'default')
+        self.assertEqual(self.route('GET', token='Bearer bob'), 'replica_1')
+        # A request that did not write sets no pin
+        self.route('POST', token='Bearer carol')
+        self.assertEqual(self.route('GET', token='Bearer carol'), 'replica_1')
+
+    def test_pin_expires(self):
+        with override_settings(REPLICA_PIN_SECONDS=0):
+            self.route('POST', write=True)
+        self.assertEqual(self.route('GET'), 'replica_1')
+
+    @override_settings(CACHE_SHARED=True)
+    def test_recent_versions_are_not_cached_from_replicas(self):
+        calls = []
+
+        @cache_response('grades')
+        def handler(view, request):
+            calls.append(request.method)
+            return Response({'name': 'Grade 1'})
+
+        def view(request):
+            handler(None, Request(request))
+            handler(None, Request(request))
+            return HttpResponse()
+
+        # A version made just now may belong to a write the replica lacks
+        ReplicaRoutingMiddleware(view)(RequestFactory().get('/api/grades/'))
+        self.assertEqual(len(calls), 2)
+        with override_settings(REPLICA_PIN_SECONDS=0):
+            ReplicaRoutingMiddleware(view)(RequestFactory().get('/api/grades/'))
+        self.assertEqual(len(calls), 3)
+
+    def test_replicas_are_not_migrated(self):
+        self.assertIs(PrimaryReplicaRouter().allow_migrate('replica_1', 'grades'), False)
+        self.assertIsNone(PrimaryReplicaRouter().allow_migrate('default', 'grades'))
+
+
+@skipUnless(settings.REPLICA_DATABASES, 'Set DB_REPLICA_HOSTS to test against a replica alias')
+class ReplicaRoutingIntegrationTestCase(APITransactionTestCase):
+    """
+    Requests use the replica alias end to end.
+
+    Replicas mirror ``default`` in tests, so this runs against any database,
+    e.g. ``DB_ENGINE=django.db.backends.sqlite3 DB_NAME=db.sqlite3
+    DB_REPLICA_HOSTS=localhost``. It is a TransactionTestCase because a
+    mirror connection cannot see another connection's open transaction.
+    """
+    databases = '__all__'
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='staff', password='staffpass123')
+        self.replica = settings.REPLICA_DATABASES[0]
+
+    def queries_by_alias(self, method, url, data=None, token='Bearer alice'):
+        self.client.force_authenticate(user=self.user)
+        contexts = {alias: CaptureQueriesContext(connections[alias]) for alias in ('default', self.replica)}
+        for context in contexts.values():
+            context.__enter__()
+        try:
+            response = getattr(self.client, method)(url, data, format='json', HTTP_AUTHORIZATION=token)
+        finally:
+            for context in contexts.values():
+                context.__exit__(None, None, None)
+        self.assertLess(response.status_code, 400)
+        return {alias: len(context) for alias, context in contexts.items()}
+
+    def test_reads_and_writes_are_split(self):
+        # Students are not response-cached, so every GET reaches a database
+        url = reverse('students:student-list-create')
+        counts = self.queries_by_alias('get', url)
+        self.assertEqual(counts['default'], 0)
+        self.assertGreater(counts[self.replica], 0)
+
+        counts = self.queries_by_alias('post', reverse('grades:grade-list-create'), {'name': 'Grade 1'})
+        self.assertGreater(counts['default'], 0)
+        self.assertEqual(counts[self.replica], 0)
+
+        # The writer reads its own write from the primary; others use the replica
+        counts = self.queries_by_alias('get', url)
+        self.assertGreater(counts['default'], 0)
+        self.assertEqual(counts[self.replica], 0)
+        counts = self.queries_by_alias('get', url, token='Bearer bob')
+        self.assertEqual(counts['default'], 0)
+        self.assertGreater(counts[self.replica], 0)
+
+
+class AsyncReadViewTestCase(APITestCase):
+    """Test that the async read views answer exactly like the sync ones"""
+
+    VIEWS = [
+        (student_views.StudentListCreateView, student_views.AsyncStudentListCreateView),
+        (enrollment_views.EnrollmentListCreateView, enrollment_views.AsyncEnrollmentListCreateView),
+        (grade_course_views.GradeCourseListCreateView, grade_course_views.AsyncGradeCourseListCreateView),
+    ]
+    DETAIL_VIEWS = [
+        (student_views.StudentDetailView, student_views.AsyncStudentDetailView),
+        (enrollment_views.EnrollmentDetailView, enrollment_views.AsyncEnrollmentDetailView),
+        (grade_course_views.GradeCourseDetailView, grade_course_views.AsyncGradeCourseDetailView),
+    ]
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='staff', password='staffpass123')
+        self.factory = APIRequestFactory()
+        self.grade = Grade.objects.create(name="Grade 1")
+        self.section = Section.objects.create(name="A", grade=self.grade)
+        self.course = Course.objects.create(name="Mathematics")
+        self.grade_course = GradeCourse.objects.create(grade=self.grade, course=self.course)
+        self.student = Student.objects.create(
+            name="Alice", birthdate="2010-01-01", student_id="S001",
+            grade=self.grade, section=self.section
+        )
+        self.enrollment = Enrollment.objects.create(student=self.student, course=self.course)
+        bob = Student.objects.create(
+            name="Bob", birthdate="2010-01-01", student_id="S002",
+            grade=self.grade, section=self.section
+        )
+        # Second rows so every list has a next cursor page
+        Enrollment.objects.create(student=bob, course=self.course)
+        GradeCourse.objects.create(grade=self.grade, course=Course.objects.create(name="Physics"))
+
+    def call(self, view_class, params=None, headers=None, **kwargs):
+        request = self.factory.get('/', params, **(headers or {}))
+        force_authenticate(request, user=self.user)
+        view = view_class.as_view()
+        if view_class.view_is_async:
+            view = async_to_sync(view)
+        return view(request, **kwargs).render()
+
+    @override_settings(RESPONSE_CACHE_TIMEOUT=0)
+    def assertSameResponse(self, sync_view, async_view, params=None, headers=None, **kwargs):
+        # Without the response cache each call builds its own response
+        expected = self.call(sync_view, params, headers, **kwargs)
+        actual = self.call(async_view, params, headers, **kwargs)
+        self.assertEqual(actual.status_code, expected.status_code)
+        self.assertEqual(actual.content, expected.content)
+        self.assertEqual(actual.get('ETag'), expected.get('ETag'))
+        return actual
+
+    def test_views_are_async(self):
+        for sync_view, async_view in self.VIEWS + self.DETAIL_VIEWS:
+            self.assertFalse(sync_view.view_is_async)
+            self.assertTrue(async_view.view_is_async)
+
+    def test_list_responses_match(self):
+        for sync_view, async_view in self.VIEWS:
+            with self.subTest(view=async_view.__name__):
+                response = self.assertSameResponse(sync_view, async_view)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertSameResponse(sync_view, async_view, {'page_size': 1, 'page': 2})
+                self.assertSameResponse(sync_view, async_view, {'search': 'Alice'})
+
+    def test_cursor_responses_match(self):
+        for sync_view, async_view in self.VIEWS:
+            with self.subTest(view=async_view.__name__):
+                response = self.assertSameResponse(sync_view, async_view, {'cursor': '', 'page_size': 1})
+                self.assertIsNotNone(response.data['next'])
+                self.assertNotIn('count', response.data)
+                response = self.assertSameResponse(
+                    sync_view, async_view, {'cursor': response.data['next'], 'page_size': 1}
+                )
+                self.assertIsNotNone(response.data['previous'])
+
+    def test_detail_responses_match(self):
+        objects = [self.student, self.enrollment, self.grade_course]
+        for (sync_view, async_view), obj in zip(self.DETAIL_VIEWS, objects):
+            with self.subTest(view=async_view.__name__):
+                response = self.assertSameResponse(sync_view, async_view, pk=obj.pk)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                response = self.assertSameResponse(sync_view, async_view, pk=0)
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_not_modified(self):
+        etag = self.call(student_views.AsyncStudentListCreateView)['ETag']
+        response = self.call(
+            student_views.AsyncStudentListCreateView, headers={'HTTP_IF_NONE_MATCH': etag}
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_unauthenticated_request_is_rejected(self):
+        request = self.factory.get('/')
+        response = async_to_sync(student_views.AsyncStudentListCreateView.as_view())(request)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(CACHE_SHARED=True)
+    def test_grade_course_responses_are_cached(self):
+        view = grade_course_views.AsyncGradeCourseListCreateView
+        self.call(view)
+        with self.assertNumQueries(0):
+            response = self.call(view)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+
+
+class AsyncReadURLConf:
+    """The async read views at the URLs the sync ones are served from"""
+    urlpatterns = [
+        path('api/students/', student_views.AsyncStudentListCreateView.as_view()),
+        path('api/students/<int:pk>/', student_views.AsyncStudentDetailView.as_view()),
+        path('api/enrollments/', enrollment_views.AsyncEnrollmentListCreateView.as_view()),
+        path('api/enrollments/<int:pk>/', enrollment_views.AsyncEnrollmentDetailView.as_view()),
+        path('api/grade-courses/', grade_course_views.AsyncGradeCourseListCreateView.as_view()),
+        path('api/grade-courses/<int:pk>/', grade_course_views.AsyncGradeCourseDetailView.as_view()),
+    ]
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=0, THROTTLE_RATES={})
+class AsyncReadLoadBenchmarkTestCase(TransactionTestCase):
+    """
+    Throughput and p99 latency of the read endpoints, WSGI against ASGI.
+
+    Sends BENCHMARK_LOAD_REQUESTS GETs over the student, enrollment and
+    grade-course list and detail routes, BENCHMARK_LOAD_CONCURRENCY at a
+    time: through Django's WSGI handler from a thread pool to the sync views,
+    then through its ASGI handler from one event loop to the async views.
+    The response cache is off so both paths query. The numbers are written
+    to stderr rather than compared, because SQLite runs the async ORM's
+    queries on a single thread; run against PostgreSQL to compare.
+    """
+
+    def setUp(self):
+        cache.clear()
+        university = seed_university(
+            grades=4, sections_per_grade=2,
+            students=env_int('BENCHMARK_LOAD_STUDENTS', 200), courses=6,
+        )
+        user = User.objects.create_user(username='staff', password='staffpass123')
+        self.headers = {'Authorization': f'Bearer {RefreshToken.for_user(user).access_token}'}
+        self.urls = [
+            '/api/students/',
+            f'/api/students/{university.student.pk}/',
+            '/api/enrollments/?status=active',
+            f'/api/enrollments/{university.enrollment.pk}/',
+            '/api/grade-courses/',
+            f'/api/grade-courses/{university.grade_course.pk}/',
+        ]
+        self.count = env_int('BENCHMARK_LOAD_REQUESTS', 120)
+        self.concurrency = env_int('BENCHMARK_LOAD_CONCURRENCY', 20)
+
+    def summarize(self, latencies, elapsed):
+        """Return (requests per second, p99 latency in ms)"""
+        latencies = sorted(latencies)
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        return len(latencies) / elapsed, p99 * 1000
+
+    def run_wsgi(self):
+        """Return (statuses, latencies, elapsed) of the sync views under WSGI"""
+        def send(url):
+            client = Client()
+            started = time.perf_counter()
+            response = client.get(url, headers=self.headers)
+            return response.status_code, time.perf_counter() - started
+
+        urls = [self.urls[i % len(self.urls)] for i in range(self.count)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            results = list(executor.map(send, urls))
+        elapsed = time.perf_counter() - started
+        return [code for code, _ in results], [latency for _, latency in results], elapsed
+
+    async def run_asgi(self):
+        """Return (statuses, latencies, elapsed) of the async views under ASGI"""
+        client = AsyncClient()
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def send(url):
+            async with slots:
+                started = time.perf_counter()
+                response = await client.get(url, headers=self.headers)
+                return response.status_code, time.perf_counter() - started
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(
+            send(self.urls[i % len(self.urls)]) for i in range(self.count)
+        ))
+        elapsed = time.perf_counter() - started
+        return [code for code, _ in results], [latency for _, latency in results], elapsed
+
+    @benchmark
+    def test_benchmark(self):
+        wsgi_statuses, wsgi_latencies, wsgi_elapsed = self.run_wsgi()
+        with override_settings(ROOT_URLCONF=AsyncReadURLConf):
+            asgi_statuses, asgi_latencies, asgi_elapsed = async_to_sync(self.run_asgi)()
+
+        self.assertEqual(set(wsgi_statuses), {status.HTTP_200_OK})
+        self.assertEqual(set(asgi_statuses), {status.HTTP_200_OK})
+
+        wsgi_rps, wsgi_p99 = self.summarize(wsgi_latencies, wsgi_elapsed)
+        asgi_rps, asgi_p99 = self.summarize(asgi_latencies, asgi_elapsed)
+        sys.stderr.write(
+            f"\n{self.count} requests, concurrency {self.concurrency} ({connection.vendor}): "
+            f"WSGI {wsgi_rps:.0f} req/s, p99 {wsgi_p99:.1f} ms; "
+            f"ASGI {asgi_rps:.0f} req/s, p99 {asgi_p99:.1f} ms\n"
+        )
+
+
+@override_settings(THROTTLE_RATES={'test': '3/min'})
+class ThrottleTestCase(SimpleTestCase):
+    """Sliding window and token bucket throttles over the cache"""
+
+    def setUp(self):
+        cache.clear()
+        self.request = Request(RequestFactory().get('/', REMOTE_ADDR='10.0.0.1'))
+
+    def attempts(self, throttle_class, times):
+        """Return whether each request is allowed, at the given times"""
+        throttle = type('Throttle', (throttle_class,), {'scope': 'test'})()
+        results = []
+        for now in times:
+            with mock.patch('mini_university.throttling.time.time', return_value=now):
+                results.append(throttle.allow_request(self.request, None))
+        return results, throttle
+
+    def test_sliding_window(self):
+        # Four attempts (one rejected) fill the window; half a window later
+        # they count for two, so only one more request fits
+        results, throttle = self.attempts(SlidingWindowThrottle, [600, 610, 620, 630, 690, 691, 750])
+        self.assertEqual(results, [True, True, True, False, True, False, True])
+        self.assertEqual(throttle.wait(), None)
+
+    def test_sliding_window_wait(self):
+        results, throttle = self.attempts(SlidingWindowThrottle, [600, 600, 600, 645])
+        self.assertEqual(results, [True, True, True, False])
+        self.assertEqual(throttle.wait(), 15)
+
+    def test_token_bucket(self):
+        # Bursts up to the bucket size, then one request per 20 seconds
+        results, throttle = self.attempts(TokenBucketThrottle, [600, 600, 600, 600, 620, 620])
+        self.assertEqual(results, [True, True, True, False, True, False])
+        self.assertAlmostEqual(throttle.wait(), 20)
+
+    @override_settings(THROTTLE_RATES={'test': ''})
+    def test_unset_rate_is_not_throttled(self):
+        results, _ = self.attempts(TokenBucketThrottle, [600] * 10)
+        self.assertTrue(all(results))
@@ -0,0 +1,137 @@
+"""
+Rate limiting with constant-size counters in the cache.
+
+DRF's ``SimpleRateThrottle`` keeps a list of request timestamps per client
+and rewrites it on every request. These throttles keep a fixed amount of
+state instead: ``SlidingWindowThrottle`` counts requests per fixed window
+with ``cache.incr`` (atomic on local memory, Redis and Memcached) and
+weighs the previous window's count by how much of it still overlaps the
+sliding window; ``TokenBucketThrottle`` keeps one ``(tokens, timestamp)``
+pair per client and allows bursts up to the bucket size.
+
+Counters live in the ``THROTTLE_CACHE_ALIAS`` cache: local memory in tests
+and single-process runs, a shared Redis or Memcached in production so that
+all workers count together. Rates come from ``THROTTLE_RATES`` by scope in
+DRF's ``'<count>/<period>'`` form; a scope without a rate is not throttled.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def throttle_cache():
+    """
+    The cache backend holding throttle counters.
+    """
+    return caches[getattr(settings, 'THROTTLE_CACHE_ALIAS', 'default')]
+
+
+def parse_rate(rate):
+    """
+    ``(requests, seconds)`` of a ``'<count>/<period>'`` rate such as ``'10/min'``.
+    """
+    count, period = rate.split('/')
+    return int(count), PERIODS[period[0]]
+
+
+class CacheThrottle(BaseThrottle):
+    """
+    Base class of the cache-backed throttles.
+
+    Subclasses set ``scope`` and implement ``consume``; ``get_client_ident``
+    picks who is counted and may return None to let a request through.
+    """
+    scope = None
+
+    def get_client_ident(self, request, view):
+        return self.get_ident(request)
+
+    def allow_request(self, request, view):
+        rate = getattr(settings, 'THROTTLE_RATES', {}).get(self.scope)
+        if not rate:
+            return True
+        ident = self.get_client_ident(request, view)
+        if ident is None:
+            return True
+        
+        self.num_requests, self.duration = parse_rate(rate)
+        # Hashed so usernames and addresses make valid Memcached keys
+        digest = hashlib.sha256(str(ident).encode()).hexdigest()[:32]
+        self.key = f'throttle:{self.scope}:{digest}'
+        self.wait_seconds = None
+        return self.consume(time.time())
+
+    def consume(self, now):
+        raise NotImplementedError('.consume() must be overridden')
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class SlidingWindowThrottle(CacheThrottle):
+    """
+    At most ``count`` requests in any ``period``, estimated from two counters.
+
+    Rejected requests are counted too, so a client that keeps retrying stays
+    throttled until it backs off.
+    """
+
+    def consume(self, now):
+        cache = throttle_cache()
+        window, offset = divmod(now, self.duration)
+        key = f'{self.key}:{int(window)}'
+        cache.add(key, 0, self.duration * 2)
+        try:
+            count = cache.incr(key)
+        except ValueError:
+            # Expired between add() and incr()
+            cache.set(key, 1, self.duration * 2)
+            count = 1
+        previous = cache.get(f'{self.key}:{int(window) - 1}', 0)
+        
+        overlap = 1 - offset / self.duration
+        if previous * overlap + count <= self.num_requests:
+            return True
+        self.wait_seconds = self.duration - offset
+        return False
+
+
+class TokenBucketThrottle(CacheThrottle):
+    """
+    A bucket of ``count`` requests refilled at ``count`` per ``period``.
+
+    The bucket is read and written without a lock, so concurrent requests
+    from one client may occasionally both take the last token.
+    """
+
+    def consume(self, now):
+        cache = throttle_cache()
+        tokens, updated = cache.get(self.key, (self.num_requests, now))
+        refill = (now - updated) * self.num_requests / self.duration
+        tokens = min(self.num_requests, tokens + refill)
+        
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        else:
+            self.wait_seconds = (1 - tokens) * self.duration / self.num_requests
+        # A bucket left alone for a whole period is full again
+        cache.set(self.key, (tokens, now), self.duration)
+        return allowed
+
+
+class ClientRateThrottle(TokenBucketThrottle):
+    """
+    Token bucket per API client: the authenticated user, else the address.
+    """
+    scope = 'api_client'
+
+    def get_client_ident(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return f'user:{request.user.pk}'
+        return f'ip:{self.get_ident(request)}'
@@ -0,0 +1,117 @@
+"""
+Fast read path for list and detail responses.
+
+A ``ValuesSerializer`` renders the dicts returned by ``QuerySet.values()``
+straight into response data, skipping DRF's per-field ``get_attribute`` /
+``to_representation`` machinery and model instantiation. Each subclass must
+produce exactly the same keys, order and value formats as the
+``ModelSerializer`` it stands in for; ``mini_university.tests`` checks this.
+
+Views opt in by setting ``values_serializer_class``; the
+``FAST_READ_SERIALIZERS`` setting turns the fast path off everywhere.
+"""
+import decimal
+from datetime import date
+
+from django.conf import settings
+from django.utils import timezone
+
+
+def datetime_value(value):
+    """
+    Render a datetime like DRF's ``DateTimeField`` (ISO 8601, ``Z`` for UTC).
+    """
+    if not value:
+        return None
+    if settings.USE_TZ and timezone.is_aware(value):
+        value = value.astimezone(timezone.get_current_timezone())
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def date_value(value):
+    """
+    Render a date like DRF's ``DateField``.
+    """
+    return value.isoformat() if value else None
+
+
+def decimal_value(max_digits, decimal_places):
+    """
+    Build a converter rendering decimals like DRF's ``DecimalField``.
+    """
+    exponent = decimal.Decimal('.1') ** decimal_places
+
+    def convert(value):
+        if value is None:
+            return None
+        if not isinstance(value, decimal.Decimal):
+            value = decimal.Decimal(str(value).strip())
+        context = decimal.getcontext().copy()
+        context.prec = max_digits
+        return '{:f}'.format(value.quantize(exponent, context=context))
+    return convert
+
+
+def age_value(birthdate):
+    """
+    Age in whole years, as ``Student.age`` computes it.
+    """
+    today = date.today()
+    return today.year - birthdate.year - (
+        (today.month, today.day) < (birthdate.month, birthdate.day)
+    )
+
+
+class ValuesSerializer:
+    """
+    Read-only serializer over ``.values()`` rows.
+
+    ``fields`` lists ``(key, lookup, convert)`` triples in output order.
+    ``lookup`` is the ``values()`` path the key is read from and ``convert``
+    an optional function applied to it. A ``None`` lookup marks a key that
+    ``to_representation`` fills in itself.
+    """
+    fields = []
+
+    def __init__(self, instance=None, many=False, context=None):
+        self.instance = instance
+        self.many = many
+        self.context = context or {}
+
+    @classmethod
+    def lookups(cls):
+        """
+        The distinct ``values()`` paths the serializer reads.
+        """
+        return list(dict.fromkeys(lookup for _, lookup, _ in cls.fields if lookup))
+
+    @classmethod
+    def values(cls, queryset):
+        """
+        Restrict ``queryset`` to the columns this serializer needs.
+        """
+        return queryset.values(*cls.lookups())
+
+    def to_representation(self, row):
+        return {
+            key: (convert(row[lookup]) if convert else row[lookup]) if lookup else None
+            for key, lookup, convert in self.fields
+        }
+
+    @property
+    def data(self):
+        if self.many:
+            return [self.to_representation(row) for row in self.instance]
+        return self.to_representation(self.instance)
+
+
+def values_serializer_for(view):
+    """
+    Return the view's ``values_serializer_class`` if the fast path is enabled.
+    """
+    if not getattr(settings, 'FAST_READ_SERIALIZERS', True):
+        return None
+    return getattr(view, 'values_serializer_class', None)
@@ -11,5 +11,9 @@ class SectionAdmin(admin.ModelAdmin):
     readonly_fields = ['created_at', 'updated_at']
     
     def students_count(self, obj):
-        return obj.students.count()
+        return obj.students_count
     students_count.short_description = 'Students'
+    
+    def get_queryset(self, request):
+        """Annotate counts in the changelist query instead of per row"""
+        return super().get_queryset(request).select_related('grade').with_counts()
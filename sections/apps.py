@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class SectionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'sections'
+    
+    def ready(self):
+        from mini_university.response_cache import invalidate_on_change
+        from .models import Section
+        from grades.models import Grade
+        from students.models import Student
+        
+        # Cached GET responses include these models' rows and counts
+        invalidate_on_change('sections', Section, Grade, Student)
@@ -1,5 +1,20 @@
 from django.db import models
 from grades.models import Grade
+from mini_university.querysets import count_related
+
+
+class SectionQuerySet(models.QuerySet):
+    """
+    Custom queryset for Section model.
+    """
+    
+    def with_counts(self):
+        """
+        Annotate students_count on each section.
+        """
+        return self.annotate(
+            students_count=count_related(self.model, 'students'),
+        )
 
 
 class Section(models.Model):
@@ -11,6 +26,8 @@ class Section(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = SectionQuerySet.as_manager()
+    
     class Meta:
         ordering = ['grade__name', 'name']
         unique_together = ['name', 'grade']
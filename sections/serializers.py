@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from mini_university.values import ValuesSerializer, datetime_value
 from .models import Section
 from grades.models import Grade
 from grades.serializers import GradeSerializer
@@ -17,9 +18,27 @@ class SectionSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
     
     def get_students_count(self, obj):
+        if hasattr(obj, 'students_count'):
+            return obj.students_count
         return obj.students.count()
 
 
+class SectionValuesSerializer(ValuesSerializer):
+    """
+    Fast read path rendering the same output as SectionSerializer from
+    ``Section.objects.with_counts().values()`` rows.
+    """
+    fields = [
+        ('id', 'id', None),
+        ('name', 'name', None),
+        ('grade', 'grade_id', None),
+        ('grade_name', 'grade__name', None),
+        ('students_count', 'students_count', None),
+        ('created_at', 'created_at', datetime_value),
+        ('updated_at', 'updated_at', datetime_value),
+    ]
+
+
 class SectionCreateUpdateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating and updating Section model.
@@ -2,25 +2,32 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
-from django.core.paginator import Paginator
 from django.db.models import Q
 
+from mini_university.conditional import detail_etag, etag_matches, list_etag, not_modified, with_etag
+from mini_university.pagination import paginate
+from mini_university.response_cache import cache_response
+from mini_university.values import values_serializer_for
+
 from .models import Section
-from .serializers import SectionSerializer, SectionCreateUpdateSerializer
+from .serializers import SectionSerializer, SectionValuesSerializer, SectionCreateUpdateSerializer
 
 
 class SectionListCreateView(APIView):
     """
     List all sections or create a new section.
     """
+    values_serializer_class = SectionValuesSerializer
+    cursor_ordering = ['grade__name', 'name', 'id']
     
+    @cache_response('sections')
     def get(self, request):
         """
         Retrieve all sections with optional search and pagination.
         """
         search = request.query_params.get('search', '')
         grade_id = request.query_params.get('grade', '')
-        sections = Section.objects.select_related('grade').all()
+        sections = Section.objects.select_related('grade').with_counts()
         
         if search:
             sections = sections.filter(
@@ -30,21 +37,21 @@ class SectionListCreateView(APIView):
         if grade_id:
             sections = sections.filter(grade_id=grade_id)
         
+        etag, count = list_etag(request, 'sections', sections)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        values_serializer = values_serializer_for(self)
+        fields = values_serializer.lookups() if values_serializer else None
+        
         # Pagination
-        page_number = request.query_params.get('page', 1)
-        page_size = request.query_params.get('page_size', 20)
-        paginator = Paginator(sections, page_size)
-        page_obj = paginator.get_page(page_number)
+        page, pagination = paginate(request, sections, self.cursor_ordering, fields, count)
         
-        serializer = SectionSerializer(page_obj, many=True)
-        return Response({
+        serializer = (values_serializer or SectionSerializer)(page, many=True)
+        return with_etag(Response({
             'results': serializer.data,
-            'count': paginator.count,
-            'next': page_obj.has_next(),
-            'previous': page_obj.has_previous(),
-            'current_page': page_obj.number,
-            'total_pages': paginator.num_pages,
-        })
+            **pagination,
+        }), etag)
     
     def post(self, request):
         """
@@ -62,20 +69,30 @@ class SectionDetailView(APIView):
     """
     Retrieve, update or delete a section instance.
     """
+    values_serializer_class = SectionValuesSerializer
     
-    def get_object(self, pk):
+    def get_object(self, pk, values_serializer=None):
         """
         Get section object or raise 404.
         """
-        return get_object_or_404(Section, pk=pk)
+        queryset = Section.objects.select_related('grade').with_counts()
+        if values_serializer:
+            queryset = values_serializer.values(queryset)
+        return get_object_or_404(queryset, pk=pk)
     
+    @cache_response('sections')
     def get(self, request, pk):
         """
         Retrieve a specific section.
         """
-        section = self.get_object(pk)
-        serializer = SectionSerializer(section)
-        return Response(serializer.data)
+        values_serializer = values_serializer_for(self)
+        section = self.get_object(pk, values_serializer)
+        etag = detail_etag('sections', section)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        serializer = (values_serializer or SectionSerializer)(section)
+        return with_etag(Response(serializer.data), etag)
     
     def put(self, request, pk):
         """
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class StudentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'students'
+    
+    def ready(self):
+        from mini_university.response_cache import invalidate_on_change
+        from .models import Student
+        from grades.models import Grade
+        from sections.models import Section
+        from enrollments.models import Enrollment
+        
+        # Conditional GET ETags include these models' rows and counts
+        invalidate_on_change('students', Student, Grade, Section, Enrollment)
@@ -0,0 +1,18 @@
+from django.db import migrations
+
+from mini_university.search import search_indexes
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        search_indexes(
+            'students.Student',
+            trigram_fields=['name', 'student_id'],
+            vector_fields=['name', 'student_id'],
+        ),
+    ]
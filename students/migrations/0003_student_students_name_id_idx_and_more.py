@@ -0,0 +1,27 @@
+# Generated by Django 5.1.2 on 2026-10-17 15:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grades', '0001_initial'),
+        ('sections', '0001_initial'),
+        ('students', '0002_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['name', 'id'], name='students_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['grade', 'section', 'name'], name='students_grade_section_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['section', 'name'], name='students_section_name_idx'),
+        ),
+    ]
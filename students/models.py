@@ -2,6 +2,21 @@ from django.db import models
 from django.core.validators import RegexValidator
 from grades.models import Grade
 from sections.models import Section
+from mini_university.querysets import count_related
+
+
+class StudentQuerySet(models.QuerySet):
+    """
+    Custom queryset for Student model.
+    """
+    
+    def with_counts(self):
+        """
+        Annotate enrollments_count on each student.
+        """
+        return self.annotate(
+            enrollments_count=count_related(self.model, 'enrollments'),
+        )
 
 
 class Student(models.Model):
@@ -23,13 +38,30 @@ class Student(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = StudentQuerySet.as_manager()
+    
     class Meta:
         ordering = ['name']
         db_table = 'students'
+        indexes = [
+            # Default list ordering and cursor pagination
+            models.Index(fields=['name', 'id'], name='students_name_id_idx'),
+            # List filtered by grade and/or section, ordered by name
+            models.Index(fields=['grade', 'section', 'name'], name='students_grade_section_idx'),
+            models.Index(fields=['section', 'name'], name='students_section_name_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.student_id})"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets signal receivers see which grade and section a student left,
+        # and whether the name or ID enrollments search on changed
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+    
     @property
     def age(self):
         from datetime import date
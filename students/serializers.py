@@ -1,4 +1,6 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
+from mini_university.values import ValuesSerializer, age_value, date_value, datetime_value
 from .models import Student
 from grades.models import Grade
 from sections.models import Section
@@ -25,9 +27,32 @@ class StudentSerializer(serializers.ModelSerializer):
         return obj.age
     
     def get_enrollments_count(self, obj):
+        if hasattr(obj, 'enrollments_count'):
+            return obj.enrollments_count
         return obj.enrollments.count()
 
 
+class StudentValuesSerializer(ValuesSerializer):
+    """
+    Fast read path rendering the same output as StudentSerializer from
+    ``Student.objects.with_counts().values()`` rows.
+    """
+    fields = [
+        ('id', 'id', None),
+        ('name', 'name', None),
+        ('birthdate', 'birthdate', date_value),
+        ('student_id', 'student_id', None),
+        ('grade', 'grade_id', None),
+        ('grade_name', 'grade__name', None),
+        ('section', 'section_id', None),
+        ('section_name', 'section__name', None),
+        ('age', 'birthdate', age_value),
+        ('enrollments_count', 'enrollments_count', None),
+        ('created_at', 'created_at', datetime_value),
+        ('updated_at', 'updated_at', datetime_value),
+    ]
+
+
 class StudentCreateUpdateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating and updating Student model.
@@ -76,4 +101,95 @@ class StudentCreateUpdateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 "The selected section does not belong to the selected grade."
             )
-        return data
\ No newline at end of file
+        return data
+
+class StudentBulkRowSerializer(serializers.Serializer):
+    """
+    Validates a single row of a bulk student import without touching the database.
+    
+    Uniqueness and section/grade membership are checked for the whole batch
+    at once by validate_student_batch.
+    """
+    name = serializers.CharField(max_length=100)
+    birthdate = serializers.DateField()
+    student_id = serializers.CharField(max_length=20)
+    grade = serializers.IntegerField()
+    section = serializers.IntegerField()
+    
+    def validate_name(self, value):
+        if not value.strip():
+            raise serializers.ValidationError("Student name cannot be empty.")
+        return value.strip()
+    
+    def validate_student_id(self, value):
+        value = value.strip().upper()
+        if not value:
+            raise serializers.ValidationError("Student ID cannot be empty.")
+        for validator in Student._meta.get_field('student_id').validators:
+            try:
+                validator(value)
+            except DjangoValidationError as exc:
+                raise serializers.ValidationError(exc.messages)
+        return value
+
+
+def validate_student_batch(rows, offset=0, seen_ids=None):
+    """
+    Validate a batch of bulk import rows set-wise.
+    
+    Runs two queries per batch regardless of its size: one for student IDs
+    that already exist and one for the referenced sections. Returns a list
+    of unsaved Student instances and a list of ``{'index', 'errors'}`` dicts
+    for the rejected rows. ``seen_ids`` carries student IDs across batches
+    so duplicates within one upload are caught.
+    """
+    seen_ids = set() if seen_ids is None else seen_ids
+    errors = []
+    candidates = []
+    for index, row in enumerate(rows, start=offset):
+        serializer = StudentBulkRowSerializer(data=row)
+        if serializer.is_valid():
+            candidates.append((index, serializer.validated_data))
+        else:
+            errors.append({'index': index, 'errors': serializer.errors})
+    
+    student_ids = {data['student_id'] for _, data in candidates}
+    existing_ids = set(
+        Student.objects.filter(student_id__in=student_ids).order_by().values_list('student_id', flat=True)
+    )
+    section_grades = dict(
+        Section.objects.filter(
+            pk__in={data['section'] for _, data in candidates}
+        ).order_by().values_list('pk', 'grade_id')
+    )
+    
+    students = []
+    for index, data in candidates:
+        row_errors = {}
+        if data['student_id'] in existing_ids:
+            row_errors['student_id'] = ["A student with this ID already exists."]
+        elif data['student_id'] in seen_ids:
+            row_errors['student_id'] = ["This student ID appears more than once in the upload."]
+        
+        section_grade = section_grades.get(data['section'])
+        if section_grade is None:
+            row_errors['section'] = [f'Invalid pk "{data["section"]}" - object does not exist.']
+        elif section_grade != data['grade']:
+            row_errors['non_field_errors'] = [
+                "The selected section does not belong to the selected grade."
+            ]
+        
+        seen_ids.add(data['student_id'])
+        if row_errors:
+            errors.append({'index': index, 'errors': row_errors})
+            continue
+        students.append(Student(
+            name=data['name'],
+            birthdate=data['birthdate'],
+            student_id=data['student_id'],
+            grade_id=data['grade'],
+            section_id=data['section'],
+        ))
+    
+    errors.sort(key=lambda error: error['index'])
+    return students, errors
@@ -1,3 +1,246 @@
-from django.test import TestCase
+import json
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from .models import Student
+from grades.models import Grade
+from sections.models import Section
+
+
+class StudentListCountTestCase(APITestCase):
+    """Test cases for the student list total count strategy"""
+    
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='staff', password='staffpass123')
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('students:student-list-create')
+        
+        self.grade = Grade.objects.create(name="Grade 1")
+        self.section = Section.objects.create(name="A", grade=self.grade)
+        for i in range(3):
+            self.create_student(i)
+    
+    def create_student(self, i):
+        return Student.objects.create(
+            name=f"Student {i}", birthdate="2010-01-01",
+            student_id=f"S{i:03d}", grade=self.grade, section=self.section
+        )
+    
+    def test_unfiltered_count_is_exact_for_small_tables(self):
+        """Test that small unfiltered lists always count exactly"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['count'], 3)
+        self.create_student(3)
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['count'], 4)
+    
+    def test_filtered_count_is_cached(self):
+        """Test that filtered totals are cached per normalized filter set"""
+        response = self.client.get(self.url, {'search': 'Student', 'page': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        
+        self.create_student(3)
+        # Pagination params and empty filters do not change the key
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'search': 'Student', 'grade': '', 'page_size': 10})
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(len(response.data['results']), 4)
+    
+    def test_exact_override(self):
+        """Test that exact=1 bypasses the cached total"""
+        self.client.get(self.url, {'search': 'Student'})
+        self.create_student(3)
+        response = self.client.get(self.url, {'search': 'Student', 'exact': 1})
+        self.assertEqual(response.data['count'], 4)
+
+
+class StudentSearchTestCase(APITestCase):
+    """Test cases for student list search"""
+    
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='staff', password='staffpass123')
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('students:student-list-create')
+        
+        grade1 = Grade.objects.create(name="Freshman")
+        grade2 = Grade.objects.create(name="Senior")
+        section1 = Section.objects.create(name="Blue", grade=grade1)
+        section2 = Section.objects.create(name="Red", grade=grade2)
+        Student.objects.create(
+            name="Alice Smith", birthdate="2010-01-01",
+            student_id="A001", grade=grade1, section=section1
+        )
+        Student.objects.create(
+            name="Bob Jones", birthdate="2010-01-01",
+            student_id="B002", grade=grade2, section=section2
+        )
+    
+    def search(self, term, **params):
+        response = self.client.get(self.url, {'search': term, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(row['name'] for row in response.data['results'])
+    
+    def test_search_own_and_related_fields(self):
+        """Test matching on student fields and on grade/section names"""
+        self.assertEqual(self.search('smith'), ['Alice Smith'])
+        self.assertEqual(self.search('b002'), ['Bob Jones'])
+        self.assertEqual(self.search('senior'), ['Bob Jones'])
+        self.assertEqual(self.search('blue'), ['Alice Smith'])
+        self.assertEqual(self.search('zzz'), [])
+    
+    def test_fulltext_mode(self):
+        """Test that fulltext mode matches the same students"""
+        self.assertEqual(self.search('alice', search_mode='fulltext'), ['Alice Smith'])
+        self.assertEqual(self.search('red', search_mode='fulltext'), ['Bob Jones'])
+
+
+class StudentBulkCreateTestCase(APITestCase):
+    """Test cases for bulk student import"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='staff', password='staffpass123')
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('students:student-bulk-create')
+        
+        self.grade1 = Grade.objects.create(name="Grade 1")
+        self.grade2 = Grade.objects.create(name="Grade 2")
+        self.section1 = Section.objects.create(name="A", grade=self.grade1)
+        Student.objects.create(
+            name="Existing", birthdate="2010-01-01",
+            student_id="S000", grade=self.grade1, section=self.section1
+        )
+    
+    def row(self, i, **overrides):
+        return {
+            'name': f"Student {i}", 'birthdate': '2010-01-01',
+            'student_id': f"s{i:03d}", 'grade': self.grade1.id, 'section': self.section1.id,
+            **overrides,
+        }
+    
+    def test_json_import_with_row_errors(self):
+        """Test that valid rows are created and invalid rows are reported by index"""
+        rows = [
+            self.row(1),
+            self.row(0),  # already exists
+            self.row(2, grade=self.grade2.id),  # section in another grade
+            self.row(3, section=9999),  # unknown section
+            self.row(1, name="Again"),  # duplicate within upload
+            self.row(4, name="  "),  # blank name
+            self.row(5),
+        ]
+        response = self.client.post(self.url, rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created_count'], 2)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2, 3, 4, 5])
+        self.assertIn('student_id', response.data['errors'][0]['errors'])
+        self.assertIn('non_field_errors', response.data['errors'][1]['errors'])
+        self.assertIn('section', response.data['errors'][2]['errors'])
+        self.assertEqual(
+            sorted(Student.objects.values_list('student_id', flat=True)),
+            ['S000', 'S001', 'S005']
+        )
+    
+    def test_csv_import(self):
+        """Test importing students from a CSV body"""
+        lines = ["name,birthdate,student_id,grade,section"]
+        lines += [
+            f"Student {i},2010-01-01,C{i:03d},{self.grade1.id},{self.section1.id}"
+            for i in range(10)
+        ]
+        response = self.client.post(
+            self.url, "\n".join(lines) + "\n", content_type='text/csv'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created_count'], 10)
+        self.assertEqual(Student.objects.filter(student_id__startswith='C').count(), 10)
+    
+    def test_csv_with_byte_order_mark(self):
+        """Test that a UTF-8 CSV exported with a BOM imports every row"""
+        body = (
+            "\ufeffname,birthdate,student_id,grade,section\n"
+            f"Zoë,2010-01-01,B001,{self.grade1.id},{self.section1.id}\n"
+        ).encode('utf-8')
+        response = self.client.post(self.url, body, content_type='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Student.objects.get(student_id='B001').name, 'Zoë')
+    
+    def test_csv_in_another_encoding(self):
+        """Test that a body that is not UTF-8 is a bad request and imports nothing"""
+        body = (
+            "name,birthdate,student_id,grade,section\n"
+            f"Zoë,2010-01-01,L001,{self.grade1.id},{self.section1.id}\n"
+        ).encode('latin-1')
+        response = self.client.post(self.url, body, content_type='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Student.objects.filter(student_id='L001').exists())
+        
+        response = self.client.post(self.url, body, content_type='text/csv; charset=latin-1')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Student.objects.get(student_id='L001').name, 'Zoë')
+    
+    def test_query_count_does_not_grow_with_rows(self):
+        """Test that validation is set-wise rather than per row"""
+        rows = [self.row(i) for i in range(1, 101)]
+        # Two validation queries, one insert, plus the transaction savepoints
+        with self.assertNumQueries(5):
+            response = self.client.post(self.url, rows, format='json')
+        self.assertEqual(response.data['created_count'], 100)
+    
+    def test_rejects_non_list_body(self):
+        """Test that a single object or scalar is rejected"""
+        for body in (self.row(1), 'S001', 42, True, None):
+            with self.subTest(body=body):
+                response = self.client.post(self.url, body, format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertEqual(response.data['error'], 'Expected a JSON array or CSV rows of students.')
+
+
+class StudentExportTestCase(APITestCase):
+    """Test cases for the streaming student export"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='staff', password='staffpass123')
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('students:student-export')
+        
+        self.grade1 = Grade.objects.create(name="Grade 1")
+        self.grade2 = Grade.objects.create(name="Grade 2")
+        section1 = Section.objects.create(name="A", grade=self.grade1)
+        section2 = Section.objects.create(name="B", grade=self.grade2)
+        for i in range(30):
+            grade, section = (self.grade1, section1) if i % 2 else (self.grade2, section2)
+            Student.objects.create(
+                name=f"Student {i:02d}", birthdate="2010-01-01",
+                student_id=f"S{i:03d}", grade=grade, section=section
+            )
+    
+    def test_csv_export_applies_list_filters(self):
+        """Test that the CSV export streams every matching row with a header"""
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'grade': self.grade1.id})
+            content = b''.join(response.streaming_content).decode()
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        lines = content.splitlines()
+        self.assertEqual(lines[0].split(',')[:4], ['id', 'name', 'birthdate', 'student_id'])
+        self.assertEqual(len(lines), 16)
+        self.assertEqual(lines[1].split(',')[1], 'Student 01')
+    
+    def test_ndjson_export_matches_api_values(self):
+        """Test that NDJSON rows carry the same values as the list endpoint"""
+        response = self.client.get(self.url, {'export_format': 'ndjson', 'search': 'Student 07'})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        listed = self.client.get(reverse('students:student-list-create'), {'search': 'Student 07'})
+        self.assertEqual(len(rows), 1)
+        for field in ('id', 'name', 'birthdate', 'student_id', 'grade_name', 'created_at', 'updated_at'):
+            self.assertEqual(rows[0][field], listed.data['results'][0][field])
+    
+    def test_unknown_format(self):
+        """Test that an unsupported export format is rejected"""
+        response = self.client.get(self.url, {'export_format': 'xml'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,9 +1,14 @@
 from django.urls import path
+
+from mini_university.async_views import read_view
+
 from . import views
 
 app_name = 'students'
 
 urlpatterns = [
-    path('', views.StudentListCreateView.as_view(), name='student-list-create'),
-    path('<int:pk>/', views.StudentDetailView.as_view(), name='student-detail'),
+    path('', read_view(views.StudentListCreateView, views.AsyncStudentListCreateView).as_view(), name='student-list-create'),
+    path('<int:pk>/', read_view(views.StudentDetailView, views.AsyncStudentDetailView).as_view(), name='student-detail'),
+    path('bulk/', views.StudentBulkCreateView.as_view(), name='student-bulk-create'),
+    path('export/', views.StudentExportView.as_view(), name='student-export'),
 ]
\ No newline at end of file
@@ -1,35 +1,48 @@
+import csv
+from itertools import islice
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from django.shortcuts import get_object_or_404
-from django.core.paginator import Paginator
-from django.db.models import Q
+from django.shortcuts import aget_object_or_404, get_object_or_404
+from django.db import IntegrityError, transaction
+
+from mini_university.async_views import AsyncAPIView
+from mini_university.conditional import (
+    alist_etag, detail_etag, etag_matches, list_etag, not_modified, with_etag,
+)
+from mini_university.export import get_export_format, stream_export
+from mini_university.pagination import apaginate, paginate
+from mini_university.response_cache import invalidate_for
+from mini_university.parsers import CSVParser, FastJSONParser
+from mini_university.search import CONTAINS, apply_search
+from mini_university.values import values_serializer_for
 
 from .models import Student
-from .serializers import StudentSerializer, StudentCreateUpdateSerializer
+from .serializers import (
+    StudentSerializer,
+    StudentValuesSerializer,
+    StudentCreateUpdateSerializer,
+    validate_student_batch,
+)
 
 
-class StudentListCreateView(APIView):
+class StudentFilterMixin:
     """
-    List all students or create a new student.
+    Search and filters shared by the student list and export views.
     """
+    search_fields = ['name', 'student_id', 'grade__name', 'section__name']
     
-    def get(self, request):
+    def filter_queryset(self, request, students):
         """
-        Retrieve all students with optional search and pagination.
+        Apply the ``search``, ``grade`` and ``section`` query parameters.
         """
         search = request.query_params.get('search', '')
+        search_mode = request.query_params.get('search_mode', CONTAINS)
         grade_id = request.query_params.get('grade', '')
         section_id = request.query_params.get('section', '')
-        students = Student.objects.select_related('grade', 'section').all()
-        
-        if search:
-            students = students.filter(
-                Q(name__icontains=search) |
-                Q(student_id__icontains=search) |
-                Q(grade__name__icontains=search) |
-                Q(section__name__icontains=search)
-            )
+        
+        students = apply_search(students, search, self.search_fields, search_mode)
         
         if grade_id:
             students = students.filter(grade_id=grade_id)
@@ -37,21 +50,39 @@ class StudentListCreateView(APIView):
         if section_id:
             students = students.filter(section_id=section_id)
         
+        return students
+
+
+class StudentListCreateView(StudentFilterMixin, APIView):
+    """
+    List all students or create a new student.
+    """
+    values_serializer_class = StudentValuesSerializer
+    cursor_ordering = ['name', 'id']
+    
+    def get(self, request):
+        """
+        Retrieve all students with optional search and pagination.
+        """
+        students = self.filter_queryset(
+            request, Student.objects.select_related('grade', 'section').with_counts()
+        )
+        
+        etag, count = list_etag(request, 'students', students)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        values_serializer = values_serializer_for(self)
+        fields = values_serializer.lookups() if values_serializer else None
+        
         # Pagination
-        page_number = request.query_params.get('page', 1)
-        page_size = request.query_params.get('page_size', 20)
-        paginator = Paginator(students, page_size)
-        page_obj = paginator.get_page(page_number)
+        page, pagination = paginate(request, students, self.cursor_ordering, fields, count)
         
-        serializer = StudentSerializer(page_obj, many=True)
-        return Response({
+        serializer = (values_serializer or StudentSerializer)(page, many=True)
+        return with_etag(Response({
             'results': serializer.data,
-            'count': paginator.count,
-            'next': page_obj.has_next(),
-            'previous': page_obj.has_previous(),
-            'current_page': page_obj.number,
-            'total_pages': paginator.num_pages,
-        })
+            **pagination,
+        }), etag)
     
     def post(self, request):
         """
@@ -65,24 +96,66 @@ class StudentListCreateView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class StudentExportView(StudentFilterMixin, APIView):
+    """
+    Export all students matching the list filters as CSV or NDJSON.
+    """
+    ordering = ['name', 'id']
+    export_fields = [
+        ('id', 'id'),
+        ('name', 'name'),
+        ('birthdate', 'birthdate'),
+        ('student_id', 'student_id'),
+        ('grade', 'grade_id'),
+        ('grade_name', 'grade__name'),
+        ('section', 'section_id'),
+        ('section_name', 'section__name'),
+        ('created_at', 'created_at'),
+        ('updated_at', 'updated_at'),
+    ]
+    
+    def get(self, request):
+        """
+        Stream the filtered students with constant memory.
+        """
+        export_format = get_export_format(request)
+        students = self.filter_queryset(request, Student.objects.order_by(*self.ordering))
+        return stream_export(students, self.export_fields, 'students', export_format)
+
+
 class StudentDetailView(APIView):
     """
     Retrieve, update or delete a student instance.
     """
+    values_serializer_class = StudentValuesSerializer
+    
+    def object_queryset(self, values_serializer=None):
+        """
+        Queryset single students are looked up in.
+        """
+        queryset = Student.objects.select_related('grade', 'section').with_counts()
+        if values_serializer:
+            queryset = values_serializer.values(queryset)
+        return queryset
     
-    def get_object(self, pk):
+    def get_object(self, pk, values_serializer=None):
         """
         Get student object or raise 404.
         """
-        return get_object_or_404(Student, pk=pk)
+        return get_object_or_404(self.object_queryset(values_serializer), pk=pk)
     
     def get(self, request, pk):
         """
         Retrieve a specific student.
         """
-        student = self.get_object(pk)
-        serializer = StudentSerializer(student)
-        return Response(serializer.data)
+        values_serializer = values_serializer_for(self)
+        student = self.get_object(pk, values_serializer)
+        etag = detail_etag('students', student)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        serializer = (values_serializer or StudentSerializer)(student)
+        return with_etag(Response(serializer.data), etag)
     
     def put(self, request, pk):
         """
@@ -103,3 +176,114 @@ class StudentDetailView(APIView):
         student = self.get_object(pk)
         student.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class StudentBulkCreateView(APIView):
+    """
+    Create many students at once from a JSON array or a CSV upload.
+    """
+    parser_classes = [FastJSONParser, CSVParser]
+    batch_size = 5000
+    
+    def post(self, request):
+        """
+        Validate and insert students in batches.
+        
+        Valid rows are inserted and invalid ones are reported by their
+        zero-based index in the upload. Each batch costs two validation
+        queries plus its inserts, however many rows it holds.
+        """
+        rows = request.data
+        if not isinstance(rows, (list, csv.DictReader)):
+            return Response(
+                {'error': 'Expected a JSON array or CSV rows of students.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        rows = iter(rows)
+        created_count = 0
+        errors = []
+        seen_ids = set()
+        try:
+            with transaction.atomic():
+                offset = 0
+                while True:
+                    batch = list(islice(rows, self.batch_size))
+                    if not batch:
+                        break
+                    students, batch_errors = validate_student_batch(batch, offset, seen_ids)
+                    Student.objects.bulk_create(students, batch_size=self.batch_size)
+                    created_count += len(students)
+                    errors.extend(batch_errors)
+                    offset += len(batch)
+                if created_count:
+                    # bulk_create sends no post_save signals
+                    invalidate_for(Student)
+        except csv.Error as exc:
+            return Response({'error': f'Malformed CSV: {exc}'}, status=status.HTTP_400_BAD_REQUEST)
+        except UnicodeDecodeError as exc:
+            return Response(
+                {'error': f'CSV body is not valid {exc.encoding}; nothing was imported.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except IntegrityError:
+            return Response(
+                {'error': 'Some student IDs were created concurrently; nothing was imported.'},
+                status=status.HTTP_409_CONFLICT
+            )
+        
+        response_data = {
+            'created_count': created_count,
+            'errors': errors,
+        }
+        if created_count:
+            return Response(response_data, status=status.HTTP_201_CREATED)
+        return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+
+class AsyncStudentListCreateView(AsyncAPIView, StudentListCreateView):
+    """
+    StudentListCreateView with an async GET.
+    """
+    
+    async def get(self, request):
+        """
+        Retrieve all students with optional search and pagination.
+        """
+        students = self.filter_queryset(
+            request, Student.objects.select_related('grade', 'section').with_counts()
+        )
+        
+        etag, count = await alist_etag(request, 'students', students)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        values_serializer = values_serializer_for(self)
+        fields = values_serializer.lookups() if values_serializer else None
+        
+        page, pagination = await apaginate(request, students, self.cursor_ordering, fields, count)
+        
+        serializer = (values_serializer or StudentSerializer)(page, many=True)
+        return with_etag(Response({
+            'results': serializer.data,
+            **pagination,
+        }), etag)
+
+
+class AsyncStudentDetailView(AsyncAPIView, StudentDetailView):
+    """
+    StudentDetailView with an async GET.
+    """
+    
+    async def get(self, request, pk):
+        """
+        Retrieve a specific student.
+        """
+        values_serializer = values_serializer_for(self)
+        student = await aget_object_or_404(self.object_queryset(values_serializer), pk=pk)
+        etag = detail_etag('students', student)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        serializer = (values_serializer or StudentSerializer)(student)
+        return with_etag(Response(serializer.data), etag)